@@ -0,0 +1,455 @@
+"""
+maiNboard - Hintergrund-Analyse der Sounds (Qt-frei)
+
+Jede belegte Datei wird einmal analysiert, das Ergebnis landet in einem
+Index neben dem PCM-Cache:
+
+  Slot belegt / Start ──► Analyzer-Thread ──► analysis_worker.py × N (eigene Prozesse, kein GIL)
+                                                 │  PCM: Spill-Datei, sonst ffmpeg
+                                                 │  Stille: RMS/Peak pro 10-ms-Fenster
+                                                 │  Lautheit: K-Filter + Gating (EBU R128), True Peak
+                                                 ▼
+                            cache/analysis.json   Pfad → mtime, Größe, Trim, LUFS, dBTP
+
+  Wiedergabe: die Voice beginnt bei trim[0], endet bei trim[1] und bekommt
+  eine Verstärkung Richtung loudness_target – die Datei selbst wird nie
+  neu kodiert.
+
+Viele Clips beginnen mit 100–500 ms Stille (klingt im Call wie Latenz) und
+liegen 15 dB und mehr auseinander. Neu analysiert wird nur, wenn sich mtime
+oder Größe der Datei ändern (oder ANALYSIS_VERSION steigt).
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from audio_engine import PcmCache, ffmpeg_decode_cmd, RATE, CHANNELS
+
+TRIM_WINDOW  = RATE // 100     # 10 ms pro Fenster
+TRIM_RMS_DB  = -50.0           # ab hier gilt ein Fenster als hörbar …
+TRIM_PEAK_DB = -40.0           # … oder wenn ein einzelnes Sample so laut ist
+TRIM_PAD_MS  = 10              # Vorlauf vor dem ersten hörbaren Fenster (Anschlag bleibt ganz)
+TRIM_TAIL_MS = 50              # Ausklang nach dem letzten hörbaren Fenster
+CHUNK_WINDOWS = 1000           # Fenster pro NumPy-Durchgang (10 s, begrenzt den Speicher)
+
+ANALYSIS_VERSION = 2           # höher → alte Einträge werden einmal neu analysiert
+POOL_WORKERS     = max(1, min(4, (os.cpu_count() or 2) - 1))
+WORKER_SCRIPT    = Path(__file__).with_name("analysis_worker.py")
+POOL_RETRY_SEC   = 30.0        # nach einem Worker-Ausfall so lange inline rechnen, dann Pool neu versuchen
+
+# K-Filter nach ITU-R BS.1770 für 48 kHz: High-Shelf (Kopf) + Hochpass (RLB)
+_K_SHELF = ((1.53512485958697, -2.69169618940638, 1.19839281085285),
+            (1.0, -1.69065929318241, 0.73248077421585))
+_K_HIGHPASS = ((1.0, -2.0, 1.0),
+               (1.0, -1.99004745483398, 0.99007225036621))
+LOUD_BLOCK   = RATE // 10      # 100 ms – Messblock; ein Gating-Block = 4 davon (400 ms, 75 % Überlappung)
+GATE_ABS_LUFS = -70.0
+GATE_REL_LU   = -10.0
+TP_OVERSAMPLE = 4              # True Peak: 4-fach überabgetastet (BS.1770 Anhang 2)
+TP_TAPS       = 12             # Taps pro Phase des Interpolationsfilters
+
+
+def _level(db: float) -> float:
+    return 10 ** (db / 20)
+
+
+def trim_points(pcm: np.ndarray) -> tuple[int, int]:
+    """(erster, letzter+1) Frame ohne Stille am Anfang/Ende; (0, n) wenn alles still ist.
+
+    pcm: int16, Form (n, CHANNELS).
+    """
+    n = len(pcm)
+    windows = n // TRIM_WINDOW
+    if windows == 0:
+        return 0, n
+    rms_thr, peak_thr = _level(TRIM_RMS_DB), _level(TRIM_PEAK_DB)
+    loud = []
+    for w0 in range(0, windows, CHUNK_WINDOWS):
+        w1 = min(windows, w0 + CHUNK_WINDOWS)
+        x = pcm[w0 * TRIM_WINDOW:w1 * TRIM_WINDOW].astype(np.float32)
+        x = x.reshape(w1 - w0, TRIM_WINDOW * CHANNELS) / 32768.0
+        peak = np.abs(x).max(axis=1)
+        rms  = np.sqrt(np.mean(x * x, axis=1))
+        loud.append(np.flatnonzero((rms > rms_thr) | (peak > peak_thr)) + w0)
+    loud = np.concatenate(loud)
+    if not len(loud):
+        return 0, n
+    start = max(0, int(loud[0]) * TRIM_WINDOW - RATE * TRIM_PAD_MS // 1000)
+    end = n if loud[-1] == windows - 1 else \
+        min(n, (int(loud[-1]) + 1) * TRIM_WINDOW + RATE * TRIM_TAIL_MS // 1000)
+    return start, end
+
+
+def _k_weights(n: int) -> np.ndarray:
+    """|H(f)|² des K-Filters auf den rfft-Bins eines Blocks der Länge n,
+    gleich mit den Parseval-Faktoren (→ Mittel der Quadrate des gefilterten Blocks)."""
+    z = np.exp(-1j * np.pi * np.arange(n // 2 + 1) / (n // 2))     # e^-jω
+    h2 = np.ones(n // 2 + 1)
+    for b, a in (_K_SHELF, _K_HIGHPASS):
+        h = (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+        h2 *= np.abs(h) ** 2
+    h2[1:-1] *= 2          # rfft: jedes innere Bin steht für zwei Frequenzen
+    return h2 / (n * n)
+
+
+def integrated_loudness(pcm: np.ndarray) -> float | None:
+    """Integrierte Lautheit in LUFS (EBU R128), None bei Stille.
+
+    Gefiltert wird im Frequenzbereich pro 100-ms-Block (rfft statt IIR-Schleife):
+    ohne SciPy in NumPy vektorisiert, Abweichung durch die Blockränder < 0,1 LU.
+    """
+    n = len(pcm)
+    blocks = n // LOUD_BLOCK
+    if blocks == 0:
+        return None
+    w = _k_weights(LOUD_BLOCK)
+    z = []                              # Mittel der Quadrate pro 100-ms-Block und Kanal
+    for b0 in range(0, blocks, 100):
+        b1 = min(blocks, b0 + 100)
+        x = pcm[b0 * LOUD_BLOCK:b1 * LOUD_BLOCK].astype(np.float32) / 32768.0
+        spec = np.fft.rfft(x.reshape(b1 - b0, LOUD_BLOCK, CHANNELS), axis=1)
+        z.append(np.einsum("bkc,k->bc", spec.real ** 2 + spec.imag ** 2, w))
+    z = np.concatenate(z)
+    # 400-ms-Gating-Blöcke: gleitendes Mittel über 4 Messblöcke, Kanäle addiert (G = 1)
+    if len(z) >= 4:
+        c = np.cumsum(np.vstack([np.zeros((1, CHANNELS)), z]), axis=0)
+        power = ((c[4:] - c[:-4]) / 4).sum(axis=1)
+    else:
+        power = z.mean(axis=0, keepdims=True).sum(axis=1)
+    with np.errstate(divide="ignore"):
+        lk = -0.691 + 10 * np.log10(power)
+    gated = power[lk > GATE_ABS_LUFS]
+    if not len(gated):
+        return None
+    rel = -0.691 + 10 * np.log10(gated.mean()) + GATE_REL_LU
+    gated = power[lk > max(GATE_ABS_LUFS, rel)]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+def _tp_phases() -> list[np.ndarray]:
+    # Gefenstertes sinc; Phase 0 sind die Original-Samples selbst
+    half = TP_OVERSAMPLE * TP_TAPS // 2
+    t = np.arange(-half, half + 1) / TP_OVERSAMPLE
+    h = (np.sinc(t) * np.hanning(len(t))).astype(np.float32)
+    return [h[p::TP_OVERSAMPLE] for p in range(1, TP_OVERSAMPLE)]
+
+
+def true_peak(pcm: np.ndarray) -> float | None:
+    """True Peak in dBTP (4-fach überabgetastet), None bei digitaler Stille."""
+    if not len(pcm):
+        return None
+    x = pcm.astype(np.float32) / 32768.0
+    peak = float(np.abs(x).max())
+    for ch in range(CHANNELS):
+        col = np.ascontiguousarray(x[:, ch])
+        for taps in _tp_phases():
+            peak = max(peak, float(np.abs(np.convolve(col, taps, "same")).max()))
+    return float(20 * np.log10(peak)) if peak > 0 else None
+
+
+def normalize_gain(lufs: float | None, peak_db: float | None, target: float,
+                   max_boost_db: float = 12.0, ceiling_db: float = -1.0) -> float:
+    """Linearer Gain, der eine Datei auf `target` LUFS bringt.
+
+    Anheben höchstens um max_boost_db (leise Clips mit Rauschen) und nur so
+    weit, dass der True Peak unter ceiling_db bleibt; absenken immer.
+    """
+    if lufs is None:
+        return 1.0
+    gain_db = min(target - lufs, max_boost_db)
+    if gain_db > 0 and peak_db is not None:
+        gain_db = min(gain_db, max(0.0, ceiling_db - peak_db))
+    return 10 ** (gain_db / 20)
+
+
+def analyze_file(path: str, key: tuple, spill_dir: str | None) -> dict | None:
+    """Komplette Analyse einer Datei – läuft in einem Worker-Prozess."""
+    pcm = _load_pcm(path, key, spill_dir)
+    if not pcm:
+        return None
+    frames = np.frombuffer(pcm, dtype=np.int16)
+    frames = frames[:len(frames) - len(frames) % CHANNELS].reshape(-1, CHANNELS)
+    start, end = trim_points(frames)
+    lufs, peak = integrated_loudness(frames), true_peak(frames)
+    return {"v": ANALYSIS_VERSION, "frames": len(frames), "trim": [start, end],
+            "lufs": None if lufs is None else round(lufs, 2),
+            "true_peak": None if peak is None else round(peak, 2)}
+
+
+def _load_pcm(path: str, key: tuple, spill_dir: str | None) -> bytes | None:
+    # Spill-Datei des PcmCache, sonst dekodieren und für die erste Wiedergabe ablegen
+    cache = PcmCache(0, Path(spill_dir)) if spill_dir else None
+    spill = cache.spill_file(key) if cache else None
+    if spill is not None:
+        try:
+            return spill.read_bytes()
+        except OSError:
+            pass
+    try:
+        res = subprocess.run(ffmpeg_decode_cmd(path), capture_output=True)
+    except OSError:
+        return None
+    if res.returncode != 0:
+        return None
+    if cache is not None:
+        cache.put(path, res.stdout, key)    # Budget 0 → direkt in die Spill-Datei
+    return res.stdout
+
+
+# ── Worker-Prozesse ────────────────────────────────────────────────────────────
+def worker_main() -> int:
+    """Hauptschleife von analysis_worker.py: eine JSON-Zeile rein, eine heraus.
+    Endet, sobald der Analyzer stdin schließt."""
+    for line in sys.stdin:
+        path, key, spill_dir = json.loads(line)
+        try:
+            reply = {"result": analyze_file(path, tuple(key), spill_dir)}
+        except Exception as e:
+            reply = {"error": str(e)}
+        sys.stdout.write(json.dumps(reply) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+class WorkerDied(OSError):
+    """Der Analyse-Worker ist abgestürzt oder hat nie gestartet."""
+
+
+class _Worker:
+    """Ein dauerhafter analysis_worker.py-Prozess – eine Datei nach der anderen."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen([sys.executable, str(WORKER_SCRIPT)],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     text=True, bufsize=1)
+
+    def analyze(self, path: str, key: tuple, spill_dir: str | None) -> dict | None:
+        try:
+            self.proc.stdin.write(json.dumps([path, list(key), spill_dir]) + "\n")
+            self.proc.stdin.flush()
+            line = self.proc.stdout.readline()
+        except (OSError, ValueError) as e:
+            raise WorkerDied(str(e)) from None
+        if not line:
+            raise WorkerDied(f"Analyse-Worker beendet (rc={self.proc.poll()})")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    def close(self):
+        """stdin zu → der Worker endet; rechnet er noch, wird er beendet."""
+        try:
+            self.proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            self.proc.wait(timeout=0.5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc.stdout.close()
+
+
+# ── Index ──────────────────────────────────────────────────────────────────────
+class AnalysisIndex:
+    """Analyse-Ergebnisse pro Datei (JSON, atomar per Rename geschrieben).
+
+    Ein Eintrag gilt nur, solange mtime und Größe der Datei passen.
+    """
+
+    def __init__(self, path: Path):
+        self.path  = path
+        self._data: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self._data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            pass
+
+    def get(self, path: str) -> dict | None:
+        """Aktueller Eintrag zur Datei oder None (unbekannt bzw. geändert)."""
+        key = PcmCache.key(path)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._data.get(key[0])
+        if entry and entry.get("mtime") == key[1] and entry.get("size") == key[2]:
+            return entry
+        return None
+
+    def put(self, key: tuple, result: dict):
+        """key = PcmCache.key(path) von VOR der Analyse."""
+        with self._lock:
+            self._data[key[0]] = {"mtime": key[1], "size": key[2], **result}
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            text = json.dumps(self._data, indent=1)
+            self._dirty = False
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(text)
+            os.replace(tmp, self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+
+# ── Analyzer ───────────────────────────────────────────────────────────────────
+class Analyzer:
+    """Verteilt neue oder geänderte Dateien auf Worker-Prozesse.
+
+    Die Worker entstehen erst bei Arbeit und enden, sobald die Warteschlange
+    leer ist. Jeder Thread eines kleinen Thread-Pools bedient seinen eigenen
+    analysis_worker.py-Prozess. Bewusst kein multiprocessing: spawn wie
+    forkserver führen im Kind das Hauptmodul erneut aus – bei soundboard.py
+    hieße das PyQt6 pro Worker (Startzeit, RSS, Abbruch ohne Qt).
+    on_done(path) wird nach jeder fertigen Datei aus dem Analyzer-Thread
+    gerufen. Lässt sich kein Worker starten, wird im Analyzer-Thread selbst
+    gerechnet – auch dann blockiert nichts die GUI. Nach POOL_RETRY_SEC wird
+    der Pool erneut versucht (ein einzelner Absturz soll nicht für immer gelten).
+    """
+
+    def __init__(self, index: AnalysisIndex, cache: PcmCache | None = None,
+                 on_done: Callable[[str], None] | None = None,
+                 workers: int = POOL_WORKERS):
+        self.index   = index
+        self.cache   = cache
+        self.on_done = on_done
+        self.workers = workers
+        self._queue: deque[str] = deque()
+        self._lock   = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._running = True
+        self._no_pool_until = 0.0          # monotonic; bis dahin ohne Pool
+        self._local = threading.local()     # Pool-Thread → sein Worker
+        self._procs: list[_Worker] = []
+
+    def submit(self, paths: list[str]):
+        """Dateien ohne aktuellen Index-Eintrag einreihen (kehrt sofort zurück)."""
+        todo = [p for p in dict.fromkeys(paths) if p and not self._fresh(p)]
+        with self._lock:
+            self._queue.extend(p for p in todo if p not in self._queue)
+            if not self._queue or self._worker is not None or not self._running:
+                return
+            self._worker = threading.Thread(target=self._run, name="maiNboard-analyze",
+                                            daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        """Warteschlange verwerfen; laufende Analysen werden nicht mehr abgewartet."""
+        with self._lock:
+            self._running = False
+            self._queue.clear()
+
+    # ── intern ─────────────────────────────────────────────────────────────────
+    def _fresh(self, path: str) -> bool:
+        entry = self.index.get(path)
+        return entry is not None and entry.get("v") == ANALYSIS_VERSION
+
+    def _spill_dir(self) -> str | None:
+        d = self.cache.spill_dir if self.cache is not None else None
+        return str(d) if d is not None else None
+
+    def _run(self):
+        pool: ThreadPoolExecutor | None = None
+        pending: dict[Future, tuple[str, tuple]] = {}
+        try:
+            while True:
+                with self._lock:
+                    batch = list(self._queue) if self._running else []
+                    self._queue.clear()
+                for path in batch:
+                    key = PcmCache.key(path)
+                    if key is None or self._fresh(path):
+                        continue
+                    if time.monotonic() >= self._no_pool_until:
+                        try:
+                            if pool is None:
+                                pool = ThreadPoolExecutor(self.workers,
+                                                          thread_name_prefix="maiNboard-analyze")
+                            fut = pool.submit(self._remote, path, key, self._spill_dir())
+                            pending[fut] = (path, key)
+                            continue
+                        except RuntimeError:
+                            pool = self._drop_pool(pool)
+                    try:
+                        self._store(path, key, analyze_file(path, key, self._spill_dir()))
+                    except Exception:
+                        pass
+
+                if not pending:
+                    self.index.save()
+                    with self._lock:
+                        if not self._queue or not self._running:
+                            self._worker = None     # unter dem Lock → submit startet ggf. neu
+                            return
+                    continue
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    path, key = pending.pop(fut)
+                    try:
+                        result = fut.result()
+                    except WorkerDied:
+                        # Worker gestorben oder nicht startbar → Rest im eigenen Thread
+                        pool = self._drop_pool(pool)
+                        with self._lock:
+                            self._queue.append(path)
+                        continue
+                    except Exception:
+                        continue      # kaputte Datei o. Ä. – beim nächsten submit wieder
+                    self._store(path, key, result)
+                if not self._running:
+                    pending.clear()
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            self._close_workers()
+
+    def _remote(self, path: str, key: tuple, spill_dir: str | None) -> dict | None:
+        """Läuft in einem Pool-Thread und rechnet in dessen Worker-Prozess."""
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            try:
+                worker = _Worker()
+            except OSError as e:
+                raise WorkerDied(str(e)) from None
+            self._local.worker = worker
+            with self._lock:
+                self._procs.append(worker)
+        return worker.analyze(path, key, spill_dir)
+
+    def _drop_pool(self, pool: ThreadPoolExecutor | None) -> None:
+        self._no_pool_until = time.monotonic() + POOL_RETRY_SEC
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._close_workers()
+        return None
+
+    def _close_workers(self):
+        with self._lock:
+            procs, self._procs = self._procs, []
+        for worker in procs:
+            worker.close()
+
+    def _store(self, path: str, key: tuple, result: dict | None):
+        if not result or not self._running:
+            return
+        self.index.put(key, result)
+        if self.on_done is not None:
+            self.on_done(path)
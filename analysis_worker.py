@@ -0,0 +1,6 @@
+# Analyse-Worker für analysis.Analyzer – eigenes Hauptskript statt multiprocessing:
+# spawn und forkserver führen in jedem Kind das Hauptmodul des Elternprozesses
+# erneut aus (soundboard.py → PyQt6). Hier wird nur das Qt-freie analysis geladen.
+import sys
+from analysis import worker_main
+sys.exit(worker_main())
@@ -0,0 +1,936 @@
+"""
+maiNboard - Audio-Engine (Qt-frei)
+
+PCM-Cache:
+  Jede Datei wird genau einmal per ffmpeg nach 48 kHz / s16le / Stereo dekodiert.
+  Der Rohdaten-Puffer liegt danach im RAM (LRU, Speicherbudget) und wird beim
+  Verdrängen in ein Spill-Verzeichnis auf der Platte geschrieben.
+
+  Schlüssel = (Pfad, mtime, Größe) → geänderte Dateien werden automatisch neu dekodiert.
+
+Präfix-Cache (passt die Bibliothek nicht in den RAM):
+  Von jedem belegten Slot bleiben nur die ersten ~250 ms PCM dauerhaft im RAM.
+  Ein Trigger startet sofort aus dem Präfix, der Rest kommt im Hintergrund
+  (Spill-Datei oder ffmpeg) und wird exakt ab dem Präfix-Ende angehängt:
+
+    Präfix (RAM) ──► Voice spielt sofort
+    Spill-Datei / ffmpeg ab Frame n ──┘  wächst nach, bevor die Voice dort ankommt
+
+Mixer:
+  Ein langlebiger Thread mischt alle laufenden Voices blockweise (NumPy) und
+  schreibt pro Ziel-Sink in EINEN dauerhaft offenen paplay-Stream.
+  Ein Trigger legt nur eine Voice an – bei Cache-Treffer ohne fork/exec.
+
+    Voice ─┐                        ┌──►  paplay --device <sink>           (einmal gestartet)
+    Voice ─┼─►  Mixer-Bus pro Sink ─┼──►  paplay --device <Lautsprecher>
+    Voice ─┘                        └──►  paplay --device <weiterer Sink>  (gleiche Dekodierung)
+"""
+
+import hashlib
+import itertools
+import os
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from pulse import PactlBackend, PulseError
+
+RATE        = 48000
+CHANNELS    = 2
+FRAME_BYTES = 2 * CHANNELS          # s16le × Stereo
+CHUNK_BYTES = FRAME_BYTES * 4800    # 100 ms
+BLOCK_FRAMES = 480                  # 10 ms Mixer-Block
+LEAD_SEC     = 0.03                 # so weit schreibt der Mixer der Echtzeit voraus
+MAX_VOICES   = 32                   # globale Obergrenze, darüber wird die älteste Voice verdrängt
+PREFIX_MS     = 250                 # Sofortstart-Präfix pro belegtem Slot
+PREFIX_MAX_MS = 2000                # Obergrenze pro Slot (≈ 375 KB)
+
+# Verhalten bei erneutem Auslösen eines Slots, der noch spielt
+RETRIGGER_MODES = ("overlap", "restart", "toggle", "ignore")
+
+
+def ffmpeg_decode_cmd(path: str) -> list[str]:
+    """ffmpeg-Aufruf: beliebige Datei → rohes 48 kHz s16le Stereo auf stdout."""
+    return ["ffmpeg", "-i", path,
+            "-f", "s16le", "-ar", str(RATE), "-ac", str(CHANNELS),
+            "-loglevel", "quiet", "pipe:1"]
+
+
+# ── DSP ────────────────────────────────────────────────────────────────────────
+class DspChain:
+    """
+    Block-DSP pro Voice auf float32 (Vollaussteuerung = ±1.0):
+      Gain → Overdrive (Hard-Clip wie früher ffmpeg volume=N, oder Soft-Clip per tanh)
+
+    Die Parameter sind einfache Attribute und werden pro Block gelesen –
+    eine Änderung greift also auch bei bereits laufenden Sounds sofort.
+    """
+
+    def __init__(self, drive: float = 1.0, soft: bool = False):
+        self.drive = drive
+        self.soft  = soft
+
+    def process(self, x: np.ndarray, gain: float = 1.0) -> np.ndarray:
+        x *= gain * self.drive
+        if self.drive > 1:
+            if self.soft:
+                np.tanh(x, out=x)
+            else:
+                np.clip(x, -1.0, 1.0, out=x)
+        return x
+
+
+class Limiter:
+    """
+    Brickwall-Limiter für einen Mixer-Bus.
+
+    Pegel wird in 1-ms-Häppchen gemessen: Attack sofort, Release exponentiell.
+    Ein abschließender Clip garantiert, dass nichts über `ceiling` geht.
+    """
+    SUB = 48   # 1 ms bei 48 kHz
+
+    def __init__(self, ceiling: float = 0.98, release_ms: float = 80.0):
+        self.ceiling = ceiling
+        self.release = 1.0 - np.exp(-1.0 / release_ms)   # pro 1-ms-Schritt
+        self._gain   = 1.0
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        n = len(x) - len(x) % self.SUB
+        peaks = np.abs(x[:n]).reshape(-1, self.SUB * CHANNELS).max(axis=1)
+        if self._gain >= 1.0 and peaks.max(initial=0.0) <= self.ceiling:
+            return x   # Normalfall: nichts zu tun
+        target = np.minimum(1.0, self.ceiling / np.maximum(peaks, 1e-9))
+        gains  = np.empty_like(target)
+        g = self._gain
+        for i, t in enumerate(target):
+            g = t if t < g else g + (t - g) * self.release
+            gains[i] = g
+        self._gain = float(g)
+        x[:n] *= np.repeat(gains, self.SUB)[:, None]
+        np.clip(x, -self.ceiling, self.ceiling, out=x)
+        return x
+
+
+# ── PCM-Cache ──────────────────────────────────────────────────────────────────
+class PcmCache:
+    """LRU-Cache für dekodiertes PCM mit Speicherbudget und Spill-Verzeichnis."""
+
+    def __init__(self, budget_bytes: int, spill_dir: Path | None = None,
+                 spill_budget_bytes: int = 1024 * 1024 * 1024):
+        self.budget_bytes       = budget_bytes
+        self.spill_dir          = spill_dir
+        self.spill_budget_bytes = spill_budget_bytes
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self._used  = 0
+        self._lock  = threading.Lock()
+        self.hits   = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(path: str) -> tuple[str, int, int] | None:
+        """(realpath, mtime_ns, size) – None wenn die Datei nicht existiert."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+    def get(self, path: str, disk: bool = True) -> bytes | None:
+        """Gibt das dekodierte PCM zurück (RAM, sonst Spill-Datei) oder None.
+        disk=False: nur der RAM – kein blockierendes Lesen von der Platte."""
+        key = self.key(path)
+        if key is None:
+            return None
+        with self._lock:
+            pcm = self._entries.get(key)
+            if pcm is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pcm
+        if not disk:
+            return None
+        pcm = self._read_spill(key)
+        if pcm is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        self._insert(key, pcm)
+        with self._lock:
+            self.hits += 1
+        return pcm
+
+    def put(self, path: str, pcm: bytes, key: tuple | None = None):
+        """Legt dekodiertes PCM ab. `key` sollte VOR dem Dekodieren ermittelt werden."""
+        key = key or self.key(path)
+        if key is None or not pcm:
+            return
+        self._insert(key, pcm)
+
+    def set_budget(self, budget_bytes: int):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            evicted = self._evict_locked()
+        self._spill(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._used = 0
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+    def peek(self, key: tuple) -> bytes | None:
+        """PCM aus dem RAM, ohne LRU-Reihenfolge oder Statistik anzufassen."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def spill_file(self, key: tuple) -> Path | None:
+        """Vorhandene Spill-Datei zum Schlüssel (zum Streamen statt Komplett-Lesen)."""
+        p = self._spill_path(key)
+        return p if p is not None and p.exists() else None
+
+    # ── intern ─────────────────────────────────────────────────────────────────
+    def _insert(self, key: tuple, pcm: bytes):
+        if len(pcm) > self.budget_bytes:
+            # Passt nie in den RAM → direkt auf die Platte
+            self._spill([(key, pcm)])
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._used -= len(old)
+            self._entries[key] = pcm
+            self._used += len(pcm)
+            evicted = self._evict_locked()
+        self._spill(evicted)
+
+    def _evict_locked(self) -> list[tuple[tuple, bytes]]:
+        evicted = []
+        while self._used > self.budget_bytes and self._entries:
+            key, pcm = self._entries.popitem(last=False)
+            self._used -= len(pcm)
+            evicted.append((key, pcm))
+        return evicted
+
+    def _spill_path(self, key: tuple) -> Path | None:
+        if self.spill_dir is None:
+            return None
+        h = hashlib.sha1("\0".join(map(str, key)).encode()).hexdigest()
+        return self.spill_dir / f"{h}.pcm"
+
+    def _read_spill(self, key: tuple) -> bytes | None:
+        p = self._spill_path(key)
+        if p is None:
+            return None
+        try:
+            pcm = p.read_bytes()
+            os.utime(p)   # für das Aufräumen nach Alter
+        except OSError:
+            return None
+        return pcm
+
+    def _spill(self, items: list[tuple[tuple, bytes]]):
+        if not items or self.spill_dir is None:
+            return
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return
+        for key, pcm in items:
+            p = self._spill_path(key)
+            if p.exists():
+                continue
+            tmp = p.with_suffix(".tmp")
+            try:
+                tmp.write_bytes(pcm)
+                os.replace(tmp, p)
+            except OSError:
+                tmp.unlink(missing_ok=True)
+        self._prune_spill()
+
+    def _prune_spill(self):
+        """Hält das Spill-Verzeichnis unter seinem Budget (älteste Dateien zuerst)."""
+        try:
+            files = [(f.stat(), f) for f in self.spill_dir.glob("*.pcm")]
+        except OSError:
+            return
+        total = sum(st.st_size for st, _ in files)
+        for st, f in sorted(files, key=lambda x: x[0].st_mtime):
+            if total <= self.spill_budget_bytes:
+                break
+            f.unlink(missing_ok=True)
+            total -= st.st_size
+
+
+# ── Präfix-Cache ───────────────────────────────────────────────────────────────
+class PrefixCache:
+    """Die ersten `prefix_ms` jeder belegten Datei, dauerhaft im RAM.
+
+    Pro Datei prefix_ms × 192 Byte (250 ms ≈ 47 KB) ab dem Startpunkt der
+    Wiedergabe (Vorlauf = übersprungene Stille, siehe analysis.py), zusammen
+    höchstens PREFIX_MAX_MS – unabhängig vom Budget des PcmCache. Gefüllt wird im Hintergrund – bevorzugt aus dem
+    PcmCache (RAM, dann Spill-Datei), sonst per ffmpeg, das nach dem Präfix
+    abgebrochen wird. ffmpeg dekodiert deterministisch → das Präfix ist
+    bitgleich mit dem Anfang der vollen Dekodierung.
+    """
+
+    def __init__(self, prefix_ms: int = PREFIX_MS, cache: PcmCache | None = None):
+        self.cache = cache
+        self._entries: dict[tuple, tuple[bytes, bool]] = {}   # Schlüssel → (PCM, ganze Datei?)
+        self._wanted: dict[tuple, tuple[str, int]] = {}       # Schlüssel → (Pfad, Vorlauf in Frames)
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self.set_length(prefix_ms)
+
+    def set_length(self, prefix_ms: int):
+        ms = max(0, min(PREFIX_MAX_MS, int(prefix_ms)))
+        with self._lock:
+            self.prefix_bytes = RATE * ms // 1000 * FRAME_BYTES
+            self._entries.clear()
+        self._kick()
+
+    def set_paths(self, paths: list[str], leads: dict[str, int] | None = None):
+        """Diese Dateien warm halten, alle anderen Präfixe freigeben.
+        leads: Pfad → Frames, ab denen die Wiedergabe beginnt (Standard 0)."""
+        leads = leads or {}
+        wanted = {}
+        for path in paths:
+            key = PcmCache.key(path)
+            if key is not None:
+                wanted[key] = (path, max(wanted.get(key, ("", 0))[1], leads.get(path, 0)))
+        with self._lock:
+            self._wanted = wanted
+            for key in [k for k in self._entries if k not in wanted]:
+                del self._entries[key]
+        self._kick()
+
+    def get(self, key: tuple) -> tuple[bytes, bool] | None:
+        """(Präfix, ist die ganze Datei) oder None."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def offer(self, key: tuple, pcm: bytes):
+        """Volles PCM nach einer Dekodierung – übernimmt den Anfang, falls gewünscht."""
+        with self._lock:
+            n = self._size_locked(key)
+            if n and self._stale_locked(key, n):
+                self._entries[key] = (pcm[:n], len(pcm) <= n)
+
+    @property
+    def used_bytes(self) -> int:
+        with self._lock:
+            return sum(len(pcm) for pcm, _ in self._entries.values())
+
+    # ── intern ─────────────────────────────────────────────────────────────────
+    def _size_locked(self, key: tuple) -> int:
+        """Soll-Größe des Präfixes in Bytes (0 = nicht gewünscht/aus)."""
+        want = self._wanted.get(key)
+        if want is None or not self.prefix_bytes:
+            return 0
+        return min(want[1] * FRAME_BYTES + self.prefix_bytes,
+                   RATE * PREFIX_MAX_MS // 1000 * FRAME_BYTES)
+
+    def _stale_locked(self, key: tuple, n: int) -> bool:
+        entry = self._entries.get(key)
+        return entry is None or (not entry[1] and len(entry[0]) < n)
+
+    def _kick(self):
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._fill, name="maiNboard-prefix",
+                                            daemon=True)
+            self._worker.start()
+
+    def _fill(self):
+        # Nacheinander statt parallel: Warmhalten darf Trigger nie ausbremsen
+        failed = set()      # ffmpeg fehlt, Datei kaputt … – erst beim nächsten Anstoß wieder
+        while True:
+            with self._lock:
+                missing = [(k, p, self._size_locked(k)) for k, (p, _) in self._wanted.items()
+                           if k not in failed]
+                missing = [m for m in missing if m[2] and self._stale_locked(m[0], m[2])]
+                if not missing:
+                    self._worker = None     # unter dem Lock → _kick startet ggf. neu
+                    return
+            key, path, n = missing[0]
+            entry = self._load(key, path, n)
+            with self._lock:
+                if entry is None:
+                    failed.add(key)
+                elif n == self._size_locked(key):
+                    self._entries[key] = entry
+
+    def _load(self, key: tuple, path: str, n: int) -> tuple[bytes, bool] | None:
+        pcm = self.cache.peek(key) if self.cache else None
+        if pcm is not None:
+            return pcm[:n], len(pcm) <= n
+        spill = self.cache.spill_file(key) if self.cache else None
+        if spill is not None:
+            try:
+                with open(spill, "rb") as f:
+                    head = f.read(n)
+                    return head, len(head) < n or not f.read(1)
+            except OSError:
+                pass
+        try:
+            p = subprocess.Popen(ffmpeg_decode_cmd(path),
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError:
+            return None
+        head, rc = b"", 0
+        try:
+            while len(head) < n:
+                chunk = p.stdout.read(n - len(head))
+                if not chunk:
+                    break
+                head += chunk
+            # Präfix voll? Ein Byte mehr zeigt, ob die Datei genau hier endet
+            complete = len(head) < n or not p.stdout.read(1)
+            if complete:
+                rc = p.wait()           # bis EOF gelesen → ffmpeg endet von selbst
+        finally:
+            if p.poll() is None:
+                p.kill()                # nur den Rest sparen – kein Fehler
+            p.stdout.close()
+            p.wait()
+        if complete and rc != 0:
+            return None     # Datei kaputt/unlesbar – nicht als "ganze Datei" merken
+        head = head[:len(head) - len(head) % FRAME_BYTES]
+        return (head, complete) if head else None
+
+
+# ── Mixer ──────────────────────────────────────────────────────────────────────
+class PcmSource:
+    """PCM einer Datei – fertig aus dem Cache oder wachsend, solange ffmpeg noch dekodiert."""
+
+    def __init__(self, pcm: bytes | None = None):
+        self._buf      = bytearray()
+        self._data     = None
+        self.complete  = False
+        if pcm is not None:
+            self.finish(pcm)
+
+    @property
+    def frames(self) -> int:
+        buf, data = self._buf, self._data      # Reihenfolge: siehe read()
+        if data is not None:
+            return len(data)
+        return len(buf) // FRAME_BYTES
+
+    def append(self, chunk: bytes):
+        self._buf += chunk
+
+    def finish(self, pcm: bytes | None = None):
+        # erst _data setzen, dann _buf leeren – read()/frames verlassen sich darauf
+        if pcm is None:
+            pcm = bytes(self._buf[:len(self._buf) - len(self._buf) % FRAME_BYTES])
+        self._data    = np.frombuffer(pcm, dtype=np.int16).reshape(-1, CHANNELS)
+        self._buf     = bytearray()
+        self.complete = True
+
+    def pcm_bytes(self) -> bytes:
+        return self._data.tobytes() if self._data is not None else b""
+
+    def read(self, pos: int, n: int) -> np.ndarray:
+        """Bis zu n Frames ab Position pos (int16, Form (k, 2))."""
+        # Erst _buf, dann _data lesen: läuft finish() dazwischen, ist _data schon
+        # gesetzt; sonst ist der alte Puffer noch vollständig. Umgekehrt könnte
+        # ein schon geleerter _buf einen leeren Block (10 ms Lücke) liefern.
+        buf, data = self._buf, self._data
+        if data is not None:
+            return data[pos:pos + n]
+        # Slice kopiert → der bytearray bleibt für den Decoder vergrößerbar
+        raw = buf[pos * FRAME_BYTES:(pos + n) * FRAME_BYTES]
+        raw = raw[:len(raw) - len(raw) % FRAME_BYTES]
+        return np.frombuffer(raw, dtype=np.int16).reshape(-1, CHANNELS)
+
+
+def _pump(f, src: PcmSource, skip: int = 0):
+    """Liest f bis EOF in src; die ersten `skip` Bytes werden verworfen."""
+    while True:
+        chunk = f.read(CHUNK_BYTES)
+        if not chunk:
+            return
+        if skip:
+            cut = min(skip, len(chunk))
+            chunk, skip = chunk[cut:], skip - cut
+        if chunk:
+            src.append(chunk)
+
+
+class Voice:
+    """Eine laufende Wiedergabe im Mixer."""
+    __slots__ = ("id", "slot", "source", "sinks", "gain", "pos", "end", "done",
+                 "origin", "dispatched", "created", "first_write", "_event")
+
+    def __init__(self, vid: int, slot: int, source: PcmSource,
+                 sinks: tuple, gain: float = 1.0, start: int = 0, end: int | None = None):
+        self.id        = vid
+        self.slot      = slot
+        self.source    = source
+        self.sinks     = sinks
+        self.gain      = gain
+        self.pos       = start
+        self.end       = end       # Frame, an dem die Voice endet (None = Dateiende)
+        self.done      = False
+        self.origin: float | None = None       # Tastendruck (Kernel-Zeitstempel)
+        self.dispatched: float | None = None   # Trigger in der GUI angekommen
+        self.created   = time.monotonic()
+        self.first_write: float | None = None   # erste Samples an paplay übergeben
+        self._event    = threading.Event()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._event.wait(timeout)
+
+
+class SinkOutput:
+    """Dauerhaft offener Raw-Stream in einen Sink (ein paplay-Prozess pro Sink)."""
+
+    def __init__(self, sink: str | None, volume: int):
+        self.sink = sink
+        self.sink_input: int | None = None   # PulseAudio-Index, sobald bekannt
+        cmd = ["paplay"]
+        if sink:
+            cmd += ["--device", sink]
+        cmd += ["--raw", "--format=s16le", f"--rate={RATE}", f"--channels={CHANNELS}",
+                "--latency-msec=20", f"--volume={int(65536 * volume / 100)}"]
+        self.proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, bufsize=0,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None and not self.proc.stdin.closed
+
+    def write(self, data: bytes) -> bool:
+        try:
+            self.proc.stdin.write(data)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def bind(self, sink_inputs) -> bool:
+        """Merkt sich den Sink-Input dieses Streams (PID-Vergleich, einmalig)."""
+        for si in sink_inputs:
+            if si.pid == self.proc.pid:
+                self.sink_input = si.index
+                return True
+        return False
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        if self.proc.poll() is None:
+            self.proc.terminate()
+
+
+class Mixer:
+    """Langlebige Playback-Engine: Voices rein, ein Stream pro Sink raus."""
+
+    def __init__(self, cache: PcmCache | None = None, volume: int = 100,
+                 overdrive: float = 1.0, soft_clip: bool = False, limiter: bool = True,
+                 pulse=None, state=None, controls=None, max_voices: int = MAX_VOICES,
+                 stats=None, prefixes: PrefixCache | None = None):
+        self.cache   = cache
+        self.prefixes = prefixes  # optional: Sofortstart für belegte Slots
+        self.stats   = stats      # optional LatencyStats: Stufen pro Trigger
+        self.max_voices = max_voices
+        self.pulse   = pulse if pulse is not None else PactlBackend()
+        self.state   = state      # optional PulseState: Sink-Inputs aus dem Speicher
+        self.controls = controls  # optional ControlWorker: Volume-Befehle im Hintergrund
+        if state is not None:
+            state.add_listener(self._on_pulse_changed)
+        self.volume  = volume
+        self.dsp     = DspChain(overdrive, soft_clip)
+        self.limiter = limiter
+        self._limiters: dict[str | None, Limiter] = {}
+        self._voices: list[Voice] = []          # Voice-Tabelle (Voice hat __slots__)
+        self._started: list[Voice] = []         # noch nicht gemeldete Starts/Enden
+        self._ended:   list[Voice] = []
+        self._listeners: list[Callable[[list[Voice], list[Voice]], None]] = []
+        self._outputs: dict[str | None, SinkOutput] = {}
+        self._decoding: dict[tuple, PcmSource] = {}
+        self._cond    = threading.Condition()
+        self._ids     = itertools.count(1)
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    # ── Steuerung ──────────────────────────────────────────────────────────────
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="maiNboard-mixer", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        self.stop_all()
+        with self._cond:
+            outputs = list(self._outputs.values())
+            self._outputs.clear()
+        for out in outputs:
+            out.close()
+
+    def play(self, path: str, sinks: list[str | None], slot: int = -1,
+             gain: float = 1.0, retrigger: str = "overlap",
+             polyphony: int = 0, origin: float | None = None,
+             dispatched: float | None = None,
+             start: int = 0, end: int | None = None) -> Voice | None:
+        """Legt eine Voice an. Bei Cache-Treffer ohne jeden Prozessstart.
+
+        Beliebig viele Sinks: die Datei wird einmal dekodiert und pro Block
+        in jeden Sink-Bus addiert (doppelte Einträge zählen einfach).
+
+        Spielt der Slot schon (retrigger):
+          overlap  →  zusätzlich starten; mehr als `polyphony` (0 = unbegrenzt)
+                      Voices dieses Slots → die älteste fliegt raus
+          restart  →  laufende Voices des Slots stoppen, neu starten
+          toggle   →  laufende Voices stoppen, nichts starten
+          ignore   →  nichts tun
+        Über `max_voices` hinaus wird global die älteste Voice verdrängt.
+        None = es wurde (gewollt) keine Voice gestartet.
+
+        origin/dispatched: monotone Zeitstempel von Tastendruck und GUI-Dispatch
+        (nur für die Latenz-Statistik).
+        start/end: abgespielter Ausschnitt in Frames (z. B. ohne Stille am Anfang).
+        """
+        if retrigger in ("ignore", "toggle"):
+            # Wird ohnehin nichts gestartet, gar nicht erst eine Quelle anlegen
+            with self._cond:
+                start_new, stopped = self._retrigger_locked(slot, retrigger)
+            if not start_new:
+                for v in stopped:
+                    self._finish(v)
+                return None
+        sinks = tuple(dict.fromkeys(sinks))
+        voice = Voice(next(self._ids), slot, self._source(path), sinks, gain, start, end)
+        voice.origin, voice.dispatched = origin, dispatched
+        # Entscheidung, Verdrängen und Einfügen in einem Schritt – zwei
+        # gleichzeitige Trigger desselben Slots sehen sich gegenseitig
+        with self._cond:
+            start_new, stopped = self._retrigger_locked(slot, retrigger)
+            if start_new:
+                stopped += self._steal_locked(slot, polyphony)
+                for sink in voice.sinks:
+                    self._open_output_locked(sink)
+                self._voices.append(voice)
+                self._started.append(voice)
+                self._cond.notify()
+        for v in stopped:
+            self._finish(v)
+        return voice if start_new else None
+
+    def add_listener(self, cb: Callable[[list[Voice], list[Voice]], None]):
+        """cb(gestartet, beendet) – gebündelt, aus dem Mixer-Thread."""
+        self._listeners.append(cb)
+
+    def voices(self) -> list[Voice]:
+        with self._cond:
+            return list(self._voices)
+
+    def stop_voice(self, voice: Voice):
+        with self._cond:
+            if voice in self._voices:
+                self._voices.remove(voice)
+        self._finish(voice)
+
+    def stop_all(self):
+        with self._cond:
+            voices, self._voices = self._voices, []
+        for v in voices:
+            self._finish(v)
+
+    def stop_slot(self, slot: int):
+        with self._cond:
+            running = [v for v in self._voices if v.slot == slot]
+        self._stop_voices(running)
+
+    def set_max_voices(self, n: int):
+        self.max_voices = max(1, int(n))
+
+    def set_volume(self, volume: int):
+        """Stream-Lautstärke live (> 100 % = Boost) – ein Batch für alle Sinks.
+
+        Mit ControlWorker kehrt der Aufruf sofort zurück; gesendet wird nur
+        der zuletzt gesetzte Wert.
+        """
+        self.volume = volume
+        if self.controls is not None:
+            self.controls.submit(("stream-volume",), self._apply_volume)
+        else:
+            self._apply_volume()
+
+    def set_overdrive(self, drive: float):
+        """Live: wirkt ab dem nächsten Block auch auf laufende Sounds."""
+        self.dsp.drive = float(drive)
+
+    def set_soft_clip(self, soft: bool):
+        self.dsp.soft = soft
+
+    def set_limiter(self, enabled: bool):
+        self.limiter = enabled
+
+    def set_outputs(self, sinks: list[str | None]):
+        """Öffnet Streams für `sinks` vorab und schließt alle anderen."""
+        with self._cond:
+            for sink in sinks:
+                self._open_output_locked(sink)
+            stale = [s for s in self._outputs if s not in sinks]
+            closed = [self._outputs.pop(s) for s in stale]
+        for out in closed:
+            out.close()
+
+    def close_output(self, sink: str | None):
+        """Stream schließen, z. B. bevor der Sink entladen wird (sonst verschiebt
+        PulseAudio den Stream auf den Fallback-Sink)."""
+        with self._cond:
+            out = self._outputs.pop(sink, None)
+        if out is not None:
+            out.close()
+
+    # ── intern ─────────────────────────────────────────────────────────────────
+    def _stop_voices(self, voices: list[Voice]):
+        with self._cond:
+            self._voices = [v for v in self._voices if v not in voices]
+        for v in voices:
+            self._finish(v)
+
+    def _retrigger_locked(self, slot: int, retrigger: str) -> tuple[bool, list[Voice]]:
+        """(neue Voice starten?, entfernte Voices des Slots) – beendet werden
+        sie erst nach dem Lock (_finish nimmt ihn selbst)."""
+        if slot < 0 or retrigger == "overlap":
+            return True, []
+        running = [v for v in self._voices if v.slot == slot]
+        if not running:
+            return True, []
+        if retrigger == "ignore":
+            return False, []
+        self._voices = [v for v in self._voices if v not in running]
+        return retrigger == "restart", running
+
+    def _steal_locked(self, slot: int, polyphony: int) -> list[Voice]:
+        """Platz für eine neue Voice schaffen (älteste zuerst, Liste ist nach Start sortiert)."""
+        stolen = []
+        if slot >= 0 and polyphony > 0:
+            same = [v for v in self._voices if v.slot == slot]
+            stolen += same[:max(0, len(same) - polyphony + 1)]
+        excess = len(self._voices) - len(stolen) - self.max_voices + 1
+        if excess > 0:
+            stolen += [v for v in self._voices if v not in stolen][:excess]
+        if stolen:
+            self._voices = [v for v in self._voices if v not in stolen]
+        return stolen
+
+    def _apply_volume(self):
+        # Sink-Input-Indizes sind pro Stream gecacht; nur unbekannte werden
+        # (höchstens einmal pro Aufruf) nachgeschlagen.
+        volume = self.volume
+        with self._cond:
+            outputs = [o for o in self._outputs.values() if o.alive]
+        if not outputs:
+            return
+        if any(o.sink_input is None for o in outputs):
+            self._bind_outputs(outputs)
+        changes = {o.sink_input: volume for o in outputs if o.sink_input is not None}
+        if not changes:
+            return
+        try:
+            self.pulse.set_sink_input_volumes(changes)
+        except PulseError:
+            # Index veraltet (Stream neu verbunden o. Ä.) → beim nächsten Mal neu binden
+            for o in outputs:
+                o.sink_input = None
+
+    def _on_pulse_changed(self, facility: str):
+        """PulseState-Listener: neue Streams sofort ihrem Sink-Input zuordnen."""
+        if facility != "sink-input":
+            return
+        with self._cond:
+            outputs = list(self._outputs.values())
+        known = {si.index for si in self.state.sink_inputs()}
+        for o in outputs:
+            if o.sink_input is not None and o.sink_input not in known:
+                o.sink_input = None
+        self._bind_outputs([o for o in outputs if o.sink_input is None])
+
+    def _bind_outputs(self, outputs: list[SinkOutput]):
+        if not outputs:
+            return
+        if self.state is not None:
+            outputs = [o for o in outputs if not o.bind(self.state.sink_inputs())]
+            if not outputs:
+                return
+        try:
+            sink_inputs = self.pulse.list_sink_inputs()
+        except PulseError:
+            return
+        for o in outputs:
+            o.bind(sink_inputs)
+
+    def _open_output_locked(self, sink: str | None):
+        out = self._outputs.get(sink)
+        if out is None or not out.alive:
+            self._outputs[sink] = SinkOutput(sink, self.volume)
+
+    def _source(self, path: str) -> PcmSource:
+        key = PcmCache.key(path) or (path, 0, 0)
+        head = self.prefixes.get(key) if self.prefixes else None
+        if head is not None and head[1]:
+            return PcmSource(head[0])       # kurzer Sound: das Präfix ist schon alles
+        # Mit Präfix nur im RAM nachsehen – die Spill-Datei wird dann gestreamt
+        pcm = self.cache.get(path, disk=head is None) if self.cache else None
+        if pcm is not None:
+            return PcmSource(pcm)
+        with self._cond:
+            src = self._decoding.get(key)
+            if src is not None:
+                return src   # wird schon dekodiert → mitlesen
+            src = PcmSource()
+            if head is not None:
+                src.append(head[0])
+            self._decoding[key] = src
+        threading.Thread(target=self._decode, args=(path, key, src),
+                         name="maiNboard-decode", daemon=True).start()
+        return src
+
+    def _decode(self, path: str, key: tuple, src: PcmSource):
+        """Füllt src bis zum Ende. Steckt schon ein Präfix drin, geht es exakt an
+        dessen Ende weiter: aus der Spill-Datei ab Offset, sonst wird der Anfang
+        der ffmpeg-Ausgabe verworfen."""
+        ok = False
+        skip = src.frames * FRAME_BYTES
+        try:
+            spill = self.cache.spill_file(key) if self.cache and skip else None
+            if spill is not None:
+                with open(spill, "rb") as f:
+                    f.seek(skip)
+                    _pump(f, src)
+                ok = True
+            else:
+                p = subprocess.Popen(ffmpeg_decode_cmd(path),
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                _pump(p.stdout, src, skip)
+                p.stdout.close()
+                ok = p.wait() == 0
+        except OSError:
+            pass
+        finally:
+            src.finish()
+            with self._cond:
+                self._decoding.pop(key, None)
+        if not ok:
+            return
+        pcm = src.pcm_bytes()
+        if self.cache:
+            self.cache.put(path, pcm, key)
+        if self.prefixes is not None:
+            self.prefixes.offer(key, pcm)
+
+    def _finish(self, voice: Voice):
+        if voice.done:
+            return
+        voice.done = True
+        voice._event.set()
+        with self._cond:
+            self._ended.append(voice)
+            self._cond.notify()
+
+    def _notify(self):
+        """Gesammelte Starts/Enden an die Listener – ein Aufruf pro Mixer-Block."""
+        with self._cond:
+            if not (self._started or self._ended):
+                return
+            started, self._started = self._started, []
+            ended,   self._ended   = self._ended, []
+        for cb in list(self._listeners):
+            try:
+                cb(started, ended)
+            except Exception:
+                pass
+
+    def _run(self):
+        t0, frames_out = 0.0, 0
+        while True:
+            self._notify()
+            with self._cond:
+                if not self._voices:
+                    # Leerlauf: nichts schreiben, der Stream läuft einfach leer
+                    while self._running and not (self._voices or self._ended):
+                        self._cond.wait()
+                    if not self._running:
+                        return
+                    if not self._voices:
+                        continue          # nur Enden zu melden
+                    t0, frames_out = time.monotonic(), 0
+                if not self._running:
+                    return
+                voices  = list(self._voices)
+                outputs = dict(self._outputs)
+
+            buses = {sink: np.zeros((BLOCK_FRAMES, CHANNELS), dtype=np.float32)
+                     for sink in outputs}
+            ended, fresh = [], []
+            for v in voices:
+                want = BLOCK_FRAMES if v.end is None else max(0, min(BLOCK_FRAMES, v.end - v.pos))
+                blk = v.source.read(v.pos, want)
+                n = len(blk)
+                if n:
+                    if v.first_write is None:
+                        fresh.append(v)
+                    v.pos += n
+                    x = self.dsp.process(blk.astype(np.float32), v.gain / 32768.0)
+                    for sink in v.sinks:
+                        bus = buses.get(sink)
+                        if bus is not None:
+                            bus[:n] += x
+                if (v.source.complete and v.pos >= v.source.frames) or \
+                        (v.end is not None and v.pos >= v.end):
+                    ended.append(v)
+
+            for sink, bus in buses.items():
+                if self.limiter:
+                    lim = self._limiters.get(sink)
+                    if lim is None:
+                        lim = self._limiters[sink] = Limiter()
+                    lim.process(bus)
+                else:
+                    np.clip(bus, -1.0, 1.0, out=bus)
+                bus *= 32767.0
+                outputs[sink].write(bus.astype(np.int16).tobytes())
+            frames_out += BLOCK_FRAMES
+            if fresh:
+                now = time.monotonic()
+                for v in fresh:
+                    v.first_write = now
+                    if self.stats is not None:
+                        self.stats.record_voice(v)
+
+            if ended:
+                with self._cond:
+                    self._voices = [v for v in self._voices if v not in ended]
+                for v in ended:
+                    self._finish(v)
+
+            ahead = t0 + frames_out / RATE - time.monotonic()
+            if ahead > LEAD_SEC:
+                time.sleep(ahead - LEAD_SEC)
+            elif ahead < -0.1:
+                # Hänger (Swap, Suspend …): nicht aufholen, Takt neu ansetzen
+                t0 = time.monotonic() - frames_out / RATE
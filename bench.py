@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+maiNboard - Trigger-Latenz-Benchmark (headless, ohne Audio-Hardware)
+
+Misst die Zeit vom Trigger bis zum ersten Sample, das an den paplay-Stream
+übergeben wird, dazu Trigger-Durchsatz, Prozess-/Thread-Spitzen und RSS.
+
+  Engine-Modus (Standard)  →  Mixer.play() direkt, Null-PulseAudio-Backend
+  --gui                    →  MainWindow._play() / _stop_all() (Qt offscreen)
+
+`ffmpeg`, `paplay` und `pactl` werden durch Platzhalter in einem Temp-
+Verzeichnis ersetzt (vorne im PATH): ffmpeg liefert die Testdatei roh aus,
+paplay verwirft alles, pactl antwortet leer. Echte Prozesse werden also
+weiterhin gestartet – genau das soll der Benchmark sichtbar machen.
+
+Aufruf:
+  python bench.py [--gui] [--json datei.json] [--only single,spam,...]
+
+Szenario `cli` misst die Kaltstartzeit von `maiNboard` (cli.py) als eigener Prozess – einmal
+gegen eine laufende Instanz (Steuer-Socket), einmal im One-Shot-Fallback.
+"""
+
+import argparse
+import json
+import os
+import stat
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+import numpy as np
+
+SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import audio_engine  # noqa: E402
+from audio_engine import RATE, PcmCache, Mixer  # noqa: E402
+
+SLOTS     = 24
+BENCH_SINK = "bench_sink"
+
+SHIMS = {
+    "paplay": "#!/bin/sh\nexec cat > /dev/null\n",
+    "ffmpeg": ('#!/bin/sh\nwhile [ $# -gt 0 ]; do\n'
+               '  if [ "$1" = "-i" ]; then exec cat "$2"; fi\n  shift\ndone\n'),
+    "pactl":  ('#!/bin/sh\ncase "$1" in\n'
+               '  subscribe) exec sleep 1000000 ;;\n'
+               f'  get-default-sink) echo {BENCH_SINK} ;;\n'
+               'esac\nexit 0\n'),
+}
+
+SCENARIOS = ("cold", "single", "spam", "burst24", "stopall", "flood", "cli")
+CLI_BUDGET_MS = 30.0   # Ziel für `maiNboard play N` gegen eine laufende Instanz
+
+
+# ── Umgebung ───────────────────────────────────────────────────────────────────
+def install_shims(root: Path):
+    bin_dir = root / "bin"
+    bin_dir.mkdir()
+    for name, text in SHIMS.items():
+        p = bin_dir / name
+        p.write_text(text)
+        p.chmod(p.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+
+def make_sound(path: Path, seconds: float, freq: float):
+    """Rohes s16le-Stereo (der ffmpeg-Platzhalter reicht es unverändert durch)."""
+    t = np.arange(int(RATE * seconds), dtype=np.float32) / RATE
+    mono = (0.3 * 32767 * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+    path.write_bytes(np.repeat(mono[:, None], 2, axis=1).tobytes())
+
+
+class NullPulse:
+    """PulseAudio-Backend ohne Server – der Benchmark misst nur den Trigger-Pfad."""
+    name = "null"
+
+    def list_sink_inputs(self):
+        return []
+
+    def set_sink_input_volumes(self, changes):
+        pass
+
+    def set_sink_input_volume(self, index, percent):
+        pass
+
+
+class Sampler(threading.Thread):
+    """Spitzenwerte für Kindprozesse, Threads und RSS (aus /proc)."""
+
+    def __init__(self, interval: float = 0.01):
+        super().__init__(name="bench-sampler", daemon=True)
+        self.interval = interval
+        self.pid = os.getpid()
+        self._halt = threading.Event()
+        self.reset()
+
+    def reset(self):
+        self.peak_children = 0
+        self.peak_threads  = 0
+        self.peak_rss_kb   = 0
+
+    def run(self):
+        while not self._halt.wait(self.interval):
+            self.peak_children = max(self.peak_children, self._children())
+            self.peak_threads  = max(self.peak_threads, len(os.listdir("/proc/self/task")))
+            self.peak_rss_kb   = max(self.peak_rss_kb, self._rss_kb())
+
+    def stop(self):
+        self._halt.set()
+
+    def _children(self) -> int:
+        try:
+            n = 0
+            for tid in os.listdir("/proc/self/task"):
+                with open(f"/proc/self/task/{tid}/children") as f:
+                    n += len(f.read().split())
+            return n
+        except OSError:
+            # Kernel ohne CONFIG_PROC_CHILDREN → /proc durchsuchen
+            n = 0
+            for entry in os.listdir("/proc"):
+                if entry.isdigit():
+                    try:
+                        with open(f"/proc/{entry}/stat") as f:
+                            if int(f.read().rsplit(")", 1)[1].split()[1]) == self.pid:
+                                n += 1
+                    except (OSError, IndexError, ValueError):
+                        pass
+            return n
+
+    @staticmethod
+    def _rss_kb() -> int:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+        return 0
+
+
+# ── Trigger-Ziele ──────────────────────────────────────────────────────────────
+class EngineTarget:
+    """Trigger direkt über die Engine."""
+
+    def __init__(self, sounds: list[Path], cache_dir: Path):
+        self.sounds = sounds
+        self.mixer = Mixer(PcmCache(256 * 1024 * 1024, cache_dir), pulse=NullPulse())
+        self.mixer.start()
+        self.mixer.set_outputs([BENCH_SINK])
+
+    def trigger(self, slot: int):
+        self.mixer.play(str(self.sounds[slot]), [BENCH_SINK], slot=slot)
+
+    def stop_all(self):
+        self.mixer.stop_all()
+
+    def pump(self, seconds: float):
+        time.sleep(seconds)
+
+    def close(self):
+        self.mixer.shutdown()
+
+
+class GuiTarget:
+    """Trigger über MainWindow – inklusive aller Qt-/Thread-Kosten pro Trigger."""
+
+    def __init__(self, sounds: list[Path], cache_dir: Path):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+        os.environ["XDG_RUNTIME_DIR"] = str(cache_dir.parent)   # eigener Steuer-Socket
+        import core
+        import soundboard
+        core.CONFIG_FILE = cache_dir.parent / "config.json"
+        core.CACHE_DIR = cache_dir
+        core.CONFIG_FILE.write_text(json.dumps({
+            "buttons": {str(i): {"path": str(p), "label": p.stem} for i, p in enumerate(sounds)},
+            "local_monitor": True, "output_sink": BENCH_SINK, "pulse_backend": "pactl",
+        }))
+        self.app = QApplication.instance() or QApplication([])
+        self.win = soundboard.MainWindow()
+        self.mixer = self.win.engine
+        self.pump(0.2)
+
+    def trigger(self, slot: int):
+        self.win._play(slot)
+        self.app.processEvents()
+
+    def stop_all(self):
+        self.win._stop_all()
+        self.app.processEvents()
+
+    def pump(self, seconds: float):
+        end = time.monotonic() + seconds
+        while True:
+            self.app.processEvents()
+            left = end - time.monotonic()
+            if left <= 0:
+                return
+            time.sleep(min(left, 0.002))
+
+    def close(self):
+        self.win.close()
+        self.pump(0.1)
+
+
+class Recorder:
+    """Hängt sich an Mixer.play: ordnet jede Voice ihrem Trigger-Zeitpunkt zu."""
+
+    def __init__(self, mixer: Mixer):
+        self.mixer = mixer
+        self._orig = mixer.play
+        self._pending: dict[int, deque] = defaultdict(deque)
+        self._lock = threading.Lock()
+        self.samples: list[tuple[float, object]] = []
+        mixer.play = self._play
+
+    def mark(self, slot: int):
+        with self._lock:
+            self._pending[slot].append(time.monotonic())
+
+    def _play(self, path, sinks, slot=-1, **kw):
+        voice = self._orig(path, sinks, slot=slot, **kw)
+        with self._lock:
+            q = self._pending.get(slot)
+            if q:
+                t = q.popleft()
+                if voice is not None:
+                    self.samples.append((t, voice))
+        return voice
+
+    def take(self) -> list[tuple[float, object]]:
+        with self._lock:
+            out, self.samples = self.samples, []
+            self._pending.clear()
+        return out
+
+
+# ── Auswertung ─────────────────────────────────────────────────────────────────
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def latency_stats(samples, target, triggers: int, timeout: float = 2.0) -> dict:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end and any(
+            v.first_write is None and not v.done for _, v in samples):
+        target.pump(0.01)
+    lat = [(v.first_write - t) * 1000 for t, v in samples if v.first_write is not None]
+    return {
+        "triggers": triggers,
+        "voices": len(samples),
+        "no_sample": triggers - len(lat),
+        "p50_ms": round(percentile(lat, 50), 2),
+        "p99_ms": round(percentile(lat, 99), 2),
+        "max_ms": round(max(lat), 2) if lat else float("nan"),
+        "mean_ms": round(statistics.fmean(lat), 2) if lat else float("nan"),
+    }
+
+
+def settle(target, seconds: float = 0.3):
+    target.stop_all()
+    target.pump(seconds)
+
+
+# ── Szenarien ──────────────────────────────────────────────────────────────────
+def sc_cold(target, rec, n_cold: list[int]) -> dict:
+    """Erster Trigger je Datei: Cache-Fehltreffer → Dekodierprozess."""
+    for slot in n_cold:
+        rec.mark(slot)
+        target.trigger(slot)
+        target.pump(0.15)
+    res = latency_stats(rec.take(), target, len(n_cold))
+    settle(target)
+    return res
+
+
+def sc_single(target, rec, rounds: int = 40) -> dict:
+    """Einzelner Trigger aus dem Leerlauf (warmer Cache)."""
+    for i in range(rounds):
+        rec.mark(0)
+        target.trigger(0)
+        target.pump(0.12)
+        target.stop_all()
+        target.pump(0.05)
+    res = latency_stats(rec.take(), target, rounds)
+    settle(target)
+    return res
+
+
+def sc_spam(target, rec, hz: float = 50.0, seconds: float = 3.0) -> dict:
+    """Ein Slot, mit `hz` dauerhaft neu ausgelöst (Voices überlappen)."""
+    period, n = 1.0 / hz, int(hz * seconds)
+    t0 = time.monotonic()
+    for i in range(n):
+        rec.mark(1)
+        target.trigger(1)
+        target.pump(max(0.0, t0 + (i + 1) * period - time.monotonic()))
+    elapsed = time.monotonic() - t0
+    res = latency_stats(rec.take(), target, n)
+    res["achieved_hz"] = round(n / elapsed, 1)
+    settle(target)
+    return res
+
+
+def sc_burst24(target, rec, rounds: int = 5) -> dict:
+    """Alle 24 Slots gleichzeitig."""
+    for _ in range(rounds):
+        for slot in range(SLOTS):
+            rec.mark(slot)
+            target.trigger(slot)
+        target.pump(0.3)
+        target.stop_all()
+        target.pump(0.1)
+    res = latency_stats(rec.take(), target, rounds * SLOTS)
+    settle(target)
+    return res
+
+
+def sc_stopall(target, rec, hz: float = 50.0) -> dict:
+    """Stop All unter Last: 24 Voices + 50-Hz-Spam, dann alles stoppen."""
+    stop_ms, first_after = [], []
+    for _ in range(5):
+        for slot in range(SLOTS):
+            target.trigger(slot)
+        t0 = time.monotonic()
+        while time.monotonic() - t0 < 0.5:
+            target.trigger(2)
+            target.pump(1.0 / hz)
+        voices = list(target.mixer._voices)
+        t_stop = time.monotonic()
+        target.stop_all()
+        while any(not v.done for v in voices) and time.monotonic() - t_stop < 2.0:
+            target.pump(0.001)
+        stop_ms.append((time.monotonic() - t_stop) * 1000)
+        rec.take()
+        rec.mark(0)
+        target.trigger(0)
+        s = latency_stats(rec.take(), target, 1)
+        first_after.append(s["p50_ms"])
+        settle(target, 0.1)
+    return {
+        "stop_p50_ms": round(percentile(stop_ms, 50), 2),
+        "stop_max_ms": round(max(stop_ms), 2),
+        "next_trigger_p50_ms": round(percentile(first_after, 50), 2),
+    }
+
+
+def sc_flood(target, rec, seconds: float = 1.0) -> dict:
+    """So schnell wie möglich triggern (kurze Sounds) → dauerhafter Durchsatz."""
+    n, t0 = 0, time.monotonic()
+    while time.monotonic() - t0 < seconds:
+        target.trigger(SLOTS)   # 20-ms-Sound
+        n += 1
+        if n % 50 == 0:
+            target.pump(0)
+    elapsed = time.monotonic() - t0
+    rec.take()
+    settle(target)
+    return {"triggers": n, "triggers_per_sec": round(n / elapsed, 1)}
+
+
+def sc_cli(target, root: Path, sounds: list[Path], runs: int = 30) -> dict:
+    """maiNboard-Befehl als Prozess: Start → Antwort der Instanz bzw. Rückkehr im One-Shot."""
+    from ipc import ControlServer
+
+    def wall(*args: str) -> float:
+        t = time.perf_counter()
+        rc = subprocess.run([sys.executable, "-S", *args]).returncode
+        if rc != 0:
+            raise RuntimeError(f"{' '.join(args)} → Exit-Code {rc}")
+        return (time.perf_counter() - t) * 1000
+
+    cli = str(SCRIPT_DIR / "maiNboard")
+    sock = root / "bench.sock"
+    server = ControlServer(lambda req: (target.trigger(int(req["slot"])), {"ok": True})[1]
+                           if req.get("cmd") == "play" else {"ok": True}, str(sock))
+    server.start()
+    try:
+        wall(cli, "--socket", str(sock), "ping")                 # __pycache__ anlegen
+        bare = [wall("-c", "pass") for _ in range(runs)]
+        play = [wall(cli, "--socket", str(sock), "play", "0") for _ in range(runs)]
+    finally:
+        server.stop()
+    settle(target)
+
+    config = root / "cli-config.json"
+    config.write_text(json.dumps({"buttons": {"0": {"path": str(sounds[SLOTS])}},
+                                  "output_sink": BENCH_SINK}))
+    oneshot = [wall(cli, "--socket", str(sock), "--config", str(config), "play", "0")
+               for _ in range(runs // 3)]
+    p50 = percentile(play, 50)
+    return {
+        "runs": runs,
+        "python_p50_ms": round(percentile(bare, 50), 2),
+        "play_p50_ms": round(p50, 2),
+        "play_p99_ms": round(percentile(play, 99), 2),
+        "oneshot_p50_ms": round(percentile(oneshot, 50), 2),
+        "budget_ms": CLI_BUDGET_MS,
+        "within_budget": p50 <= CLI_BUDGET_MS,
+    }
+
+
+# ── Ausgabe ────────────────────────────────────────────────────────────────────
+def print_table(results: dict):
+    for name, res in results.items():
+        parts = [f"{k}={v}" for k, v in res.items()]
+        print(f"{name:<10} " + "  ".join(parts))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="maiNboard Trigger-Latenz-Benchmark")
+    ap.add_argument("--gui", action="store_true", help="über MainWindow triggern (Qt offscreen)")
+    ap.add_argument("--json", metavar="DATEI", help="Ergebnisse zusätzlich als JSON speichern")
+    ap.add_argument("--only", default="", help=f"Komma-Liste aus {', '.join(SCENARIOS)}")
+    args = ap.parse_args()
+    only = [s for s in args.only.split(",") if s] or list(SCENARIOS)
+
+    with tempfile.TemporaryDirectory(prefix="maiNboard-bench-") as tmp:
+        root = Path(tmp)
+        install_shims(root)
+        sounds_dir = root / "sounds"
+        sounds_dir.mkdir()
+        sounds = []
+        for i in range(SLOTS):
+            p = sounds_dir / f"s{i:02d}.wav"
+            make_sound(p, 1.0 if i else 0.1, 220 + 20 * i)
+            sounds.append(p)
+        short = sounds_dir / "short.wav"
+        make_sound(short, 0.02, 1000)
+        sounds.append(short)
+
+        target = (GuiTarget if args.gui else EngineTarget)(sounds, root / "cache")
+        rec = Recorder(target.mixer)
+        sampler = Sampler()
+        sampler.start()
+
+        # Cache bis auf die Cold-Kandidaten vorwärmen
+        cold_slots = list(range(SLOTS - 4, SLOTS))
+        for slot in range(SLOTS + 1):
+            if slot not in cold_slots:
+                target.mixer.cache.put(str(sounds[slot]), sounds[slot].read_bytes())
+
+        results = {}
+        runners = {
+            "cold":    lambda: sc_cold(target, rec, cold_slots),
+            "single":  lambda: sc_single(target, rec),
+            "spam":    lambda: sc_spam(target, rec),
+            "burst24": lambda: sc_burst24(target, rec),
+            "stopall": lambda: sc_stopall(target, rec),
+            "flood":   lambda: sc_flood(target, rec),
+            "cli":     lambda: sc_cli(target, root, sounds),
+        }
+        for name in SCENARIOS:
+            if name not in only:
+                continue
+            sampler.reset()
+            res = runners[name]()
+            res.update(peak_children=sampler.peak_children,
+                       peak_threads=sampler.peak_threads,
+                       peak_rss_mb=round(sampler.peak_rss_kb / 1024, 1))
+            results[name] = res
+
+        sampler.stop()
+        target.close()
+
+    meta = {"mode": "gui" if args.gui else "engine", "python": sys.version.split()[0],
+            "lead_ms": audio_engine.LEAD_SEC * 1000}
+    print(f"maiNboard bench  mode={meta['mode']}  python={meta['python']}")
+    print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+maiNboard - Kommandozeile (nur Standardbibliothek, schneller Start)
+
+Für Tastenkürzel der Desktop-Umgebung, Skripte und Stream-Deck-Aktionen:
+
+  maiNboard play 5          Slot 5 abspielen (Slots zählen ab 0 wie Config und Socket)
+  maiNboard stop 5          alle Instanzen von Slot 5 stoppen
+  maiNboard stop-all
+  maiNboard volume [0-150]  Lautstärke setzen bzw. abfragen
+  maiNboard sink on|off     Virtual Mic an/aus
+  maiNboard state           Zustand als JSON
+  maiNboard library [TEXT]  Bibliothek: Anzahl, fehlende Slots, Suche in sounds/
+  maiNboard ping
+
+  Läuft eine Instanz?  ──ja──►  eine Zeile an den Steuer-Socket (ipc.py), fertig
+          │
+          nein (nur play) ──►  One-Shot: Kindprozess löst sich ab, dekodiert und spielt
+                               per paplay – die Kommandozeile kehrt sofort zurück
+
+Startzeit: weder PyQt6 noch NumPy, auch nicht ipc.py – json, socket und
+selectors kosten zusammen mehr als der ganze Rest. Im Normalfall reichen
+_socket und ein Byte-Vergleich; json wird nur für Ausgaben und Fehler geladen.
+Gemessen wird mit `python bench.py --only cli`.
+
+Installation als Befehl:  ln -s "$PWD/maiNboard" ~/.local/bin/maiNboard
+"""
+
+import os
+import sys
+
+SCRIPT_DIR  = os.path.dirname(os.path.realpath(__file__))
+CONFIG_FILE = os.path.join(SCRIPT_DIR, "config.json")
+SPILL_DIR   = os.path.join(SCRIPT_DIR, "cache", "pcm")
+SINK_NAME   = "maiNboard_sink"          # wie core.SINK_NAME
+
+USAGE = """\
+Aufruf: maiNboard [--socket PFAD] [--config DATEI] BEFEHL
+  play SLOT | stop SLOT | stop-all | volume [WERT] | sink on|off | state | ping
+  library [TEXT]"""
+
+
+def socket_path() -> str:
+    # wie ipc.socket_path() – hier dupliziert, um ipc.py nicht laden zu müssen
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, "maiNboard.sock")
+    return f"/tmp/maiNboard-{os.getuid()}.sock"
+
+
+def send(line: bytes, path: str, timeout: float = 2.0) -> bytes | None:
+    """Eine Anfrage-Zeile senden. None, wenn keine Instanz lauscht."""
+    import _socket
+    s = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        s.settimeout(timeout)
+        try:
+            s.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        s.sendall(line)
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+        return buf
+    finally:
+        s.close()
+
+
+def build(args: list[str]) -> bytes | None:
+    """Befehl → JSON-Zeile (von Hand gebaut, die Werte sind nur Zahlen/Booleans)."""
+    cmd, rest = args[0], args[1:]
+    if cmd == "play" and len(rest) == 1 and rest[0].isdigit():
+        return b'{"cmd": "play", "slot": %d}\n' % int(rest[0])
+    if cmd == "stop" and len(rest) == 1 and rest[0].isdigit():
+        return b'{"cmd": "stop", "slot": %d}\n' % int(rest[0])
+    if cmd == "stop-all" and not rest:
+        return b'{"cmd": "stop_all"}\n'
+    if cmd == "volume" and not rest:
+        return b'{"cmd": "volume"}\n'
+    if cmd == "volume" and len(rest) == 1 and rest[0].isdigit():
+        return b'{"cmd": "volume", "value": %d}\n' % int(rest[0])
+    if cmd == "sink" and len(rest) == 1 and rest[0] in ("on", "off"):
+        return b'{"cmd": "sink", "on": %s}\n' % (b"true" if rest[0] == "on" else b"false")
+    if cmd in ("state", "ping", "library") and not rest:
+        return b'{"cmd": "%s"}\n' % cmd.encode()
+    if cmd == "library" and len(rest) == 1:
+        import json     # Suchtext kann beliebige Zeichen enthalten
+        return json.dumps({"cmd": "library", "query": rest[0]}).encode() + b"\n"
+    return None
+
+
+# ── One-Shot (keine Instanz läuft) ───────────────────────────────────────────────
+def oneshot(slot: int, config_file: str) -> int:
+    import json
+    try:
+        with open(config_file) as f:
+            cfg = json.load(f)
+    except (OSError, ValueError):
+        cfg = {}
+    path = cfg.get("buttons", {}).get(str(slot), {}).get("path", "")
+    if not path or not os.path.exists(path):
+        print(f"maiNboard: Slot {slot} ist nicht belegt", file=sys.stderr)
+        return 1
+    if os.fork():
+        return 0                      # Elternprozess: sofort zurück zur Shell
+    # Kind: von Terminal und Shell lösen, dann in Ruhe abspielen
+    os.setsid()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    try:
+        _play_detached(path, cfg)
+    finally:
+        os._exit(0)
+
+
+def _play_detached(path: str, cfg: dict):
+    """Wie SoundboardCore.play, nur ohne Mixer: ein paplay pro Ziel-Sink.
+    Overdrive/Limiter gibt es hier nicht – dafür braucht es eine laufende Instanz."""
+    import subprocess
+    try:
+        sinks_out = subprocess.run(["pactl", "list", "short", "sinks"],
+                                   capture_output=True, text=True, timeout=2).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        sinks_out = ""
+    sinks = [SINK_NAME] if SINK_NAME in sinks_out.split() else []
+    out = cfg.get("output_sink", "")
+    if cfg.get("local_monitor", True) and out:
+        sinks.append(out)
+    sinks += cfg.get("extra_sinks", [])
+    sinks = list(dict.fromkeys(sinks)) or [None]           # None = Standard-Ausgabe
+
+    volume = int(65536 * cfg.get("volume", 80) / 100)
+    spill = _spill_file(path)
+    procs = []
+    for sink in sinks:
+        cmd = ["paplay", "--raw", "--format=s16le", "--rate=48000", "--channels=2",
+               f"--volume={volume}"] + ([f"--device={sink}"] if sink else [])
+        if spill:
+            # Schon dekodiert (PCM-Cache des Fensters/Daemons) → ohne ffmpeg
+            procs.append(subprocess.Popen(cmd + [spill]))
+            continue
+        dec = subprocess.Popen(["ffmpeg", "-i", path, "-f", "s16le", "-ar", "48000",
+                                "-ac", "2", "-loglevel", "quiet", "pipe:1"],
+                               stdout=subprocess.PIPE)
+        procs.append(subprocess.Popen(cmd, stdin=dec.stdout))
+        dec.stdout.close()
+        procs.append(dec)
+    for p in procs:
+        p.wait()
+
+
+def _spill_file(path: str) -> str | None:
+    """Spill-Datei von audio_engine.PcmCache zum selben Schlüssel (Pfad, mtime, Größe)."""
+    import hashlib
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+    h = hashlib.sha1("\0".join(map(str, key)).encode()).hexdigest()
+    p = os.path.join(SPILL_DIR, f"{h}.pcm")
+    return p if os.path.exists(p) else None
+
+
+# ── Einstieg ───────────────────────────────────────────────────────────────────
+def main(argv: list[str]) -> int:
+    sock, config_file = socket_path(), CONFIG_FILE
+    while argv[:1] in (["--socket"], ["--config"]) and len(argv) >= 2:
+        if argv[0] == "--socket":
+            sock = argv[1]
+        else:
+            config_file = argv[1]
+        argv = argv[2:]
+    line = build(argv) if argv else None
+    if line is None:
+        print(USAGE, file=sys.stderr)
+        return 2
+
+    try:
+        resp = send(line, sock)
+    except OSError as e:
+        print(f"maiNboard: Steuer-Socket: {e}", file=sys.stderr)
+        return 1
+    if resp is None:
+        if argv[0] == "play":
+            return oneshot(int(argv[1]), config_file)
+        print("maiNboard: keine laufende Instanz", file=sys.stderr)
+        return 3
+
+    # ControlServer stellt "ok" immer an den Anfang der Antwort
+    ok = resp.startswith(b'{"ok": true')
+    if ok and argv[0] in ("play", "stop", "stop-all", "ping", "sink"):
+        return 0
+    import json
+    try:
+        data = json.loads(resp)
+    except ValueError:
+        data = {"ok": False, "error": "ungültige Antwort"}
+    if not ok:
+        print(f"maiNboard: {data.get('error', 'Fehler')}", file=sys.stderr)
+        return 1
+    if argv[0] == "volume":
+        print(data["volume"])
+    else:
+        data.pop("ok", None)
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
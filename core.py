@@ -0,0 +1,818 @@
+"""
+maiNboard - Kern ohne GUI (Qt-frei)
+
+SoundboardCore bündelt alles, was auch ohne Fenster laufen muss:
+  Config, PCM-Cache, Mixer, PulseAudio-Zustand, Virtual Sink, Hotkeys,
+  Sound-Bibliothek.
+
+Das Hauptfenster (soundboard.py) und der Daemon (daemon.py) sind nur
+verschiedene Oberflächen auf denselben Kern.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable
+
+from audio_engine import PcmCache, PrefixCache, Mixer, Voice, RETRIGGER_MODES
+from pulse import PulseState, PulseError, ControlWorker, Module, connect_backend, \
+    parse_module_args
+from latency import LatencyStats
+from hotkeys import HotkeyListener
+from loopback import LoopbackTuner
+from analysis import AnalysisIndex, Analyzer, normalize_gain
+from library import Library
+
+SCRIPT_DIR  = Path(__file__).parent
+SOUNDS_DIR  = SCRIPT_DIR / "sounds"
+CONFIG_FILE = SCRIPT_DIR / "config.json"
+CACHE_DIR   = SCRIPT_DIR / "cache"
+SINK_NAME       = "maiNboard_sink"
+MIC_SOURCE_NAME = "maiNboard_mic"
+
+
+# ── Config ─────────────────────────────────────────────────────────────────────
+class Config:
+    """Einstellungen mit Write-behind: Setter markieren nur, geschrieben wird
+    gesammelt nach SAVE_DELAY (bzw. sofort bei flush()) – atomar per Rename."""
+
+    SAVE_DELAY = 0.5   # Sekunden Ruhe, bevor auf die Platte geschrieben wird
+
+    _defaults = {
+        "buttons": {}, "volume": 80, "local_monitor": True,
+        "mic_source": "", "mic_gain": 100, "overdrive": 1,
+        "soft_clip": False, "limiter": True,
+        "output_sink": "", "hotkeys": {},
+        "pcm_cache_mb": 256, "prefix_ms": 250, "extra_sinks": [], "pulse_backend": "auto",
+        "retrigger": "overlap", "polyphony": 8, "max_voices": 32, "trim_silence": True,
+        "normalize": True, "loudness_target": -18.0,
+        "hotkey_min_interval_ms": 60, "hotkey_intervals": {},
+        "loopback_mode": "adaptive", "loopback_target_ms": 10, "loopback_latency": {},
+    }
+
+    def __init__(self):
+        self.data = dict(self._defaults)
+        self._lock  = threading.RLock()
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+        self.load()
+        atexit.register(self.flush)
+
+    def load(self):
+        if CONFIG_FILE.exists():
+            try:
+                self.data = {**self._defaults, **json.loads(CONFIG_FILE.read_text())}
+            except Exception:
+                # Kaputte Datei nicht beim nächsten Speichern überschreiben
+                try:
+                    CONFIG_FILE.replace(CONFIG_FILE.with_suffix(".json.bad"))
+                except OSError:
+                    pass
+
+    @property
+    def dirty(self) -> bool:
+        """True, solange Änderungen noch nicht auf der Platte sind."""
+        return self._dirty
+
+    def save(self):
+        """Änderung vormerken; mehrere Aufrufe kurz hintereinander → ein Schreibvorgang."""
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """Offene Änderungen sofort schreiben (temp-Datei + Rename)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return True
+            self._dirty = False
+            tmp = CONFIG_FILE.with_suffix(".json.tmp")
+            try:
+                text = self._dump()
+                with open(tmp, "w") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, CONFIG_FILE)
+                return True
+            except OSError:
+                self._dirty = True
+                return False
+
+    def _dump(self) -> str:
+        # Der Timer-Thread serialisiert, während die GUI evtl. gerade ändert
+        while True:
+            try:
+                return json.dumps(self.data, indent=2)
+            except RuntimeError:   # "dictionary changed size during iteration"
+                continue
+
+    def get_button(self, idx: int) -> dict:
+        return self.data["buttons"].get(str(idx), {"path": "", "label": f"Sound {idx + 1}"})
+
+    def set_button(self, idx: int, path: str, label: str):
+        # Slot-Optionen (Retrigger, Polyphonie) bleiben beim Neuladen erhalten
+        old = self.data["buttons"].get(str(idx), {})
+        self.data["buttons"][str(idx)] = {**old, "path": path, "label": label}
+        self.save()
+
+    def set_button_option(self, idx: int, key: str, value):
+        """Slot-Option setzen; None = wieder den globalen Standard verwenden."""
+        d = self.data["buttons"].get(str(idx))
+        if d is None:
+            return
+        if value is None:
+            d.pop(key, None)
+        else:
+            d[key] = value
+        self.save()
+
+    def slot_retrigger(self, idx: int) -> str:
+        mode = self.get_button(idx).get("retrigger", self.data.get("retrigger", "overlap"))
+        return mode if mode in RETRIGGER_MODES else "overlap"
+
+    def slot_polyphony(self, idx: int) -> int:
+        """Max. gleichzeitige Voices eines Slots (0 = unbegrenzt)."""
+        return int(self.get_button(idx).get("polyphony", self.data.get("polyphony", 8)))
+
+    @property
+    def trim_silence(self) -> bool:
+        """Stille am Anfang/Ende überspringen (Standard für alle Slots)."""
+        return bool(self.data.get("trim_silence", True))
+
+    def slot_trim(self, idx: int) -> bool:
+        return bool(self.get_button(idx).get("trim", self.trim_silence))
+
+    @property
+    def normalize(self) -> bool:
+        """Alle Slots auf loudness_target angleichen (Standard für alle Slots)."""
+        return bool(self.data.get("normalize", True))
+
+    @property
+    def loudness_target(self) -> float:
+        """Ziel-Lautheit in LUFS (-18 = ReplayGain-Referenz)."""
+        return float(self.data.get("loudness_target", -18.0))
+
+    def slot_normalize(self, idx: int) -> bool:
+        return bool(self.get_button(idx).get("normalize", self.normalize))
+
+    def clear_button(self, idx: int):
+        self.data["buttons"].pop(str(idx), None)
+        self.save()
+
+    def get_hotkey(self, action_id: str) -> str:
+        return self.data.get("hotkeys", {}).get(action_id, "")
+
+    def set_hotkey(self, action_id: str, key_str: str):
+        if "hotkeys" not in self.data:
+            self.data["hotkeys"] = {}
+        if key_str:
+            self.data["hotkeys"][action_id] = key_str
+        else:
+            self.data["hotkeys"].pop(action_id, None)
+        self.save()
+
+    @property
+    def volume(self) -> int:
+        return self.data.get("volume", 80)
+
+    @volume.setter
+    def volume(self, v: int):
+        self.data["volume"] = v
+        self.save()
+
+    @property
+    def local_monitor(self) -> bool:
+        return self.data.get("local_monitor", True)
+
+    @local_monitor.setter
+    def local_monitor(self, v: bool):
+        self.data["local_monitor"] = v
+        self.save()
+
+    @property
+    def mic_source(self) -> str:
+        return self.data.get("mic_source", "")
+
+    @mic_source.setter
+    def mic_source(self, v: str):
+        self.data["mic_source"] = v
+        self.save()
+
+    @property
+    def mic_gain(self) -> int:
+        return self.data.get("mic_gain", 100)
+
+    @mic_gain.setter
+    def mic_gain(self, v: int):
+        self.data["mic_gain"] = v
+        self.save()
+
+    @property
+    def overdrive(self) -> int:
+        return self.data.get("overdrive", 1)
+
+    @overdrive.setter
+    def overdrive(self, v: int):
+        self.data["overdrive"] = v
+        self.save()
+
+    @property
+    def soft_clip(self) -> bool:
+        return self.data.get("soft_clip", False)
+
+    @soft_clip.setter
+    def soft_clip(self, v: bool):
+        self.data["soft_clip"] = v
+        self.save()
+
+    @property
+    def limiter(self) -> bool:
+        return self.data.get("limiter", True)
+
+    @limiter.setter
+    def limiter(self, v: bool):
+        self.data["limiter"] = v
+        self.save()
+
+    @property
+    def output_sink(self) -> str:
+        return self.data.get("output_sink", "")
+
+    @output_sink.setter
+    def output_sink(self, v: str):
+        self.data["output_sink"] = v
+        self.save()
+
+    @property
+    def extra_sinks(self) -> list[str]:
+        """Zusätzliche Ziel-Sinks (z. B. ein Aufnahme-Sink), bekommen jeden Sound mit."""
+        return list(self.data.get("extra_sinks", []))
+
+    @property
+    def pulse_backend(self) -> str:
+        """auto (libpulse, sonst pactl) | native | pactl"""
+        return self.data.get("pulse_backend", "auto")
+
+    @property
+    def pcm_cache_mb(self) -> int:
+        return self.data.get("pcm_cache_mb", 256)
+
+    @property
+    def prefix_ms(self) -> int:
+        """Sofortstart-Präfix pro belegtem Slot, dauerhaft im RAM (0 = aus)."""
+        return int(self.data.get("prefix_ms", 250))
+
+    @property
+    def hotkey_min_interval_ms(self) -> int:
+        """Mindestabstand zwischen zwei Auslösungen derselben Hotkey-Aktion."""
+        return int(self.data.get("hotkey_min_interval_ms", 60))
+
+    @property
+    def hotkey_intervals(self) -> dict[str, int]:
+        """Abweichender Mindestabstand pro Aktion, z. B. {"stop_all": 0, "3": 500}."""
+        return dict(self.data.get("hotkey_intervals", {}))
+
+    @property
+    def loopback_mode(self) -> str:
+        """adaptive (LoopbackTuner sucht pro Mikrofon) | fixed (immer loopback_target_ms)"""
+        return self.data.get("loopback_mode", "adaptive")
+
+    @loopback_mode.setter
+    def loopback_mode(self, v: str):
+        self.data["loopback_mode"] = v
+        self.save()
+
+    @property
+    def loopback_target_ms(self) -> int:
+        """Startwert im adaptiven Modus, fester Wert sonst."""
+        return int(self.data.get("loopback_target_ms", 10))
+
+    @loopback_target_ms.setter
+    def loopback_target_ms(self, v: int):
+        self.data["loopback_target_ms"] = v
+        self.save()
+
+    def loopback_latency_for(self, source: str) -> tuple[int, int]:
+        """(latency_msec, Boden) für ein Mikrofon; Boden = höchste Stufe, die geknistert hat."""
+        if self.loopback_mode != "adaptive":
+            return self.loopback_target_ms, 0
+        d = self.data.get("loopback_latency", {}).get(source, {})
+        return int(d.get("ms", self.loopback_target_ms)), int(d.get("floor", 0))
+
+    def set_loopback_latency(self, source: str, ms: int, floor: int):
+        self.data.setdefault("loopback_latency", {})[source] = {"ms": ms, "floor": floor}
+        self.save()
+
+    @property
+    def max_voices(self) -> int:
+        """Globale Voice-Obergrenze – darüber wird die älteste verdrängt."""
+        return max(1, int(self.data.get("max_voices", 32)))
+
+
+# ── Kern ───────────────────────────────────────────────────────────────────────
+class SoundboardCore:
+    """Engine + Routing + Hotkeys. Alle Methoden sind thread-sicher genug, um
+    aus GUI-, Socket- oder Hotkey-Thread aufgerufen zu werden."""
+
+    def __init__(self, config: Config | None = None,
+                 on_hotkey: Callable[[str, float], None] | None = None,
+                 wait_pulse: bool = True):
+        """wait_pulse=False: Geräte und Sink-Status laden im Hintergrund
+        (das Fenster erscheint sofort, `pulse.ready` meldet das Ende)."""
+        self.config = config or Config()
+        self._sink_mods: dict[str, int] = {}     # Rolle (sink/loopback/remap) → Modul-Index
+        self._sink_lock = threading.Lock()
+        self._playing: dict[int, int] = {}       # Slot → laufende Voices
+        self._slot_listeners: list[Callable[[dict[int, str]], None]] = []
+        self._realpaths: dict[str, str] = {}     # Slot-Pfad → realpath (Bibliotheks-Schlüssel)
+        self._library_lock = threading.Lock()    # Bibliotheks-Meldungen kommen aus mehreren Probe-Threads
+        self._lock = threading.Lock()
+        self.pcm_cache = PcmCache(self.config.pcm_cache_mb * 1024 * 1024, CACHE_DIR / "pcm")
+        self.prefixes  = PrefixCache(self.config.prefix_ms, self.pcm_cache)
+        # Trim-Punkte und Lautheit pro Datei, berechnet im Hintergrund (analysis.py)
+        self.analysis  = AnalysisIndex(CACHE_DIR / "analysis.json")
+        self.analyzer  = Analyzer(self.analysis, self.pcm_cache, self._on_analyzed)
+        # Katalog von sounds/ – Öffnen kostet unabhängig von der Größe gleich viel
+        self.library   = Library(CACHE_DIR / "library.sqlite3", SOUNDS_DIR,
+                                 self._on_library_changed)
+
+        # PulseAudio: eine Verbindung (libpulse, sonst pactl) + Zustand im Speicher
+        self.pulse = PulseState(connect_backend(self.config.pulse_backend))
+        self.pa    = self.pulse.backend
+        self.pulse.start(wait=wait_pulse)
+        # Slider-Befehle (Mic-Gain, Lautstärke, Default-Sink) nie im Aufrufer-Thread
+        self.controls = ControlWorker(self.pa)
+        self.controls.start()
+
+        self.latency = LatencyStats()
+        self.engine = Mixer(self.pcm_cache, volume=self.config.volume,
+                            overdrive=self.config.overdrive,
+                            soft_clip=self.config.soft_clip,
+                            limiter=self.config.limiter,
+                            pulse=self.pa, state=self.pulse,
+                            controls=self.controls,
+                            max_voices=self.config.max_voices,
+                            stats=self.latency, prefixes=self.prefixes)
+        self.engine.add_listener(self._count_voices)
+        self.pulse.add_listener(self._on_pulse_changed)
+
+        # Globale Hotkeys; ohne eigenen Handler löst der Kern selbst aus
+        self.hotkeys = HotkeyListener(on_hotkey or self.trigger_action)
+        self.hotkeys.set_min_intervals(self.config.hotkey_min_interval_ms,
+                                       self.config.hotkey_intervals)
+        self.hotkeys.update_hotkeys(self.config.data.get("hotkeys", {}))
+
+        # Mic-Loopback: niedrigste stabile Latenz pro Mikrofon suchen
+        self.loopback = LoopbackTuner(
+            self.pa, lambda: self._sink_mods.get("loopback"),
+            lambda: self.config.mic_source,
+            lambda: self.config.loopback_latency_for(self.config.mic_source),
+            self._retune_loopback)
+
+    def start(self):
+        self.engine.start()
+        self.prepare_slots()
+        self.library.start()
+        if self.pulse.ready.is_set():
+            self._on_ready()
+        else:
+            self.sync_outputs()
+        self.hotkeys.start()
+        if self.config.loopback_mode == "adaptive":
+            self.loopback.start()
+
+    def shutdown(self):
+        self.engine.stop_all()
+        self.engine.shutdown()
+        self.analyzer.stop()
+        self.library.stop()
+        self.loopback.stop()
+        self.controls.stop()
+        self.pulse.stop()
+        self.hotkeys.stop_listener()
+        self.config.flush()
+
+    # ── Wiedergabe ─────────────────────────────────────────────────────────────
+    def play(self, idx: int, origin: float | None = None,
+             dispatched: float | None = None) -> Voice | None:
+        """Slot abspielen. FileNotFoundError, wenn keine (gültige) Datei belegt ist;
+        None, wenn der Retrigger-Modus bewusst nichts startet."""
+        dispatched = dispatched or time.monotonic()
+        path = self.config.get_button(idx).get("path", "")
+        if not path or not os.path.exists(path):
+            raise FileNotFoundError(path)
+        sinks = self.target_sinks() or [self.default_sink()]
+        start, end = self.slot_trim(idx, path)
+        return self.engine.play(path, sinks, slot=idx, gain=self.slot_gain(idx, path),
+                                retrigger=self.config.slot_retrigger(idx),
+                                polyphony=self.config.slot_polyphony(idx),
+                                origin=origin, dispatched=dispatched,
+                                start=start, end=end)
+
+    def slot_trim(self, idx: int, path: str) -> tuple[int, int | None]:
+        """(Start, Ende) in Frames – ohne Analyse oder mit Trim aus: die ganze Datei."""
+        entry = self.analysis.get(path) if self.config.slot_trim(idx) else None
+        if not entry or "trim" not in entry:
+            return 0, None
+        start, end = entry["trim"]
+        return start, end
+
+    def slot_gain(self, idx: int, path: str) -> float:
+        """Gain Richtung loudness_target – 1.0, solange die Datei nicht analysiert ist."""
+        entry = self.analysis.get(path) if self.config.slot_normalize(idx) else None
+        if not entry or "lufs" not in entry:
+            return 1.0
+        return normalize_gain(entry["lufs"], entry.get("true_peak"), self.config.loudness_target)
+
+    def stop_all(self):
+        self.engine.stop_all()
+
+    def prepare_slots(self):
+        """Nach jeder Belegung aufrufen: neue Dateien analysieren, Präfixe warm halten.
+        Beides läuft im Hintergrund."""
+        paths = [d["path"] for d in self.config.data["buttons"].values() if d.get("path")]
+        self.analyzer.submit(paths)
+        self._warm_prefixes(paths)
+
+    def _warm_prefixes(self, paths: list[str]):
+        # Präfix ab dem Trim-Punkt – übersprungene Stille zählt zum Vorlauf
+        leads = {}
+        for path in paths:
+            entry = self.analysis.get(path)
+            if entry and "trim" in entry:
+                leads[path] = entry["trim"][0]
+        self.prefixes.set_paths(paths, leads)
+
+    def add_slot_listener(self, cb: Callable[[dict[int, str]], None]):
+        """cb(umgezogen) – Datei eines Slots hat sich geändert oder ist verschwunden;
+        umgezogen = {Slot: neuer Pfad}. Aus einem Hintergrund-Thread."""
+        self._slot_listeners.append(cb)
+
+    def missing_slots(self) -> list[int]:
+        return sorted(int(k) for k, d in self.config.data["buttons"].items()
+                      if d.get("path") and not os.path.exists(d["path"]))
+
+    def _on_library_changed(self, changed: list[str], moved: dict[str, str]):
+        # Nur Slots interessieren – bei der Erstindizierung kommen tausende Meldungen
+        changed = set(changed)
+        affected, relinked = False, {}
+        # Seriell: zwei Probe-Threads dürfen denselben Slot nicht gleichzeitig umhängen
+        with self._library_lock:
+            for k, d in list(self.config.data["buttons"].items()):
+                path = d.get("path")
+                if not path:
+                    continue
+                real = self._realpaths.get(path)
+                if real is None:
+                    real = self._realpaths[path] = os.path.realpath(path)
+                if real in moved:
+                    # Innerhalb von sounds/ verschoben/umbenannt → der Slot zieht mit
+                    self.config.set_button(int(k), moved[real], d.get("label", Path(path).stem))
+                    relinked[int(k)] = moved[real]
+                affected = affected or real in changed
+            if relinked:
+                self.prepare_slots()
+        # Listener außerhalb des Locks – sie dürfen wieder in den Core rufen
+        if affected or relinked:
+            for cb in list(self._slot_listeners):
+                cb(relinked)
+
+    def _on_analyzed(self, path: str):
+        self._warm_prefixes([d["path"] for d in self.config.data["buttons"].values()
+                             if d.get("path")])
+
+    def set_volume(self, v: int):
+        self.config.volume = v
+        self.engine.set_volume(v)
+
+    def trigger_action(self, action_id: str, origin: float = 0.0):
+        """Hotkey-Aktion ausführen (Daemon: direkt aus dem Listener-Thread)."""
+        if action_id == "stop_all":
+            self.stop_all()
+        elif action_id.isdigit():
+            try:
+                self.play(int(action_id), origin=origin or None)
+            except FileNotFoundError:
+                pass
+
+    def _on_pulse_changed(self, facility: str):
+        if facility == "ready":
+            self._on_ready()
+
+    def _on_ready(self):
+        # Erst jetzt ist bekannt, ob der Virtual Sink schon existiert (z. B. aus
+        # der letzten Sitzung) – dann übernehmen statt neu aufbauen
+        if self.sink_active():
+            try:
+                self.create_sink()
+            except PulseError:
+                pass
+        self.sync_outputs()
+
+    def refresh_hotkeys(self):
+        self.hotkeys.update_hotkeys(self.config.data.get("hotkeys", {}))
+
+    def playing(self) -> dict[int, int]:
+        with self._lock:
+            return dict(self._playing)
+
+    def _count_voices(self, started: list[Voice], ended: list[Voice]):
+        with self._lock:
+            for v in started:
+                self._playing[v.slot] = self._playing.get(v.slot, 0) + 1
+            for v in ended:
+                n = self._playing.get(v.slot, 0) - 1
+                if n > 0:
+                    self._playing[v.slot] = n
+                else:
+                    self._playing.pop(v.slot, None)
+
+    def state(self) -> dict:
+        return {
+            "volume": self.config.volume,
+            "overdrive": self.config.overdrive,
+            "sink_active": self.sink_active(),
+            "sink_modules": self.sink_modules(),
+            "mic_source": self.config.mic_source,
+            "output_sink": self.config.output_sink,
+            "playing": {str(k): v for k, v in self.playing().items()},
+            "slots": {k: d.get("label", "") for k, d in self.config.data["buttons"].items()
+                      if d.get("path")},
+        }
+
+    # ── Socket-API (siehe ipc.py) ───────────────────────────────────────────────
+    def handle(self, req: dict) -> dict | Future:
+        """Eine Anfrage vom Steuer-Socket beantworten. Läuft im Socket-Thread –
+        nur Speicherzugriffe und Mixer-Aufrufe. Was auf PulseAudio wartet (Virtual
+        Mic auf-/abbauen), läuft in einem eigenen Thread; zurück kommt ein Future."""
+        cmd = req.get("cmd")
+        if cmd == "ping":
+            return {"ok": True}
+        if cmd == "play":
+            slot = int(req["slot"])
+            try:
+                voice = self.play(slot)
+            except FileNotFoundError:
+                return {"ok": False, "error": f"Slot {slot} ist nicht belegt"}
+            return {"ok": True, "voice": voice.id if voice else None}
+        if cmd == "stop":
+            self.engine.stop_slot(int(req["slot"]))
+            return {"ok": True}
+        if cmd == "stop_all":
+            self.stop_all()
+            return {"ok": True}
+        if cmd == "volume":
+            if "value" in req:
+                self.set_volume(max(0, min(150, int(req["value"]))))
+            return {"ok": True, "volume": self.config.volume}
+        if cmd == "sink":
+            if not self.pulse.ready.is_set():
+                return {"ok": False, "error": "PulseAudio-Zustand wird noch geladen"}
+            if "on" in req and bool(req["on"]) != self.sink_active():
+                return self._in_background(self._switch_sink, bool(req["on"]))
+            return {"ok": True, "sink_active": self.sink_active()}
+        if cmd == "state":
+            return {"ok": True, **self.state()}
+        if cmd == "library":
+            resp = {"ok": True, "files": self.library.count(), "missing": self.missing_slots()}
+            if "query" in req:
+                resp["results"] = self.library.search(str(req["query"]), int(req.get("limit", 100)))
+            return resp
+        return {"ok": False, "error": f"unbekannter Befehl: {cmd!r}"}
+
+    def _switch_sink(self, on: bool) -> dict:
+        try:
+            if on:
+                warnings = self.create_sink()
+                return {"ok": True, "sink_active": self.sink_active(), "warnings": warnings}
+            self.teardown_sink()
+        except PulseError as e:
+            return {"ok": False, "error": str(e), "sink_active": self.sink_active()}
+        return {"ok": True, "sink_active": self.sink_active()}
+
+    @staticmethod
+    def _in_background(fn: Callable, *args) -> Future:
+        """fn in einem eigenen Thread; der Socket-Thread bedient derweil weiter."""
+        fut: Future = Future()
+
+        def run():
+            try:
+                fut.set_result(fn(*args))
+            except Exception as e:
+                fut.set_exception(e)
+        threading.Thread(target=run, name="maiNboard-request", daemon=True).start()
+        return fut
+
+    # ── Routing ────────────────────────────────────────────────────────────────
+    def real_sources(self) -> list[tuple[str, str]]:
+        """(name, description) aller echten Mikrofon-Quellen (keine Monitore)."""
+        return [(src.name, src.description) for src in self.pulse.sources()
+                if not src.monitor_of and not src.name.endswith(".monitor")
+                and src.name not in (SINK_NAME, MIC_SOURCE_NAME)]
+
+    def real_sinks(self) -> list[tuple[str, str]]:
+        """(name, description) aller echten Audio-Ausgaben."""
+        return [(sink.name, sink.description) for sink in self.pulse.sinks()
+                if sink.name != SINK_NAME]
+
+    def sink_active(self) -> bool:
+        return self.pulse.has_sink(SINK_NAME)
+
+    def default_sink(self) -> str | None:
+        s = self.pulse.default_sink
+        return s if s and s != SINK_NAME else None
+
+    def target_sinks(self) -> list[str]:
+        """Alle Sinks, die ein Trigger bedient – dekodiert wird trotzdem nur einmal."""
+        sinks = [SINK_NAME] if self.sink_active() else []
+        # Lautsprecher: explizit gewähltes Gerät (Steinberg), nicht default sink
+        # (default sink könnte durch PipeWire auf maiNboard_sink gesetzt worden sein)
+        out = self.config.output_sink
+        if self.config.local_monitor and out:
+            sinks.append(out)
+        sinks += self.config.extra_sinks
+        return list(dict.fromkeys(sinks))
+
+    def sync_outputs(self):
+        """Hält im Mixer genau die Streams offen, die ein Trigger gerade brauchen würde."""
+        self.engine.set_outputs(self.target_sinks())
+
+    def set_loopback_mode(self, mode: str, target_ms: int | None = None):
+        """adaptive | fixed; ein aktiver Loopback wird sofort angepasst."""
+        self.config.loopback_mode = mode
+        if target_ms is not None:
+            self.config.loopback_target_ms = target_ms
+        if mode == "adaptive":
+            self.loopback.start()
+        else:
+            self.loopback.stop()
+        if self.sink_active():
+            self.create_sink()
+
+    def _retune_loopback(self, ms: int, floor: int):
+        """LoopbackTuner-Thread: neue Latenz merken, nur den Loopback neu laden."""
+        mic = self.config.mic_source
+        if not mic or self.config.loopback_mode != "adaptive":
+            return
+        self.config.set_loopback_latency(mic, ms, floor)
+        if self.sink_active():
+            try:
+                self.create_sink()
+            except PulseError:
+                pass
+
+    def apply_mic_gain(self):
+        src = self.config.mic_source
+        if src:
+            self.controls.set_source_volume(src, self.config.mic_gain)
+
+    # Reihenfolge beim Aufbau; abgebaut wird rückwärts (Loopback/Remap hängen am Sink)
+    SINK_ROLES = ("sink", "loopback", "remap")
+
+    def _wanted_sink_modules(self) -> dict[str, tuple[str, list[str], tuple[str, ...] | None]]:
+        """Soll-Zustand pro Rolle: (Modul, Argumente, zu prüfende Schlüssel – None = alle).
+        Beim Null-Sink zählt nur der Name: ihn neu zu laden hieße, dass Discord
+        das Gerät verliert."""
+        # 1. Null-Sink als virtuelles Mikrofon erstellen
+        wanted = {"sink": ("module-null-sink",
+                           [f"sink_name={SINK_NAME}",
+                            "sink_properties=device.description=maiNboard\\ Virtual\\ Mic"],
+                           ("sink_name",))}
+        # 2. Loopback: echtes Mikrofon → Virtual Sink
+        #    (damit deine Stimme über den Virtual Mic zu Discord/TS3 gelangt)
+        mic_src = self.config.mic_source
+        if mic_src:
+            latency_ms, _ = self.config.loopback_latency_for(mic_src)
+            wanted["loopback"] = ("module-loopback",
+                                  [f"source={mic_src}", f"sink={SINK_NAME}",
+                                   f"latency_msec={latency_ms}"],
+                                  None)
+        # 3. Remap-Source: macht den Monitor als echtes Mikrofon sichtbar
+        #    → Discord zeigt es als auswählbares Gerät an
+        wanted["remap"] = ("module-remap-source",
+                           [f"master={SINK_NAME}.monitor",
+                            f"source_name={MIC_SOURCE_NAME}",
+                            "source_properties=device.description=maiNboard\\ Microphone"],
+                           ("master", "source_name"))
+        return wanted
+
+    @staticmethod
+    def _sink_role(mod: Module) -> str | None:
+        args = mod.args
+        if mod.name == "module-null-sink" and args.get("sink_name") == SINK_NAME:
+            return "sink"
+        if mod.name == "module-loopback" and args.get("sink") == SINK_NAME:
+            return "loopback"
+        if mod.name == "module-remap-source" and args.get("source_name") == MIC_SOURCE_NAME:
+            return "remap"
+        if SINK_NAME in mod.argument:
+            return "other"         # hängt irgendwie an unserem Sink → beim Abbau mit weg
+        return None
+
+    def _find_sink_modules(self) -> dict[str, list[Module]]:
+        """Vorhandene Module unseres Virtual Mic (auch aus früheren Sitzungen)."""
+        found: dict[str, list[Module]] = {}
+        for mod in sorted(self.pulse.modules(), key=lambda m: m.index):
+            role = self._sink_role(mod)
+            if role is not None:
+                found.setdefault(role, []).append(mod)
+        return found
+
+    def sink_modules(self) -> dict[str, int]:
+        """Rolle → Modul-Index des aktuellen Virtual Mic."""
+        return dict(self._sink_mods)
+
+    def create_sink(self) -> list[str]:
+        """Virtual Mic herstellen. Vorhandene Module werden übernommen und geprüft;
+        neu geladen wird nur, was fehlt oder abweicht (z. B. nur der Loopback
+        nach einem Mikrofonwechsel). PulseError, wenn schon der Null-Sink
+        scheitert; weitere Probleme kommen als Liste von Warnungen zurück."""
+        warnings = []
+        with self._sink_lock:
+            self.pulse.refresh("module")
+            found  = self._find_sink_modules()
+            wanted = self._wanted_sink_modules()
+
+            keep: dict[str, int] = {}
+            for role in self.SINK_ROLES:
+                if role not in wanted or (role != "sink" and "sink" not in keep):
+                    continue     # ohne übernommenen Sink wird alles neu geladen
+                name, args, keys = wanted[role]
+                want = parse_module_args(" ".join(args))
+                for mod in found.get(role, []):
+                    have = mod.args
+                    if mod.name == name and all(have.get(k) == want[k] for k in keys or want):
+                        keep[role] = mod.index
+                        break
+
+            stale = [mod for role in reversed(self.SINK_ROLES)
+                     for mod in found.get(role, []) if keep.get(role) != mod.index]
+            if "sink" not in keep and found.get("sink"):
+                # Stream zuerst schließen – sonst schiebt PulseAudio ihn auf die Lautsprecher
+                self.engine.close_output(SINK_NAME)
+            for mod in stale:
+                try:
+                    self.pa.unload_module(mod.index)
+                except PulseError:
+                    pass
+
+            self._sink_mods = dict(keep)
+            for role in self.SINK_ROLES:
+                if role in keep or role not in wanted:
+                    continue
+                name, args, _ = wanted[role]
+                try:
+                    self._sink_mods[role] = self.pa.load_module(name, args)
+                except PulseError as e:
+                    if role == "sink":
+                        raise
+                    if role == "loopback":
+                        warnings.append(f"Mikrofon-Loopback fehlgeschlagen: {e}")
+            if "loopback" not in wanted:
+                warnings.append("Kein Mikrofon gewählt – nur Soundboard-Sounds werden übertragen.")
+
+        # 4. Default-Sink auf echten Lautsprecher zurücksetzen
+        #    → verhindert dass Discord-Audio in den Virtual Sink läuft (Echo-Schleife)
+        out = self.config.output_sink
+        if out:
+            self.controls.set_default_sink(out)
+
+        # Mic Gain sofort anwenden
+        self.apply_mic_gain()
+        if stale or len(keep) < len(wanted):
+            self.pulse.refresh("sink", "source", "module")
+        self.sync_outputs()
+        return warnings
+
+    def teardown_sink(self):
+        with self._sink_lock:
+            # Stream zuerst schließen – sonst schiebt PulseAudio ihn auf die Lautsprecher
+            self.engine.close_output(SINK_NAME)
+            # Alles, was zu unserem Sink gehört – auch Module früherer Sitzungen
+            self.pulse.refresh("module")
+            found = self._find_sink_modules()
+            for role in ("other", *reversed(self.SINK_ROLES)):
+                for mod in found.get(role, []):
+                    try:
+                        self.pa.unload_module(mod.index)
+                    except PulseError:
+                        pass
+            self._sink_mods.clear()
+        self.pulse.refresh("sink", "source", "module")
+
+        # Mic-Lautstärke zurücksetzen damit andere Apps normal klingen
+        src = self.config.mic_source
+        if src:
+            self.controls.set_source_volume(src, 100)
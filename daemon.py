@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+maiNboard - Headless-Daemon (ohne Qt)
+
+Für Rechner ohne Fenster (z. B. der Stream-PC): Engine, Virtual Mic und
+globale Hotkeys laufen wie im Hauptfenster, gesteuert wird über den Socket.
+
+  Hotkeys ─────────────┐
+  Skripte / Stream Deck ──► Unix-Socket (ipc.py) ──► SoundboardCore ──► Mixer ──► paplay
+  maiNboard play 5 ────┘
+
+Start:  python soundboard.py --daemon [--sink] [--socket PFAD]
+"""
+
+import argparse
+import signal
+import sys
+import threading
+
+from core import SoundboardCore, SOUNDS_DIR
+from ipc import ControlServer, socket_path
+from pulse import PulseError
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="maiNboard --daemon",
+                                 description="maiNboard ohne Fenster betreiben")
+    ap.add_argument("--sink", action="store_true",
+                    help="Virtual Mic beim Start aktivieren (und beim Beenden abbauen)")
+    ap.add_argument("--socket", default=socket_path(),
+                    help="Pfad des Steuer-Sockets (Standard: %(default)s)")
+    args = ap.parse_args(argv)
+
+    SOUNDS_DIR.mkdir(exist_ok=True)
+    core = SoundboardCore()
+    server = ControlServer(core.handle, args.socket)
+    try:
+        server.start()
+    except RuntimeError as e:
+        print(f"maiNboard: {e}", file=sys.stderr)
+        core.shutdown()
+        return 1
+    core.start()
+
+    if args.sink and not core.sink_active():
+        try:
+            for w in core.create_sink():
+                print(f"maiNboard: ⚠ {w}", file=sys.stderr)
+        except PulseError as e:
+            print(f"maiNboard: Virtual Sink fehlgeschlagen: {e}", file=sys.stderr)
+
+    done = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: done.set())
+    print(f"maiNboard: Daemon bereit – {args.socket}", file=sys.stderr)
+    done.wait()
+
+    server.stop()
+    if args.sink:
+        core.teardown_sink()
+    core.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
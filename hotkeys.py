@@ -0,0 +1,450 @@
+"""
+maiNboard - Globale Hotkeys (Qt-frei)
+
+HotkeyListener liest Tastendrücke systemweit:
+  evdev   →  direkt vom Kernel (Wayland-nativ), nur Tastaturen, Hotplug per inotify
+  pynput  →  Fallback für X11 / XWayland
+
+Dispatch: normalisierte Kombination → Aktionen (vorberechneter Index),
+Autorepeat/Mehrfachgeräte werden entprellt, pro Aktion gilt ein Mindestabstand.
+"""
+
+import ctypes
+import ctypes.util
+import fcntl
+import os
+import selectors
+import struct
+import threading
+import time
+from typing import Callable
+
+
+class _DirWatch:
+    """Minimaler inotify-Wrapper (ctypes/libc) für Hotplug in /dev/input."""
+
+    _IN_CREATE, _IN_DELETE, _IN_ATTRIB = 0x100, 0x200, 0x004
+    _IN_NONBLOCK = os.O_NONBLOCK
+    _IN_CLOEXEC  = os.O_CLOEXEC
+    _HEADER      = struct.Struct("iIII")   # wd, mask, cookie, len
+
+    def __init__(self, path: str):
+        self.fd: int | None = None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+            if fd < 0:
+                return
+            mask = self._IN_CREATE | self._IN_DELETE | self._IN_ATTRIB
+            if libc.inotify_add_watch(fd, path.encode(), mask) < 0:
+                os.close(fd)
+                return
+            self.fd = fd
+        except (OSError, AttributeError):
+            self.fd = None   # kein inotify → eben ohne Hotplug
+
+    def read(self) -> list[tuple[str, bool]]:
+        """[(Dateiname, entfernt?)] seit dem letzten Aufruf."""
+        try:
+            buf = os.read(self.fd, 4096)
+        except (BlockingIOError, OSError, TypeError):
+            return []
+        out, off = [], 0
+        while off + self._HEADER.size <= len(buf):
+            _wd, mask, _cookie, length = self._HEADER.unpack_from(buf, off)
+            off += self._HEADER.size
+            name = buf[off:off + length].split(b"\0", 1)[0].decode(errors="replace")
+            off += length
+            if name:
+                out.append((name, bool(mask & self._IN_DELETE)))
+        return out
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class HotkeyListener(threading.Thread):
+    """Globaler Keyboard-Listener.
+    Primär: evdev (Wayland-nativ, liest direkt vom Kernel).
+    Fallback: pynput (X11 / XWayland).
+
+    on_trigger(action_id, origin) wird aus dem Listener-Thread aufgerufen;
+    origin = Tastendruck auf time.monotonic-Basis.
+    """
+
+    _EVIOCSCLOCKID = 0x400445A0   # _IOW('E', 0xa0, int): Event-Zeitstempel-Uhr wählen
+
+    # evdev-Keyname → internes Format
+    _KEY_MAP = {
+        "KEY_KP0": "kp_0", "KEY_KP1": "kp_1", "KEY_KP2": "kp_2",
+        "KEY_KP3": "kp_3", "KEY_KP4": "kp_4", "KEY_KP5": "kp_5",
+        "KEY_KP6": "kp_6", "KEY_KP7": "kp_7", "KEY_KP8": "kp_8",
+        "KEY_KP9": "kp_9", "KEY_KPENTER": "kp_enter",
+        "KEY_KPPLUS": "kp_plus", "KEY_KPMINUS": "kp_minus",
+        "KEY_KPASTERISK": "kp_multiply", "KEY_KPSLASH": "kp_divide",
+        "KEY_F1": "f1",  "KEY_F2": "f2",  "KEY_F3": "f3",  "KEY_F4": "f4",
+        "KEY_F5": "f5",  "KEY_F6": "f6",  "KEY_F7": "f7",  "KEY_F8": "f8",
+        "KEY_F9": "f9",  "KEY_F10": "f10","KEY_F11": "f11","KEY_F12": "f12",
+        "KEY_SPACE": "space", "KEY_ENTER": "enter", "KEY_TAB": "tab",
+        "KEY_DELETE": "delete", "KEY_LEFT": "left", "KEY_RIGHT": "right",
+        "KEY_UP": "up",  "KEY_DOWN": "down",
+        **{f"KEY_{c}": c.lower() for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"},
+        **{f"KEY_{n}": n for n in "0123456789"},
+    }
+    _MOD_MAP = {
+        "KEY_LEFTCTRL":  "ctrl",  "KEY_RIGHTCTRL":  "ctrl",
+        "KEY_LEFTALT":   "alt",   "KEY_RIGHTALT":   "alt",
+        "KEY_LEFTSHIFT": "shift", "KEY_RIGHTSHIFT": "shift",
+    }
+
+    _MOD_ORDER = ("ctrl", "alt", "shift")
+
+    def __init__(self, on_trigger: Callable[[str, float], None]):
+        super().__init__(name="maiNboard-hotkeys", daemon=True)
+        self.on_trigger = on_trigger
+        # Kombination (normalisiert) → Aktionen; wird nur als Ganzes ersetzt,
+        # Lesen braucht daher keinen Lock
+        self._index: dict[str, tuple[str, ...]] = {}
+        self._lock      = threading.Lock()
+        # Gedrückte Modifier → Quellen, wie _held: ein abgezogenes Gerät darf
+        # kein "Strg" zurücklassen, das jeden späteren Hotkey verfälscht
+        self._modifiers: dict[str, set] = {}
+        self._running   = False
+        self._listener  = None   # pynput-Fallback
+        # Wake-Pipe: stop_listener() weckt den evdev-Loop sofort (kein Timeout-Polling)
+        self._wake_r, self._wake_w = os.pipe()
+        # Gedrückte Tasten → Quellen (evdev-fd / "pynput"), die sie gerade halten.
+        # Auslösen nur beim Übergang "nirgends gedrückt" → "gedrückt":
+        # Autorepeat und Tastaturen mit mehreren evdev-Knoten feuern so nur einmal.
+        self._held: dict[str, set] = {}
+        self._min_interval = 0.0
+        self._intervals: dict[str, float] = {}
+        self._last_fire: dict[str, float] = {}
+
+    @classmethod
+    def normalize(cls, combo: str) -> str:
+        """"Shift+Ctrl+A" / "alt+ctrl+a" → feste Modifier-Reihenfolge, klein."""
+        parts = [p for p in combo.lower().split("+") if p]
+        mods  = [m for m in cls._MOD_ORDER if m in parts]
+        keys  = [p for p in parts if p not in cls._MOD_ORDER]
+        return "+".join(mods + keys)
+
+    def update_hotkeys(self, hotkeys: dict):
+        index: dict[str, list[str]] = {}
+        for action_id, combo in hotkeys.items():
+            if combo:
+                index.setdefault(self.normalize(combo), []).append(action_id)
+        self._index = {k: tuple(v) for k, v in index.items()}   # atomarer Tausch
+
+    def actions_for(self, combo: str) -> tuple[str, ...]:
+        """Aktionen für eine (bereits normalisierte) Kombination – reiner Dict-Zugriff."""
+        return self._index.get(combo, ())
+
+    def _combo(self, key_str: str) -> str:
+        mods = [m for m in self._MOD_ORDER if m in self._modifiers]
+        return "+".join(mods + [key_str])
+
+    def set_min_intervals(self, default_ms: int, per_action: dict | None = None):
+        """Mindestabstand zwischen zwei Auslösungen derselben Aktion."""
+        with self._lock:
+            self._min_interval = max(0, default_ms) / 1000
+            self._intervals = {a: max(0, ms) / 1000 for a, ms in (per_action or {}).items()}
+
+    # ── Entprellung ────────────────────────────────────────────────────────────
+    def _key_down(self, key_str: str, source) -> bool:
+        """True nur für den ersten Druck – Wiederholungen/Zweitgeräte → False."""
+        holders = self._held.setdefault(key_str, set())
+        first = not holders
+        holders.add(source)
+        return first
+
+    def _key_up(self, key_str: str, source):
+        holders = self._held.get(key_str)
+        if holders is not None:
+            holders.discard(source)
+            if not holders:
+                del self._held[key_str]
+
+    def _mod_down(self, mod: str, source):
+        self._modifiers.setdefault(mod, set()).add(source)
+
+    def _mod_up(self, mod: str, source):
+        holders = self._modifiers.get(mod)
+        if holders is not None:
+            holders.discard(source)
+            if not holders:
+                del self._modifiers[mod]
+
+    def _drop_source(self, source):
+        """Gerät verschwunden → seine gehaltenen Tasten und Modifier freigeben."""
+        for key_str in [k for k, h in self._held.items() if source in h]:
+            self._key_up(key_str, source)
+        for mod in [m for m, h in self._modifiers.items() if source in h]:
+            self._mod_up(mod, source)
+
+    def allow(self, action_id: str) -> bool:
+        """Rate-Limit pro Aktion – gilt auch für den Fenster-Fallback, damit
+        globaler Listener + keyPressEvent denselben Druck nicht doppelt auslösen."""
+        now = time.monotonic()
+        with self._lock:
+            interval = self._intervals.get(action_id, self._min_interval)
+            if now - self._last_fire.get(action_id, -1e9) < interval:
+                return False
+            self._last_fire[action_id] = now
+            return True
+
+    def _dispatch(self, full: str, origin: float):
+        for action_id in self._index.get(full, ()):
+            if self.allow(action_id):
+                self.on_trigger(action_id, origin)
+
+    def run(self):
+        self._running = True
+        if not self._run_evdev():
+            self._run_pynput()
+
+    # ── evdev (Wayland-nativ) ───────────────────────────────────────────────────
+    def _run_evdev(self) -> bool:
+        """Gibt True zurück wenn evdev verfügbar war und der Loop gelaufen ist.
+
+        Blockiert ohne Timeout: geweckt wird nur durch Tastendrücke, durch
+        neue/entfernte Geräte in /dev/input (inotify) oder die Wake-Pipe.
+        Ist beim Start noch keine Tastatur da, wartet der Loop auf Hotplug;
+        aufgegeben wird nur, wenn /dev/input nicht beobachtet oder gelesen
+        werden kann.
+        """
+        try:
+            import evdev
+            from evdev import ecodes
+        except ImportError:
+            return False
+
+        devices: dict = {}   # fd → InputDevice
+        paths:   dict = {}   # Gerätepfad → fd
+        mono_fds: set = set()   # Geräte mit monotonen Zeitstempeln
+        sel = selectors.DefaultSelector()
+
+        def open_device(path: str):
+            if path in paths:
+                return
+            try:
+                dev = evdev.InputDevice(path)
+            except OSError:
+                return    # (noch) keine Rechte – udev setzt sie per IN_ATTRIB nach
+            if not self._is_keyboard(dev, ecodes):
+                dev.close()
+                return
+            # Kernel-Zeitstempel auf CLOCK_MONOTONIC umstellen (= time.monotonic)
+            try:
+                fcntl.ioctl(dev.fd, self._EVIOCSCLOCKID,
+                            struct.pack("i", time.CLOCK_MONOTONIC))
+                mono_fds.add(dev.fd)
+            except OSError:
+                mono_fds.discard(dev.fd)
+            devices[dev.fd] = dev
+            paths[path] = dev.fd
+            sel.register(dev.fd, selectors.EVENT_READ, "dev")
+
+        def close_device(fd: int):
+            dev = devices.pop(fd, None)
+            if dev is None:
+                return
+            paths.pop(dev.path, None)
+            sel.unregister(fd)
+            self._drop_source(fd)
+            try:
+                dev.close()
+            except Exception:
+                pass
+
+        watch = _DirWatch("/dev/input")    # vor dem Auflisten → kein Gerät geht verloren
+        for path in evdev.list_devices():
+            open_device(path)
+        if not devices and (watch.fd is None or not self._input_readable()):
+            watch.close()
+            sel.close()
+            return False
+
+        sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+        if watch.fd is not None:
+            sel.register(watch.fd, selectors.EVENT_READ, "hotplug")
+
+        try:
+            while self._running:
+                for key, _ in sel.select():
+                    if key.data == "wake":
+                        return True
+                    if key.data == "hotplug":
+                        for name, removed in watch.read():
+                            if not name.startswith("event"):
+                                continue
+                            path = f"/dev/input/{name}"
+                            if removed:
+                                if path in paths:
+                                    close_device(paths[path])
+                            else:
+                                open_device(path)
+                        continue
+                    fd  = key.fd
+                    dev = devices.get(fd)
+                    if dev is None:
+                        continue
+                    try:
+                        for event in dev.read():
+                            if event.type == ecodes.EV_KEY:
+                                ts = event.timestamp()
+                                if fd not in mono_fds:   # CLOCK_REALTIME umrechnen
+                                    ts = time.monotonic() - (time.time() - ts)
+                                self._on_evdev_key(fd, event, ecodes, ts)
+                    except BlockingIOError:
+                        pass
+                    except OSError:
+                        close_device(fd)    # ausgesteckt (ENODEV)
+        finally:
+            for fd in list(devices):
+                close_device(fd)
+            watch.close()
+            sel.close()
+        return True
+
+    @staticmethod
+    def _input_readable(path: str = "/dev/input") -> bool:
+        """False, wenn es event-Knoten gibt, aber keiner lesbar ist (Benutzer
+        nicht in der Gruppe input) – dann hilft auch kein Warten auf Hotplug."""
+        try:
+            nodes = [n for n in os.listdir(path) if n.startswith("event")]
+        except OSError:
+            return False
+        return not nodes or any(os.access(os.path.join(path, n), os.R_OK) for n in nodes)
+
+    @staticmethod
+    def _is_keyboard(dev, ecodes) -> bool:
+        """Nur echte Tastaturen / Ziffernblöcke – keine Mäuse, Power-Buttons, Headsets."""
+        try:
+            keys = set(dev.capabilities().get(ecodes.EV_KEY, ()))
+        except OSError:
+            return False
+        letters = {ecodes.KEY_A, ecodes.KEY_Z, ecodes.KEY_SPACE}
+        keypad  = {ecodes.KEY_KP0, ecodes.KEY_KP9, ecodes.KEY_KPENTER}
+        return letters <= keys or keypad <= keys
+
+    def _on_evdev_key(self, fd: int, event, ecodes, origin: float):
+        raw = ecodes.KEY.get(event.code, "")
+        key_name = raw[0] if isinstance(raw, list) else raw
+        if not key_name:
+            return
+        mod = self._MOD_MAP.get(key_name)
+        if event.value == 1:      # key down
+            if mod:
+                self._mod_down(mod, fd)
+            else:
+                key_str = self._KEY_MAP.get(key_name, "")
+                if key_str and self._key_down(key_str, fd):
+                    self._dispatch(self._combo(key_str), origin)
+        elif event.value == 0:    # key up
+            if mod:
+                self._mod_up(mod, fd)
+            else:
+                key_str = self._KEY_MAP.get(key_name, "")
+                if key_str:
+                    self._key_up(key_str, fd)
+        # value 2 = Autorepeat → bewusst ignoriert
+
+    # ── pynput (X11 / XWayland-Fallback) ───────────────────────────────────────
+    def _run_pynput(self):
+        try:
+            from pynput import keyboard as kb
+        except ImportError:
+            return
+
+        _MOD_MAP: dict = {}
+        for attr, name in [
+            ("ctrl",    "ctrl"), ("ctrl_l",  "ctrl"), ("ctrl_r",  "ctrl"),
+            ("alt",     "alt"),  ("alt_l",   "alt"),  ("alt_r",   "alt"),
+            ("alt_gr",  "alt"),
+            ("shift",   "shift"),("shift_l", "shift"),("shift_r", "shift"),
+        ]:
+            if hasattr(kb.Key, attr):
+                _MOD_MAP[getattr(kb.Key, attr)] = name
+
+        _KEY_MAP: dict = {}
+        for attr, name in [
+            ("f1","f1"),("f2","f2"),("f3","f3"),("f4","f4"),
+            ("f5","f5"),("f6","f6"),("f7","f7"),("f8","f8"),
+            ("f9","f9"),("f10","f10"),("f11","f11"),("f12","f12"),
+            ("space","space"),("enter","enter"),("tab","tab"),
+            ("delete","delete"),
+            ("left","left"),("right","right"),("up","up"),("down","down"),
+        ]:
+            if hasattr(kb.Key, attr):
+                _KEY_MAP[getattr(kb.Key, attr)] = name
+
+        def on_press(key):
+            origin = time.monotonic()   # pynput liefert keine Kernel-Zeitstempel
+            mod = _MOD_MAP.get(key)
+            if mod:
+                self._mod_down(mod, "pynput")
+                return
+            key_str = _KEY_MAP.get(key, "")
+            if not key_str:
+                try:
+                    char = key.char
+                    if char and char.lower().isalnum():
+                        key_str = char.lower()
+                except AttributeError:
+                    pass
+            # X11-Autorepeat liefert weitere on_press ohne on_release dazwischen
+            if not key_str or not self._key_down(key_str, "pynput"):
+                return
+            self._dispatch(self._combo(key_str), origin)
+
+        def on_release(key):
+            mod = _MOD_MAP.get(key)
+            if mod:
+                self._mod_up(mod, "pynput")
+                return
+            key_str = _KEY_MAP.get(key, "")
+            if not key_str:
+                try:
+                    char = key.char
+                    if char and char.lower().isalnum():
+                        key_str = char.lower()
+                except AttributeError:
+                    pass
+            if key_str:
+                self._key_up(key_str, "pynput")
+
+        try:
+            with kb.Listener(on_press=on_press, on_release=on_release) as listener:
+                self._listener = listener
+                listener.join()
+        except Exception:
+            pass
+
+    def stop_listener(self):
+        """Listener beenden und die Wake-Pipe schließen – mehrfach aufrufbar."""
+        self._running = False
+        if self._wake_w >= 0:
+            try:
+                os.write(self._wake_w, b"x")
+            except OSError:
+                pass
+        if self._listener:
+            try:
+                self._listener.stop()
+            except Exception:
+                pass
+        if self.is_alive():
+            self.join(2.0)
+        with self._lock:
+            fds = (self._wake_r, self._wake_w)
+            self._wake_r = self._wake_w = -1
+        for fd in fds:
+            if fd < 0:
+                continue
+            try:
+                os.close(fd)
+            except OSError:
+                pass
@@ -0,0 +1,291 @@
+"""
+maiNboard - Steuer-Socket (nur Standardbibliothek)
+
+Eine laufende Instanz (Daemon oder Fenster) lauscht auf einem Unix-Socket.
+Protokoll: pro Anfrage eine JSON-Zeile, pro Antwort eine JSON-Zeile.
+
+  {"cmd": "play", "slot": 5}       →  {"ok": true, "voice": 17}
+  {"cmd": "stop", "slot": 5}       →  {"ok": true}
+  {"cmd": "stop_all"}              →  {"ok": true}
+  {"cmd": "volume", "value": 80}   →  {"ok": true, "volume": 80}   (ohne value: abfragen)
+  {"cmd": "sink", "on": true}      →  {"ok": true, "sink_active": true}
+  {"cmd": "state"}                 →  {"ok": true, "volume": …, "playing": {…}, …}
+  {"cmd": "ping"}                  →  {"ok": true}
+
+Fehler: {"ok": false, "error": "…"}. "ok" steht immer als erster Schlüssel in
+der Antwort – cli.py prüft den Erfolg per Byte-Vergleich, ohne json zu laden.
+
+Dauert eine Anfrage länger (z. B. den Virtual Mic auf- oder abbauen), gibt
+der Handler ein Future zurück: der Socket-Thread bedient derweil alle anderen
+Verbindungen, die Antwort folgt, sobald das Future fertig ist.
+
+Nur Standardbibliothek – Daemon und Fenster teilen sich diesen Code.
+"""
+
+import json
+import os
+import selectors
+import socket
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+Handler = Callable[[dict], "dict | Future"]
+
+
+def socket_path() -> str:
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, "maiNboard.sock")
+    return f"/tmp/maiNboard-{os.getuid()}.sock"
+
+
+def request(req: dict, path: str | None = None, timeout: float = 1.0) -> dict:
+    """Eine Anfrage an die laufende Instanz. OSError, wenn keine lauscht."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(path or socket_path())
+        s.sendall(json.dumps(req).encode() + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf or b'{"ok": false, "error": "keine Antwort"}')
+
+
+def result_of(fut: Future) -> dict:
+    """Antwort eines fertigen Futures; Ausnahmen werden zur Fehlerantwort."""
+    try:
+        return fut.result()
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+class ControlServer:
+    """Unix-Socket-Server in einem Thread (selectors, kein Timeout-Polling).
+
+    Alle Sockets sind nicht-blockierend: Antworten landen im Ausgangspuffer der
+    Verbindung und gehen raus, sobald der Socket schreibbar ist – ein Client,
+    der nicht liest, hält den Server nicht auf.
+    """
+
+    MAX_PENDING = 1 << 20      # mehr ungelesene Antwort-Bytes → Verbindung schließen
+
+    def __init__(self, handler: Handler, path: str | None = None):
+        self.handler = handler
+        self.path = path or socket_path()
+        self._sel: selectors.BaseSelector | None = None
+        self._sock: socket.socket | None = None
+        self._bufs: dict[socket.socket, bytes] = {}
+        self._out: dict[socket.socket, bytearray] = {}
+        self._eof: set[socket.socket] = set()     # Client fertig → nach dem Senden schließen
+        self._waiting: set[socket.socket] = set() # Antwort läuft im Hintergrund
+        self._done: list[tuple[socket.socket, Future]] = []
+        self._done_lock = threading.Lock()
+        self._stopping = False
+        self._wake_r = self._wake_w = -1
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        """RuntimeError, wenn schon eine Instanz auf dem Socket lauscht."""
+        if os.path.exists(self.path):
+            try:
+                request({"cmd": "ping"}, self.path, timeout=0.2)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Niemand lauscht mehr (Absturz o. Ä.) → verwaiste Datei entfernen.
+                # Alles andere – auch ein Timeout einer beschäftigten Instanz –
+                # heißt: die Datei gehört noch jemandem.
+                try:
+                    os.unlink(self.path)
+                except FileNotFoundError:
+                    pass
+            except (OSError, ValueError):
+                raise RuntimeError(f"maiNboard läuft bereits ({self.path})") from None
+            else:
+                raise RuntimeError(f"maiNboard läuft bereits ({self.path})")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            old = os.umask(0o177)             # Socket nur für den eigenen Benutzer
+            try:
+                sock.bind(self.path)
+            finally:
+                os.umask(old)
+            sock.listen(16)
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        # Selector und Wake-Pipe erst jetzt – scheitert bind/listen, bleibt nichts offen
+        self._sel = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        self._sel.register(sock, selectors.EVENT_READ, "accept")
+        self._sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+        self._thread = threading.Thread(target=self._run, name="maiNboard-ipc", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping = True
+        os.write(self._wake_w, b"x")
+        self._thread.join(1.0)
+        self._thread = None
+
+    # ── intern ─────────────────────────────────────────────────────────────────
+    def _run(self):
+        try:
+            while True:
+                for key, mask in self._sel.select():
+                    if key.data == "wake":
+                        if self._woken():
+                            return
+                        continue
+                    if key.data == "accept":
+                        self._accept()
+                        continue
+                    conn = key.fileobj
+                    if mask & selectors.EVENT_READ:
+                        self._read(conn)
+                    if mask & selectors.EVENT_WRITE and conn in self._bufs:
+                        self._flush(conn)
+        finally:
+            for conn in list(self._bufs):
+                self._close(conn)
+            self._sel.close()
+            self._sock.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            for fd in (self._wake_r, self._wake_w):
+                os.close(fd)
+            self._wake_r = self._wake_w = -1
+
+    def _woken(self) -> bool:
+        """Wake-Pipe: fertige Hintergrund-Antworten ausliefern. True = beenden."""
+        os.read(self._wake_r, 4096)
+        with self._done_lock:
+            done, self._done = self._done, []
+        for conn, fut in done:
+            if conn not in self._bufs:
+                continue                      # Verbindung inzwischen zu
+            self._waiting.discard(conn)
+            self._queue_reply(conn, result_of(fut))
+            self._process(conn)               # aufgelaufene Anfragen
+            if conn in self._bufs:
+                self._flush(conn)
+        return self._stopping
+
+    def _deferred(self, conn: socket.socket, fut: Future):
+        # Beliebiger Thread → Socket-Thread
+        with self._done_lock:
+            self._done.append((conn, fut))
+        try:
+            os.write(self._wake_w, b"r")
+        except OSError:
+            pass                              # Server schon beendet
+
+    def _accept(self):
+        try:
+            conn, _ = self._sock.accept()
+        except OSError:
+            return
+        conn.setblocking(False)
+        self._bufs[conn] = b""
+        self._out[conn] = bytearray()
+        self._sel.register(conn, selectors.EVENT_READ, "conn")
+
+    def _read(self, conn: socket.socket):
+        try:
+            data = conn.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._eof.add(conn)               # Rest der Antworten noch ausliefern
+        else:
+            self._bufs[conn] += data
+            self._process(conn)
+        if conn in self._bufs:
+            self._flush(conn)
+
+    def _process(self, conn: socket.socket):
+        """Vollständige Zeilen beantworten – der Reihe nach: solange eine Antwort
+        im Hintergrund läuft, warten die folgenden Anfragen."""
+        while conn in self._bufs and conn not in self._waiting:
+            line, sep, rest = self._bufs[conn].partition(b"\n")
+            if not sep:
+                return
+            self._bufs[conn] = rest
+            if line.strip():
+                self._reply(conn, line)
+
+    def _reply(self, conn: socket.socket, line: bytes):
+        try:
+            req = json.loads(line)
+            resp = self.handler(req) if isinstance(req, dict) else \
+                {"ok": False, "error": "Anfrage muss ein JSON-Objekt sein"}
+        except ValueError as e:
+            resp = {"ok": False, "error": f"ungültiges JSON: {e}"}
+        except Exception as e:               # Handler-Fehler nie den Server mitreißen lassen
+            resp = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        if isinstance(resp, Future):
+            self._waiting.add(conn)
+            resp.add_done_callback(lambda f: self._deferred(conn, f))
+            return
+        self._queue_reply(conn, resp)
+
+    def _queue_reply(self, conn: socket.socket, resp: dict):
+        resp = {"ok": bool(resp.get("ok")), **resp}
+        out = self._out.get(conn)
+        if out is not None:
+            out += json.dumps(resp).encode() + b"\n"
+
+    def _flush(self, conn: socket.socket):
+        """So viel senden, wie der Socket nimmt; der Rest wartet auf EVENT_WRITE."""
+        out = self._out[conn]
+        try:
+            while out:
+                sent = conn.send(out)
+                del out[:sent]
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._close(conn)
+            return
+        if len(out) > self.MAX_PENDING:
+            self._close(conn)                 # Client liest nicht mehr
+            return
+        self._update(conn)
+
+    def _update(self, conn: socket.socket):
+        """Selector-Interesse nach Zustand: lesen bis EOF, schreiben solange
+        etwas im Puffer liegt; fertig und nichts mehr offen → schließen."""
+        out, eof = self._out[conn], conn in self._eof
+        if eof and not out and conn not in self._waiting:
+            self._close(conn)
+            return
+        events = (0 if eof else selectors.EVENT_READ) | (selectors.EVENT_WRITE if out else 0)
+        key = self._sel.get_map().get(conn)
+        if not events:
+            if key is not None:
+                self._sel.unregister(conn)    # wartet nur noch auf die Hintergrund-Antwort
+        elif key is None:
+            self._sel.register(conn, events, "conn")
+        elif key.events != events:
+            self._sel.modify(conn, events, "conn")
+
+    def _close(self, conn: socket.socket):
+        self._bufs.pop(conn, None)
+        self._out.pop(conn, None)
+        self._eof.discard(conn)
+        self._waiting.discard(conn)
+        try:
+            self._sel.unregister(conn)
+        except (KeyError, ValueError):
+            pass
+        conn.close()
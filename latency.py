@@ -0,0 +1,135 @@
+"""
+maiNboard - Latenz-Messung pro Trigger (Qt-frei)
+
+Jeder Trigger trägt seinen Ursprungszeitpunkt (time.monotonic-Basis) mit:
+
+  Taste (Kernel-Zeitstempel) ──► Dispatch (GUI) ──► Voice angelegt ──► erste Samples an paplay
+            input→dispatch        dispatch→spawn        spawn→first_write
+
+Pro Stufe ein Histogramm mit festen, logarithmischen Buckets: Aufzeichnen
+kostet nur ein Bucket-Inkrement, Perzentile werden aus den Buckets geschätzt.
+
+Dazu StartupTimer für den Programmstart (soundboard.py --startup-report):
+
+  import ──► construct ──► first_paint ──► ready (Geräte + Sink-Status geladen)
+"""
+
+import bisect
+import json
+import threading
+import time
+
+STAGES = ("input→dispatch", "dispatch→spawn", "spawn→first_write", "total")
+
+# Bucket-Obergrenzen in ms (≈ 1,25er-Schritte von 0,05 ms bis ~3 s)
+BUCKETS_MS: tuple[float, ...] = tuple(round(0.05 * 1.25 ** i, 3) for i in range(50))
+
+
+class Histogram:
+    __slots__ = ("counts", "n", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)   # letzter Bucket = Überlauf
+        self.n      = 0
+        self.total  = 0.0
+        self.max    = 0.0
+
+    def add(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.n     += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, q: float) -> float:
+        """Obergrenze des Buckets, in dem das q-Perzentil liegt (höchstens max)."""
+        if not self.n:
+            return 0.0
+        rank, seen = q / 100 * self.n, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(BUCKETS_MS[i], round(self.max, 3)) if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.n,
+            "mean_ms": round(self.total / self.n, 3) if self.n else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 3),
+        }
+
+
+class LatencyStats:
+    """Thread-sicher: der Mixer-Thread zeichnet auf, die GUI liest."""
+
+    def __init__(self):
+        self._lock  = threading.Lock()
+        self._hists = {s: Histogram() for s in STAGES}
+        self.since  = time.time()
+
+    def record_voice(self, voice):
+        """Wird beim ersten Schreiben einer Voice aufgerufen (Mixer-Thread)."""
+        stamps = (voice.origin, voice.dispatched, voice.created, voice.first_write)
+        with self._lock:
+            for stage, a, b in zip(STAGES, stamps, stamps[1:]):
+                if a is not None and b is not None:
+                    self._hists[stage].add(max(0.0, (b - a) * 1000))
+            start = next((t for t in stamps if t is not None), None)
+            if start is not None and voice.first_write is not None:
+                self._hists["total"].add(max(0.0, (voice.first_write - start) * 1000))
+
+    def reset(self):
+        with self._lock:
+            self._hists = {s: Histogram() for s in STAGES}
+            self.since  = time.time()
+
+    def summary(self) -> dict[str, dict]:
+        with self._lock:
+            return {s: h.summary() for s, h in self._hists.items()}
+
+    def histogram(self, stage: str) -> list[tuple[float, int]]:
+        """[(Bucket-Obergrenze ms, Anzahl)] ohne leere Ränder."""
+        with self._lock:
+            counts = list(self._hists[stage].counts)
+        bounds = list(BUCKETS_MS) + [float("inf")]
+        used = [i for i, c in enumerate(counts) if c]
+        if not used:
+            return []
+        return [(bounds[i], counts[i]) for i in range(used[0], used[-1] + 1)]
+
+    def to_json(self) -> str:
+        with self._lock:
+            data = {
+                "since": self.since,
+                "buckets_ms": list(BUCKETS_MS),
+                "stages": {s: {**h.summary(), "counts": list(h.counts)}
+                           for s, h in self._hists.items()},
+            }
+        return json.dumps(data, indent=2)
+
+
+class StartupTimer:
+    """Zeitmarken des Programmstarts (perf_counter), jede Phase zählt nur einmal."""
+
+    def __init__(self, t0: float | None = None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.marks: dict[str, float] = {}
+
+    def mark(self, phase: str) -> bool:
+        """False, wenn die Phase schon erfasst war."""
+        if phase in self.marks:
+            return False
+        self.marks[phase] = time.perf_counter()
+        return True
+
+    def report(self) -> str:
+        lines = ["maiNboard Start      Δ ms   gesamt ms"]
+        prev = self.t0
+        for phase, t in sorted(self.marks.items(), key=lambda kv: kv[1]):
+            lines.append(f"  {phase:<14} {(t - prev) * 1000:8.1f}  {(t - self.t0) * 1000:9.1f}")
+            prev = t
+        return "\n".join(lines)
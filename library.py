@@ -0,0 +1,508 @@
+"""
+maiNboard - Sound-Bibliothek (Qt-frei)
+
+Katalog aller Audiodateien unter sounds/ in SQLite (cache/library.sqlite3):
+Pfad, mtime, Größe, Dauer, Codec, Abtastrate, Kanäle, Inhalts-Hash.
+
+  Start ──► DB öffnen – sofort, egal wie groß die Bibliothek ist
+              │
+              └─ Hintergrund: inotify-Watch auf jedes Verzeichnis, dann Abgleich
+                 nur der Verzeichnisse, deren mtime sich seit dem letzten Lauf geändert hat
+
+  inotify ──► Datei neu / geändert / gelöscht / verschoben ──► genau eine Zeile
+
+  ffprobe + Hash laufen nur für neue oder geänderte Dateien (Thread-Pool).
+  Verschoben (gleicher inotify-Cookie oder gleicher Hash wie eine eben
+  verschwundene Datei) ──► Zeile umbenannt, on_change meldet (alt → neu).
+
+Eine Datei, die ohne laufende Instanz an Ort und Stelle überschrieben wurde,
+ändert die mtime ihres Verzeichnisses nicht – get() prüft deshalb beim
+Zugriff mtime/Größe und stößt bei Abweichung eine neue Analyse an.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import selectors
+import sqlite3
+import struct
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+AUDIO_EXTS = {".wav", ".mp3", ".ogg", ".flac", ".opus", ".m4a", ".aac", ".wma", ".aiff"}
+PROBE_WORKERS = 4         # ffprobe-Prozesse gleichzeitig (Erstindizierung großer Bibliotheken)
+VANISHED_MAX  = 256       # so viele verschwundene Dateien werden für die Umzugserkennung gemerkt
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM  = 0x00000040
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW  = 0x00004000
+IN_IGNORED     = 0x00008000
+IN_ONLYDIR     = 0x01000000
+IN_ISDIR       = 0x40000000
+_WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+               | IN_DELETE_SELF | IN_ONLYDIR)
+_EVENT_HDR = struct.Struct("iIII")          # wd, mask, cookie, len
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    dir         TEXT NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    duration    REAL,
+    codec       TEXT,
+    sample_rate INTEGER,
+    channels    INTEGER,
+    sha1        TEXT
+);
+CREATE INDEX IF NOT EXISTS files_dir  ON files(dir);
+CREATE INDEX IF NOT EXISTS files_sha1 ON files(sha1);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL);
+"""
+_COLUMNS = ("path", "dir", "mtime_ns", "size", "duration", "codec",
+            "sample_rate", "channels", "sha1")
+
+
+def is_audio(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in AUDIO_EXTS
+
+
+def probe(path: str) -> dict | None:
+    """Metadaten (ffprobe) und SHA-1 des Inhalts; None, wenn die Datei weg ist."""
+    try:
+        st = os.stat(path)
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    stream, fmt = {}, {}
+    try:
+        res = subprocess.run(
+            ["ffprobe", "-v", "quiet", "-print_format", "json", "-select_streams", "a:0",
+             "-show_entries", "format=duration:stream=codec_name,sample_rate,channels", path],
+            capture_output=True, timeout=30)
+        info = json.loads(res.stdout or b"{}")
+        stream = (info.get("streams") or [{}])[0]
+        fmt = info.get("format") or {}
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        pass        # kein ffprobe / keine Audiodatei → nur Hash und Größe
+    return {
+        "path": path, "dir": os.path.dirname(path),
+        "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+        "duration": float(fmt["duration"]) if fmt.get("duration") else None,
+        "codec": stream.get("codec_name"),
+        "sample_rate": int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+        "channels": stream.get("channels"),
+        "sha1": h.hexdigest(),
+    }
+
+
+# ── inotify (ctypes) ───────────────────────────────────────────────────────────
+class Inotify:
+    """Dünne Hülle um inotify(7). OSError, wenn der Kernel es nicht anbietet."""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+
+    def add(self, path: str) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_add_watch", path)
+        return wd
+
+    def read(self) -> list[tuple[int, int, int, str]]:
+        """(wd, mask, cookie, name) aller anstehenden Events."""
+        try:
+            buf = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        events, off = [], 0
+        while off + _EVENT_HDR.size <= len(buf):
+            wd, mask, cookie, n = _EVENT_HDR.unpack_from(buf, off)
+            off += _EVENT_HDR.size
+            name = os.fsdecode(buf[off:off + n].rstrip(b"\0"))
+            off += n
+            events.append((wd, mask, cookie, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+# ── Bibliothek ─────────────────────────────────────────────────────────────────
+class Library:
+    """SQLite-Katalog eines Verzeichnisbaums, live gehalten per inotify.
+
+    on_change(geändert, verschoben) wird aus dem Hintergrund gerufen:
+      geändert    – Pfade, deren Eintrag neu/aktualisiert/gelöscht wurde
+      verschoben  – {alter Pfad: neuer Pfad}
+    """
+
+    def __init__(self, db_path: Path, root: Path,
+                 on_change: Callable[[list[str], dict[str, str]], None] | None = None):
+        self.root      = os.path.realpath(root)
+        self.on_change = on_change
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;" + _SCHEMA)
+        # LIKE faltet nur ASCII – für die Suche Unicode-Groß-/Kleinschreibung aus Python
+        self._db.create_function("casefold", 1, str.casefold, deterministic=True)
+        self._lock = threading.Lock()            # eine Verbindung, mehrere Threads
+        self._wds: dict[int, str] = {}           # inotify-Watch → Verzeichnis
+        self._vanished: OrderedDict[str, str] = OrderedDict()   # sha1 → verschwundener Pfad
+        self._probing: set[str] = set()
+        self._pending: dict[str, int] = {}      # Verzeichnis → laufende Analysen
+        self._pool: ThreadPoolExecutor | None = None
+        self._inotify: Inotify | None = None
+        self._wake_r, self._wake_w = os.pipe()
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._pool = ThreadPoolExecutor(PROBE_WORKERS, thread_name_prefix="maiNboard-probe")
+        self._thread = threading.Thread(target=self._run, name="maiNboard-library", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Beobachtung beenden, dann Datenbank und Wake-Pipe schließen (mehrfach
+        aufrufbar). Gewartet wird auf den Thread und laufende Analysen – sie
+        schreiben noch in die Datenbank."""
+        self._running = False
+        if self._thread is not None:
+            os.write(self._wake_w, b"x")
+            self._thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.close()
+            self._db = None
+        for fd in (self._wake_r, self._wake_w):
+            os.close(fd)
+        self._wake_r = self._wake_w = -1
+
+    # ── Abfragen (aus jedem Thread) ────────────────────────────────────────────
+    def get(self, path: str) -> dict | None:
+        """Eintrag zur Datei; None, wenn unbekannt oder seit der Analyse geändert
+        (dann wird sie im Hintergrund neu analysiert)."""
+        path = os.path.realpath(path)
+        row = self._query("SELECT * FROM files WHERE path = ?", (path,))
+        if not row:
+            return None
+        entry = row[0]
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if (st.st_mtime_ns, st.st_size) != (entry["mtime_ns"], entry["size"]):
+            self._probe(path)
+            return None
+        return entry
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def search(self, text: str = "", limit: int = 100) -> list[dict]:
+        """Einträge, deren Pfad `text` enthält (ohne Groß-/Kleinschreibung)."""
+        return self._query("SELECT * FROM files WHERE instr(casefold(path), ?) > 0 "
+                           "ORDER BY path LIMIT ?", (text.casefold(), limit))
+
+    def find_hash(self, sha1: str) -> list[str]:
+        return [r["path"] for r in self._query("SELECT * FROM files WHERE sha1 = ?", (sha1,))]
+
+    # ── intern: Datenbank ──────────────────────────────────────────────────────
+    def _query(self, sql: str, args: tuple = ()) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [dict(zip(_COLUMNS, r)) for r in rows]
+
+    def _write(self, sql: str, args: tuple = ()):
+        with self._lock:
+            self._db.execute(sql, args)
+            self._db.commit()
+
+    def _forget(self, path: str):
+        """Zeile löschen; der Hash bleibt kurz gemerkt (Umzug per Kopieren + Löschen)."""
+        with self._lock:
+            row = self._db.execute("SELECT sha1 FROM files WHERE path = ?", (path,)).fetchone()
+            self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+            self._db.commit()
+            if row and row[0]:
+                self._vanish_locked(row[0], path)
+        self._notify([path], {})
+
+    def _forget_tree(self, path: str):
+        """Ganzen Teilbaum löschen – ein DELETE, ein Commit, eine Meldung."""
+        lo, hi = _subtree(path)
+        with self._lock:
+            rows = self._db.execute("SELECT path, sha1 FROM files WHERE path >= ? AND path < ?",
+                                    (lo, hi)).fetchall()
+            self._db.execute("DELETE FROM files WHERE path >= ? AND path < ?", (lo, hi))
+            self._db.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                             (path, lo, hi))
+            self._db.commit()
+            for p, sha1 in rows:
+                if sha1:
+                    self._vanish_locked(sha1, p)
+        if rows:
+            self._notify([p for p, _ in rows], {})
+
+    def _vanish_locked(self, sha1: str, path: str):
+        """Hash eines gelöschten Pfads kurz merken (Umzug per Kopieren + Löschen)."""
+        self._vanished[sha1] = path
+        while len(self._vanished) > VANISHED_MAX:
+            self._vanished.popitem(last=False)
+
+    def _rename(self, old: str, new: str):
+        try:
+            st = os.stat(new)
+        except OSError:
+            return
+        self._write("UPDATE files SET path = ?, dir = ?, mtime_ns = ?, size = ? WHERE path = ?",
+                    (new, os.path.dirname(new), st.st_mtime_ns, st.st_size, old))
+        self._notify([old, new], {old: new})
+
+    def _rename_tree(self, old: str, new: str):
+        lo, hi = _subtree(old)
+        moved = {}
+        for row in self._query("SELECT * FROM files WHERE path >= ? AND path < ?", (lo, hi)):
+            moved[row["path"]] = new + row["path"][len(old):]
+        with self._lock:
+            for a, b in moved.items():
+                self._db.execute("UPDATE files SET path = ?, dir = ? WHERE path = ?",
+                                 (b, os.path.dirname(b), a))
+            self._db.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                             (old, lo, hi))
+            self._db.commit()
+        if moved:
+            self._notify(list(moved) + list(moved.values()), moved)
+
+    def _settle(self, d: str):
+        """Verzeichnis als abgeglichen merken – erst wenn keine Analyse darin mehr
+        läuft, sonst fehlten nach einem Beenden mittendrin Dateien im Index."""
+        with self._lock:
+            if self._pending.get(d):
+                return
+        self._mark_dir(d)
+
+    def _mark_dir(self, path: str):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        self._write("INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)", (path, mtime))
+
+    def _notify(self, changed: list[str], moved: dict[str, str]):
+        if self.on_change is not None:
+            try:
+                self.on_change(changed, moved)
+            except Exception:
+                pass
+
+    # ── intern: Analyse ────────────────────────────────────────────────────────
+    def _probe(self, path: str):
+        with self._lock:
+            if path in self._probing or self._pool is None or not self._running:
+                return
+            self._probing.add(path)
+            d = os.path.dirname(path)
+            self._pending[d] = self._pending.get(d, 0) + 1
+        try:
+            self._pool.submit(self._probe_done, path)
+        except RuntimeError:        # Pool schon beendet
+            self._unpend(path)
+
+    def _unpend(self, path: str) -> int:
+        d = os.path.dirname(path)
+        with self._lock:
+            self._probing.discard(path)
+            n = self._pending.pop(d, 1) - 1
+            if n > 0:
+                self._pending[d] = n
+        return n
+
+    def _probe_done(self, path: str):
+        try:
+            entry = probe(path) if self._running else None
+        except Exception:
+            entry = None
+        if entry is not None and self._running:
+            with self._lock:
+                self._db.execute(f"INSERT OR REPLACE INTO files ({', '.join(_COLUMNS)}) "
+                                 f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                                 tuple(entry[c] for c in _COLUMNS))
+                self._db.commit()
+                old = self._vanished.pop(entry["sha1"], None)
+            if old is not None and old != path and not os.path.exists(old):
+                self._notify([path], {old: path})
+            else:
+                self._notify([path], {})
+        if self._unpend(path) == 0 and self._running:
+            self._settle(os.path.dirname(path))
+
+    # ── intern: Verzeichnisse & inotify ────────────────────────────────────────
+    def _watch(self, path: str):
+        if self._inotify is None:
+            return
+        try:
+            self._wds[self._inotify.add(path)] = path
+        except OSError:
+            pass        # z. B. max_user_watches erreicht → nur Abgleich beim Start
+
+    def _scan_tree(self, top: str):
+        """Watches setzen und geänderte Verzeichnisse abgleichen (Watch zuerst →
+        keine Änderung geht zwischen Abgleich und Watch verloren)."""
+        known = {r[0]: r[1] for r in self._db_rows("SELECT path, mtime_ns FROM dirs")}
+        seen = set()
+        stack = [top]
+        while stack and self._running:
+            d = stack.pop()
+            seen.add(d)
+            self._watch(d)
+            try:
+                with os.scandir(d) as it:
+                    entries = list(it)
+                mtime = os.stat(d).st_mtime_ns
+            except OSError:
+                continue
+            stack += [e.path for e in entries if e.is_dir(follow_symlinks=False)]
+            if known.get(d) != mtime:
+                self._reconcile_dir(d, [e for e in entries if e.is_file() and is_audio(e.name)])
+        # Verzeichnisse, die es nicht mehr gibt
+        prefix = top.rstrip("/") + "/"
+        for d in known:
+            if (d == top or d.startswith(prefix)) and d not in seen and not os.path.isdir(d):
+                self._forget_tree(d)
+
+    def _reconcile_dir(self, d: str, files: list[os.DirEntry]):
+        rows = {r["path"]: r for r in self._query("SELECT * FROM files WHERE dir = ?", (d,))}
+        for e in files:
+            row = rows.pop(e.path, None)
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            if row is None or (row["mtime_ns"], row["size"]) != (st.st_mtime_ns, st.st_size):
+                self._probe(e.path)
+        for gone in rows:
+            self._forget(gone)
+        self._settle(d)
+
+    def _db_rows(self, sql: str) -> list[tuple]:
+        with self._lock:
+            return self._db.execute(sql).fetchall()
+
+    def _run(self):
+        try:
+            self._inotify = Inotify()
+        except (OSError, AttributeError):
+            self._inotify = None        # kein inotify → nur Abgleich beim Start
+        try:
+            if os.path.isdir(self.root):
+                self._scan_tree(self.root)
+            if self._inotify is None:
+                return
+            sel = selectors.DefaultSelector()
+            sel.register(self._inotify.fd, selectors.EVENT_READ, "inotify")
+            sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+            with sel:
+                while self._running:
+                    for key, _ in sel.select():
+                        if key.data == "wake":
+                            return
+                        self._handle(self._inotify.read())
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+
+    def _handle(self, events: list[tuple[int, int, int, str]]):
+        moved_from: dict[int, tuple[str, bool]] = {}     # Cookie → (Pfad, Verzeichnis?)
+        dirty = set()
+        for wd, mask, cookie, name in events:
+            if mask & IN_Q_OVERFLOW:
+                self._rescan()
+                return
+            parent = self._wds.get(wd)
+            if parent is None:
+                continue
+            if mask & IN_IGNORED:
+                self._wds.pop(wd, None)
+                continue
+            if mask & IN_DELETE_SELF:
+                continue                      # IN_IGNORED folgt
+            path = os.path.join(parent, name)
+            is_dir = bool(mask & IN_ISDIR)
+            dirty.add(parent)
+            if mask & IN_MOVED_FROM:
+                moved_from[cookie] = (path, is_dir)
+            elif mask & IN_MOVED_TO and cookie in moved_from:
+                old, _ = moved_from.pop(cookie)
+                if is_dir:
+                    self._retarget_watches(old, path)
+                    self._rename_tree(old, path)
+                elif is_audio(name) and is_audio(old):
+                    self._rename(old, path)
+                elif is_audio(name):
+                    self._probe(path)
+                elif is_audio(old):
+                    self._forget(old)
+            elif is_dir and mask & (IN_CREATE | IN_MOVED_TO):
+                self._scan_tree(path)
+            elif is_dir and mask & IN_DELETE:
+                self._forget_tree(path)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and is_audio(name):
+                self._probe(path)
+            elif mask & IN_DELETE and is_audio(name):
+                self._forget(path)
+        # Aus dem Baum hinaus verschoben = gelöscht
+        for path, is_dir in moved_from.values():
+            if is_dir:
+                self._forget_tree(path)
+            elif is_audio(path):
+                self._forget(path)
+        for d in dirty:
+            self._settle(d)
+
+    def _retarget_watches(self, old: str, new: str):
+        # Watches hängen am Inode und bleiben gültig – nur die Pfade nachziehen
+        prefix = old.rstrip("/") + "/"
+        for wd, d in list(self._wds.items()):
+            if d == old or d.startswith(prefix):
+                self._wds[wd] = new + d[len(old):]
+
+    def _rescan(self):
+        # Event-Warteschlange übergelaufen → alles einmal abgleichen
+        self._write("DELETE FROM dirs")
+        self._scan_tree(self.root)
+
+
+def _subtree(path: str) -> tuple[str, str]:
+    """Bereich [lo, hi) aller Pfade unter `path` – exakt und indexfähig.
+    (LIKE wäre ASCII-case-insensitiv: "Memes/" träfe auch "memes/".)
+    BINARY vergleicht UTF-8-Bytes, also Codepoints: "a/b/" ≤ … < "a/b0"."""
+    prefix = path.rstrip("/")
+    return prefix + "/", prefix + "0"
@@ -0,0 +1,183 @@
+"""
+maiNboard - Adaptive Latenz für den Mikrofon-Loopback (Qt-frei)
+
+module-loopback (echtes Mikrofon → maiNboard_sink) braucht eine feste
+latency_msec. Zu niedrig → Underruns/Knistern, zu hoch → hörbarer Versatz.
+Der Tuner sucht pro Mikrofon die niedrigste Stufe, die stabil läuft:
+
+  Start: gespeicherte Latenz des Mikrofons (sonst loopback_target_ms)
+    │
+    ├─ STABLE_SEC stabil    ──►  eine Stufe tiefer probieren – frühestens
+    │                            RELOAD_SEC nach dem letzten Neuladen, eine schon
+    │                            einmal gescheiterte Stufe erst nach RETRY_SEC
+    └─ instabil             ──►  eine Stufe höher; scheitert dieselbe Stufe
+                                 FLOOR_STRIKES-mal, wird sie zum Boden
+                                 (dort wird nie wieder probiert)
+
+  Stabil/instabil: Einmal pro Sekunde die vom Server gemeldete Latenz des
+  Loopback-Streams (Puffer + Sink). Das erste Fenster nach dem Laden ist die
+  Basis; danach zählt die Abweichung davon:
+    Drift   – module-loopback vergrößert nach Underruns seinen Puffer
+              → der Median steigt über die Basis
+    Leerlauf – der Puffer läuft leer (das Underrun selbst)
+              → mehrere Messungen fallen weit unter die Basis
+  Meldet der Server keine Latenz (0), wird nichts verstellt.
+
+Jede Änderung lädt nur den Loopback neu (SoundboardCore.create_sink) – das
+ist ein kurzer Aussetzer, deshalb die Mindestabstände beim Probieren.
+
+Gemessen wird nur über die native libpulse-Verbindung (ein Roundtrip, kein
+Prozess). PulseState hilft hier nicht: Latenzänderungen lösen kein Event aus,
+der Speicherstand bliebe stehen. Mit dem pactl-Fallback wäre jede Messung ein
+Prozessstart pro Sekunde – dort bleibt die gespeicherte Latenz einfach fest.
+"""
+
+import threading
+import time
+from typing import Callable
+
+# Mögliche latency_msec-Werte
+STEPS_MS: tuple[int, ...] = (1, 2, 4, 6, 10, 15, 20, 30, 50, 80)
+
+SAMPLE_SEC    = 1.0     # Abtastintervall
+WINDOW        = 10      # Messungen pro Urteil (das erste Fenster ist die Basis)
+STABLE_SEC    = 60.0    # so lange stabil, bevor eine tiefere Stufe probiert wird
+RELOAD_SEC    = 300.0   # Mindestabstand zwischen zwei Probe-Schritten (Aussetzer!)
+RETRY_SEC     = 1800.0  # gescheiterte Stufe erst nach so langer Pause wieder probieren
+FLOOR_STRIKES = 2       # so oft muss eine Stufe scheitern, bevor sie zum Boden wird
+DRIFT_MS      = 4.0     # erlaubter Anstieg des Medians über die Basis (mindestens das Soll)
+DRAIN_RATIO   = 0.5     # Messung unter diesem Anteil der Basis → Puffer leergelaufen
+DRAIN_HITS    = 2       # … so viele davon im Fenster gelten als Underrun
+
+
+def step_up(ms: int) -> int:
+    return next((s for s in STEPS_MS if s > ms), STEPS_MS[-1])
+
+
+def step_down(ms: int) -> int | None:
+    lower = [s for s in STEPS_MS if s < ms]
+    return lower[-1] if lower else None
+
+
+def median(samples_ms: list[float]) -> float | None:
+    """Median der gültigen Messungen – None, wenn der Server kaum Latenzen liefert."""
+    vals = sorted(v for v in samples_ms if v > 0)
+    if len(vals) < len(samples_ms) // 2 or not vals:
+        return None
+    return vals[len(vals) // 2]
+
+
+def assess(samples_ms: list[float], target_ms: int, baseline_ms: float) -> bool | None:
+    """True = stabil, False = instabil (Drift oder Leerlauf gegenüber der Basis),
+    None = der Server liefert keine Latenz."""
+    mid = median(samples_ms)
+    if mid is None:
+        return None
+    if mid - baseline_ms > max(DRIFT_MS, target_ms):
+        return False
+    drained = sum(1 for v in samples_ms if 0 < v < baseline_ms * DRAIN_RATIO)
+    return drained < DRAIN_HITS
+
+
+class LoopbackTuner:
+    """Beobachtet den Loopback-Stream und stellt die Latenz nach.
+
+    module()            → Index des aktuellen Loopback-Moduls (None = keiner aktiv)
+    source()            → Name des Mikrofons (Fehlschläge zählen pro Mikrofon)
+    current()           → (eingestellte Latenz in ms, Boden in ms oder 0)
+    apply(ms, floor)    → neue Latenz speichern und den Loopback neu laden
+    """
+
+    def __init__(self, backend, module: Callable[[], int | None],
+                 source: Callable[[], str],
+                 current: Callable[[], tuple[int, int]],
+                 apply: Callable[[int, int], None]):
+        self.backend = backend
+        self._module  = module
+        self._source  = source
+        self._current = current
+        self._apply   = apply
+        self._wake    = threading.Event()
+        self._running = False
+        self._thread: threading.Thread | None = None
+        # Mikrofon → {Stufe: (Fehlschläge, Zeitpunkt des letzten)}
+        self._strikes: dict[str, dict[int, tuple[int, float]]] = {}
+        self._reloaded = time.monotonic()
+        self._reset(None)
+
+    def start(self):
+        if self._thread is not None or not self.can_measure():
+            return
+        self._running = True
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run, name="maiNboard-loopback", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def can_measure(self) -> bool:
+        """Nur mit dem nativen Backend – sonst kostete jede Messung einen pactl-Aufruf."""
+        return getattr(self.backend, "name", "") == "native"
+
+    # ── intern ─────────────────────────────────────────────────────────────────
+    def _reset(self, module: int | None):
+        self._watching = module
+        self._samples: list[float] = []
+        self._baseline: float | None = None
+        self._since = time.monotonic()
+
+    def _run(self):
+        while self._running:
+            self._wake.wait(SAMPLE_SEC)
+            if not self._running:
+                return
+            try:
+                self._tick()
+            except Exception:
+                pass    # z. B. Server kurz weg – nächste Runde
+
+    def _tick(self):
+        module = self._module()
+        if module != self._watching:
+            self._reset(module)          # neu geladen (auch durch uns) → neu messen
+            self._reloaded = time.monotonic()
+        if module is None:
+            return
+        si = next((s for s in self.backend.list_sink_inputs() if s.owner_module == module), None)
+        if si is None or si.latency_usec is None:
+            return
+        self._samples.append(si.latency_usec / 1000)
+        if len(self._samples) < WINDOW:
+            return
+        window, self._samples = self._samples[-WINDOW:], []
+        if self._baseline is None:
+            self._baseline = median(window)     # eingeschwungen → Basis für alles Weitere
+            return
+
+        ms, floor = self._current()
+        verdict = assess(window, ms, self._baseline)
+        now = time.monotonic()
+        if verdict is False:
+            # Knistert → sofort eine Stufe rauf; Boden erst nach wiederholtem Scheitern
+            strikes = self._strikes.setdefault(self._source(), {})
+            count = strikes.get(ms, (0, 0.0))[0] + 1
+            strikes[ms] = (count, now)
+            if count >= FLOOR_STRIKES:
+                floor = max(floor, ms)
+            self._reset(None)
+            self._apply(step_up(ms), floor)
+        elif (verdict and now - self._since >= STABLE_SEC
+                and now - self._reloaded >= RELOAD_SEC):
+            lower = step_down(ms)
+            if lower is None or lower <= floor:
+                return                   # am Boden angekommen → nicht mehr probieren
+            failed = self._strikes.get(self._source(), {}).get(lower)
+            if failed is not None and now - failed[1] < RETRY_SEC:
+                return
+            self._reset(None)
+            self._apply(lower, floor)
@@ -0,0 +1,931 @@
+"""
+maiNboard - PulseAudio-Anbindung (Qt-frei)
+
+Backends (gleiche typisierte API):
+  NativeBackend  →  libpulse per ctypes, EINE dauerhafte Verbindung zum Server
+  PactlBackend   →  Fallback: jeder Aufruf ein `pactl`-Prozess, Textausgabe parsen
+
+PulseState hält Sinks, Sources, Module und Sink-Inputs im Speicher:
+  Start     →  einmal alles einlesen
+  Danach    →  Server-Events (Subscribe) halten den Zustand aktuell; nur die
+               betroffene Objektart wird nach einem Event neu gelesen
+  Abfragen  →  reine Dict-Zugriffe, kein Prozessstart
+
+ControlWorker schickt Stellbefehle aus einem eigenen Thread – pro Ziel nur
+den jeweils letzten Wert, höchstens einmal pro Intervall.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import queue
+import re
+import subprocess
+import threading
+import time
+from typing import Callable, NamedTuple
+
+# pactl übersetzt seine Ausgabe ("Beschreibung:" statt "Description:") → immer C-Locale
+_PACTL_ENV = {**os.environ, "LC_ALL": "C"}
+
+EventCallback = Callable[[str, str, int | None], None]   # (kind, facility, index)
+
+
+class PulseError(Exception):
+    pass
+
+
+class Sink(NamedTuple):
+    index: int
+    name: str
+    description: str
+    owner_module: int | None
+
+
+class Source(NamedTuple):
+    index: int
+    name: str
+    description: str
+    owner_module: int | None
+    monitor_of: str          # "" bei echten Quellen
+
+
+class Module(NamedTuple):
+    index: int
+    name: str
+    argument: str
+
+    @property
+    def args(self) -> dict[str, str]:
+        return parse_module_args(self.argument)
+
+
+class SinkInput(NamedTuple):
+    index: int
+    sink: int
+    owner_module: int | None
+    pid: int | None
+    latency_usec: int | None = None   # Puffer + Sink, wie vom Server gemeldet
+
+
+# ── pactl-Fallback ─────────────────────────────────────────────────────────────
+def pactl(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["pactl", *args], capture_output=True, text=True, env=_PACTL_ENV)
+
+
+_MODARG_RE = re.compile(r"""([^\s=]+)=((?:"[^"]*"|'[^']*'|\\.|[^\s\\])*)""")
+
+
+def parse_module_args(argument: str) -> dict[str, str]:
+    """Modul-Argumente "a=1 b=x\\ y c='z w'" → {"a": "1", "b": "x\\ y", "c": "'z w'"}.
+    Werte bleiben roh (Escapes/Quotes erhalten) – verglichen wird mit dem,
+    was wir selbst an load_module übergeben."""
+    return dict(_MODARG_RE.findall(argument or ""))
+
+
+def parse_pactl_list(text: str) -> list[dict]:
+    """Zerlegt `pactl list <typ>` in Blöcke: {"#": index, "Name": …, "props": {…}}."""
+    blocks: list[dict] = []
+    cur: dict | None = None
+    in_props = False
+    for raw in text.splitlines():
+        if raw and not raw[0].isspace():
+            # Kopfzeile "Sink #12" / "Module #3" / "Sink Input #40"
+            head, _, idx = raw.rpartition("#")
+            if head and idx.isdigit():
+                cur = {"#": int(idx), "props": {}}
+                blocks.append(cur)
+                in_props = False
+            continue
+        if cur is None:
+            continue
+        line = raw.strip()
+        if not line:
+            continue
+        if raw.startswith("\t\t") and in_props:
+            key, sep, val = line.partition(" = ")
+            if sep:
+                cur["props"][key] = val.strip('"')
+            continue
+        key, sep, val = line.partition(":")
+        if not sep:
+            continue
+        in_props = key == "Properties"
+        cur.setdefault(key, val.strip())
+    return blocks
+
+
+def _int_or_none(v: str | None) -> int | None:
+    return int(v) if v and v.isdigit() else None
+
+
+def _latency_usec(block: dict) -> int | None:
+    """"Buffer Latency: 12000 usec" + "Sink Latency: 3000 usec" → 15000."""
+    vals = [_int_or_none(block.get(k, "").split(" ")[0])
+            for k in ("Buffer Latency", "Sink Latency")]
+    return sum(v for v in vals if v is not None) if any(v is not None for v in vals) else None
+
+
+class PactlBackend:
+    """Jeder Aufruf startet `pactl` – langsam, aber überall verfügbar."""
+
+    name = "pactl"
+
+    def __init__(self):
+        self._sub_proc: subprocess.Popen | None = None
+        self._sub_running = False
+
+    def _check(self, r: subprocess.CompletedProcess) -> str:
+        if r.returncode != 0:
+            raise PulseError(r.stderr.strip() or f"pactl exit {r.returncode}")
+        return r.stdout
+
+    def list_sinks(self) -> list[Sink]:
+        return [Sink(b["#"], b.get("Name", ""), b.get("Description", ""),
+                     _int_or_none(b.get("Owner Module")))
+                for b in parse_pactl_list(pactl("list", "sinks").stdout)]
+
+    def list_sources(self) -> list[Source]:
+        out = []
+        for b in parse_pactl_list(pactl("list", "sources").stdout):
+            mon = b.get("Monitor of Sink", "n/a")
+            out.append(Source(b["#"], b.get("Name", ""), b.get("Description", ""),
+                              _int_or_none(b.get("Owner Module")),
+                              "" if mon == "n/a" else mon))
+        return out
+
+    def list_modules(self) -> list[Module]:
+        out = []
+        for line in pactl("list", "modules", "short").stdout.splitlines():
+            parts = line.split("\t")
+            if len(parts) >= 2 and parts[0].isdigit():
+                out.append(Module(int(parts[0]), parts[1], parts[2] if len(parts) > 2 else ""))
+        return out
+
+    def list_sink_inputs(self) -> list[SinkInput]:
+        return [SinkInput(b["#"], _int_or_none(b.get("Sink")) or 0,
+                          _int_or_none(b.get("Owner Module")),
+                          _int_or_none(b["props"].get("application.process.id")),
+                          _latency_usec(b))
+                for b in parse_pactl_list(pactl("list", "sink-inputs").stdout)]
+
+    def get_default_sink(self) -> str:
+        return pactl("get-default-sink").stdout.strip()
+
+    def load_module(self, name: str, args: list[str]) -> int:
+        out = self._check(pactl("load-module", name, *args)).strip()
+        if not out.isdigit():
+            raise PulseError(f"load-module {name}: {out}")
+        return int(out)
+
+    def unload_module(self, index: int):
+        self._check(pactl("unload-module", str(index)))
+
+    def set_sink_input_volume(self, index: int, percent: int):
+        self._check(pactl("set-sink-input-volume", str(index), f"{percent}%"))
+
+    def set_sink_input_volumes(self, changes: dict[int, int]):
+        """{Index: Prozent} – pactl kennt keinen Batch, also ein Aufruf pro Stream."""
+        for index, percent in changes.items():
+            self.set_sink_input_volume(index, percent)
+
+    def set_source_volume(self, name: str, percent: int):
+        self._check(pactl("set-source-volume", name, f"{percent}%"))
+
+    def set_default_sink(self, name: str):
+        self._check(pactl("set-default-sink", name))
+
+    def subscribe(self, cb: EventCallback):
+        """Folgt `pactl subscribe` in einem eigenen Thread (mit Neustart)."""
+        self._sub_running = True
+        threading.Thread(target=self._subscribe_loop, args=(cb,),
+                         name="maiNboard-pactl-subscribe", daemon=True).start()
+
+    def close(self):
+        self._sub_running = False
+        if self._sub_proc and self._sub_proc.poll() is None:
+            self._sub_proc.terminate()
+
+    def _subscribe_loop(self, cb: EventCallback):
+        while self._sub_running:
+            try:
+                self._sub_proc = subprocess.Popen(
+                    ["pactl", "subscribe"], stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL, bufsize=0, env=_PACTL_ENV,
+                )
+            except OSError:
+                return
+            fd, buf = self._sub_proc.stdout.fileno(), b""
+            while True:
+                chunk = os.read(fd, 4096)
+                if not chunk:
+                    break
+                *lines, buf = (buf + chunk).split(b"\n")
+                for line in lines:
+                    # Event 'new' on sink-input #42
+                    parts = line.decode(errors="replace").split()
+                    if len(parts) < 4 or parts[0] != "Event":
+                        continue
+                    idx = parts[4].lstrip("#") if len(parts) > 4 else ""
+                    cb(parts[1].strip("'"), parts[3], int(idx) if idx.isdigit() else None)
+            if self._sub_running:
+                cb("disconnect", "*", None)
+                time.sleep(1.0)
+
+
+# ── libpulse (ctypes) ──────────────────────────────────────────────────────────
+_PA_INVALID_INDEX = 0xFFFFFFFF
+_PA_VOLUME_NORM   = 0x10000
+_PA_CHANNELS_MAX  = 32
+
+_CTX_READY, _CTX_FAILED, _CTX_TERMINATED = 4, 5, 6
+_OP_RUNNING = 0
+
+_SUB_MASK = 0x0001 | 0x0002 | 0x0004 | 0x0010 | 0x0080   # sink, source, sink-input, module, server
+_FACILITY = {0: "sink", 1: "source", 2: "sink-input", 4: "module", 7: "server"}
+_EVENT    = {0x00: "new", 0x10: "change", 0x20: "remove"}
+
+
+class _SampleSpec(ctypes.Structure):
+    _fields_ = [("format", ctypes.c_int), ("rate", ctypes.c_uint32),
+                ("channels", ctypes.c_uint8)]
+
+
+class _ChannelMap(ctypes.Structure):
+    _fields_ = [("channels", ctypes.c_uint8), ("map", ctypes.c_int * _PA_CHANNELS_MAX)]
+
+
+class _CVolume(ctypes.Structure):
+    _fields_ = [("channels", ctypes.c_uint8), ("values", ctypes.c_uint32 * _PA_CHANNELS_MAX)]
+
+
+# Nur der vordere, seit Jahren stabile Teil der Info-Structs – libpulse übergibt
+# Zeiger, neuere Felder am Ende stören daher nicht.
+class _SinkInfo(ctypes.Structure):
+    _fields_ = [("name", ctypes.c_char_p), ("index", ctypes.c_uint32),
+                ("description", ctypes.c_char_p), ("sample_spec", _SampleSpec),
+                ("channel_map", _ChannelMap), ("owner_module", ctypes.c_uint32),
+                ("volume", _CVolume), ("mute", ctypes.c_int),
+                ("monitor_source", ctypes.c_uint32), ("monitor_source_name", ctypes.c_char_p),
+                ("latency", ctypes.c_uint64), ("driver", ctypes.c_char_p),
+                ("flags", ctypes.c_int), ("proplist", ctypes.c_void_p)]
+
+
+class _SourceInfo(ctypes.Structure):
+    _fields_ = [("name", ctypes.c_char_p), ("index", ctypes.c_uint32),
+                ("description", ctypes.c_char_p), ("sample_spec", _SampleSpec),
+                ("channel_map", _ChannelMap), ("owner_module", ctypes.c_uint32),
+                ("volume", _CVolume), ("mute", ctypes.c_int),
+                ("monitor_of_sink", ctypes.c_uint32), ("monitor_of_sink_name", ctypes.c_char_p),
+                ("latency", ctypes.c_uint64), ("driver", ctypes.c_char_p),
+                ("flags", ctypes.c_int), ("proplist", ctypes.c_void_p)]
+
+
+class _ModuleInfo(ctypes.Structure):
+    _fields_ = [("index", ctypes.c_uint32), ("name", ctypes.c_char_p),
+                ("argument", ctypes.c_char_p), ("n_used", ctypes.c_uint32),
+                ("auto_unload", ctypes.c_int), ("proplist", ctypes.c_void_p)]
+
+
+class _SinkInputInfo(ctypes.Structure):
+    _fields_ = [("index", ctypes.c_uint32), ("name", ctypes.c_char_p),
+                ("owner_module", ctypes.c_uint32), ("client", ctypes.c_uint32),
+                ("sink", ctypes.c_uint32), ("sample_spec", _SampleSpec),
+                ("channel_map", _ChannelMap), ("volume", _CVolume),
+                ("buffer_usec", ctypes.c_uint64), ("sink_usec", ctypes.c_uint64),
+                ("resample_method", ctypes.c_char_p), ("driver", ctypes.c_char_p),
+                ("mute", ctypes.c_int), ("proplist", ctypes.c_void_p)]
+
+
+class _ServerInfo(ctypes.Structure):
+    _fields_ = [("user_name", ctypes.c_char_p), ("host_name", ctypes.c_char_p),
+                ("server_version", ctypes.c_char_p), ("server_name", ctypes.c_char_p),
+                ("sample_spec", _SampleSpec), ("default_sink_name", ctypes.c_char_p),
+                ("default_source_name", ctypes.c_char_p), ("cookie", ctypes.c_uint32)]
+
+
+def _info_cb(struct):
+    return ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.POINTER(struct),
+                            ctypes.c_int, ctypes.c_void_p)
+
+
+_SinkInfoCb      = _info_cb(_SinkInfo)
+_SourceInfoCb    = _info_cb(_SourceInfo)
+_ModuleInfoCb    = _info_cb(_ModuleInfo)
+_SinkInputInfoCb = _info_cb(_SinkInputInfo)
+_ServerInfoCb    = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.POINTER(_ServerInfo),
+                                    ctypes.c_void_p)
+_IndexCb     = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_uint32, ctypes.c_void_p)
+_SuccessCb   = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p)
+_NotifyCb    = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_void_p)
+_SubscribeCb = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_int, ctypes.c_uint32,
+                                ctypes.c_void_p)
+
+_VP, _U32, _CP = ctypes.c_void_p, ctypes.c_uint32, ctypes.c_char_p
+_LIBPULSE_SIGNATURES = {
+    "pa_threaded_mainloop_new":             (_VP, []),
+    "pa_threaded_mainloop_free":            (None, [_VP]),
+    "pa_threaded_mainloop_start":           (ctypes.c_int, [_VP]),
+    "pa_threaded_mainloop_stop":            (None, [_VP]),
+    "pa_threaded_mainloop_lock":            (None, [_VP]),
+    "pa_threaded_mainloop_unlock":          (None, [_VP]),
+    "pa_threaded_mainloop_wait":            (None, [_VP]),
+    "pa_threaded_mainloop_signal":          (None, [_VP, ctypes.c_int]),
+    "pa_threaded_mainloop_get_api":         (_VP, [_VP]),
+    "pa_context_new":                       (_VP, [_VP, _CP]),
+    "pa_context_unref":                     (None, [_VP]),
+    "pa_context_connect":                   (ctypes.c_int, [_VP, _CP, ctypes.c_int, _VP]),
+    "pa_context_disconnect":                (None, [_VP]),
+    "pa_context_get_state":                 (ctypes.c_int, [_VP]),
+    "pa_context_errno":                     (ctypes.c_int, [_VP]),
+    "pa_strerror":                          (_CP, [ctypes.c_int]),
+    "pa_context_set_state_callback":        (None, [_VP, _NotifyCb, _VP]),
+    "pa_context_set_subscribe_callback":    (None, [_VP, _SubscribeCb, _VP]),
+    "pa_context_subscribe":                 (_VP, [_VP, ctypes.c_int, _SuccessCb, _VP]),
+    "pa_context_get_sink_info_list":        (_VP, [_VP, _SinkInfoCb, _VP]),
+    "pa_context_get_source_info_list":      (_VP, [_VP, _SourceInfoCb, _VP]),
+    "pa_context_get_source_info_by_name":   (_VP, [_VP, _CP, _SourceInfoCb, _VP]),
+    "pa_context_get_module_info_list":      (_VP, [_VP, _ModuleInfoCb, _VP]),
+    "pa_context_get_sink_input_info_list":  (_VP, [_VP, _SinkInputInfoCb, _VP]),
+    "pa_context_get_sink_input_info":       (_VP, [_VP, _U32, _SinkInputInfoCb, _VP]),
+    "pa_context_get_server_info":           (_VP, [_VP, _ServerInfoCb, _VP]),
+    "pa_context_load_module":               (_VP, [_VP, _CP, _CP, _IndexCb, _VP]),
+    "pa_context_unload_module":             (_VP, [_VP, _U32, _SuccessCb, _VP]),
+    "pa_context_set_sink_input_volume":     (_VP, [_VP, _U32, ctypes.POINTER(_CVolume),
+                                                   _SuccessCb, _VP]),
+    "pa_context_set_source_volume_by_name": (_VP, [_VP, _CP, ctypes.POINTER(_CVolume),
+                                                   _SuccessCb, _VP]),
+    "pa_context_set_default_sink":          (_VP, [_VP, _CP, _SuccessCb, _VP]),
+    "pa_operation_get_state":               (ctypes.c_int, [_VP]),
+    "pa_operation_unref":                   (None, [_VP]),
+    "pa_proplist_gets":                     (_CP, [_VP, _CP]),
+}
+
+
+def _load_libpulse():
+    lib = ctypes.CDLL(ctypes.util.find_library("pulse") or "libpulse.so.0")
+    for fn, (res, args) in _LIBPULSE_SIGNATURES.items():
+        f = getattr(lib, fn)
+        f.restype, f.argtypes = res, args
+    return lib
+
+
+def _s(b: bytes | None) -> str:
+    return b.decode(errors="replace") if b else ""
+
+
+def _idx(v: int) -> int | None:
+    return None if v == _PA_INVALID_INDEX else v
+
+
+class NativeBackend:
+    """libpulse über ctypes: eine Verbindung, threaded Mainloop, typisierte Aufrufe."""
+
+    name = "native"
+
+    def __init__(self):
+        self._pa  = _load_libpulse()
+        self._ml  = None
+        self._ctx = None
+        self._sub_cb: EventCallback | None = None
+        self._closing = False
+        self._channels: dict[int, int] = {}   # Sink-Input → Kanalzahl (für Volumes)
+        # _ml/_ctx werden erst freigegeben, wenn kein _run mehr darauf arbeitet;
+        # solange close()/reconnect() läuft, kommt kein neuer Aufruf hinein.
+        # Reentrant, weil _connect selbst über _run abonniert.
+        self._use = threading.Condition(threading.RLock())
+        self._users = 0
+        # ctypes-Callbacks müssen leben, solange libpulse sie aufrufen kann
+        self._c_state = _NotifyCb(self._on_state)
+        self._c_event = _SubscribeCb(self._on_event)
+        self._connect()
+
+    # ── Verbindung ─────────────────────────────────────────────────────────────
+    def _connect(self):
+        pa = self._pa
+        self._closing = False
+        self._ml = pa.pa_threaded_mainloop_new()
+        if not self._ml:
+            raise PulseError("pa_threaded_mainloop_new fehlgeschlagen")
+        self._ctx = pa.pa_context_new(pa.pa_threaded_mainloop_get_api(self._ml), b"maiNboard")
+        pa.pa_context_set_state_callback(self._ctx, self._c_state, None)
+        pa.pa_context_set_subscribe_callback(self._ctx, self._c_event, None)
+        if pa.pa_threaded_mainloop_start(self._ml) < 0:
+            self.close()
+            raise PulseError("pa_threaded_mainloop_start fehlgeschlagen")
+        pa.pa_threaded_mainloop_lock(self._ml)
+        try:
+            if pa.pa_context_connect(self._ctx, None, 0, None) < 0:
+                raise PulseError(self._error())
+            while True:
+                st = pa.pa_context_get_state(self._ctx)
+                if st == _CTX_READY:
+                    break
+                if st in (_CTX_FAILED, _CTX_TERMINATED):
+                    raise PulseError(self._error())
+                pa.pa_threaded_mainloop_wait(self._ml)
+        except PulseError:
+            pa.pa_threaded_mainloop_unlock(self._ml)
+            self.close()
+            raise
+        pa.pa_threaded_mainloop_unlock(self._ml)
+        self._channels.clear()
+        if self._sub_cb is not None:
+            self._subscribe_op()
+
+    def reconnect(self):
+        with self._use:      # Zwischenzustand ohne Verbindung sieht niemand
+            self.close()
+            self._connect()
+
+    @property
+    def connected(self) -> bool:
+        return bool(self._ctx) and self._pa.pa_context_get_state(self._ctx) == _CTX_READY
+
+    def close(self):
+        pa = self._pa
+        with self._use:
+            self._closing = True
+            if self._users and self._ctx:
+                # Trennen bricht offene Operationen ab und weckt ihre Wartenden
+                pa.pa_threaded_mainloop_lock(self._ml)
+                pa.pa_context_disconnect(self._ctx)
+                pa.pa_threaded_mainloop_unlock(self._ml)
+            while self._users:          # laufende _run zu Ende kommen lassen
+                self._use.wait()
+            self._free()
+
+    def _free(self):
+        pa = self._pa
+        if self._ml:
+            pa.pa_threaded_mainloop_stop(self._ml)
+        if self._ctx:
+            pa.pa_context_disconnect(self._ctx)
+            pa.pa_context_unref(self._ctx)
+            self._ctx = None
+        if self._ml:
+            pa.pa_threaded_mainloop_free(self._ml)
+            self._ml = None
+
+    def _error(self) -> str:
+        return _s(self._pa.pa_strerror(self._pa.pa_context_errno(self._ctx)))
+
+    def _on_state(self, _ctx, _ud):
+        st = self._pa.pa_context_get_state(self._ctx)
+        if (st in (_CTX_FAILED, _CTX_TERMINATED) and not self._closing
+                and self._sub_cb is not None):
+            self._sub_cb("disconnect", "*", None)
+        self._pa.pa_threaded_mainloop_signal(self._ml, 0)
+
+    def _on_event(self, _ctx, t, idx, _ud):
+        facility = _FACILITY.get(t & 0x0F)
+        if facility and self._sub_cb is not None:
+            self._sub_cb(_EVENT.get(t & 0x30, "change"), facility, _idx(idx))
+
+    # ── Operationen ────────────────────────────────────────────────────────────
+    def _run(self, *starts: Callable[[], int | None]):
+        """Startet Operationen unter dem Mainloop-Lock und wartet auf ihr Ende.
+
+        Mehrere Operationen laufen gemeinsam: ein Lock, ein Roundtrip-Fenster.
+        """
+        with self._use:
+            if not self.connected:
+                raise PulseError("keine Verbindung zum PulseAudio-Server")
+            self._users += 1
+        try:
+            self._run_locked(*starts)
+        finally:
+            with self._use:
+                self._users -= 1
+                if not self._users:
+                    self._use.notify_all()
+
+    def _run_locked(self, *starts: Callable[[], int | None]):
+        pa = self._pa
+        pa.pa_threaded_mainloop_lock(self._ml)
+        try:
+            ops, error = [], None
+            for start in starts:
+                op = start()
+                if op:
+                    ops.append(op)
+                elif error is None:
+                    error = self._error()
+            for op in ops:
+                while pa.pa_operation_get_state(op) == _OP_RUNNING:
+                    pa.pa_threaded_mainloop_wait(self._ml)
+                pa.pa_operation_unref(op)
+            if error is not None:
+                raise PulseError(error)
+        finally:
+            pa.pa_threaded_mainloop_unlock(self._ml)
+
+    def _list(self, fn: str, cb_type, convert) -> list:
+        items = []
+
+        def _cb(_ctx, info, eol, _ud):
+            if not eol and info:
+                items.append(convert(info.contents))
+            self._pa.pa_threaded_mainloop_signal(self._ml, 0)
+
+        c_cb = cb_type(_cb)
+        self._run(lambda: getattr(self._pa, fn)(self._ctx, c_cb, None))
+        return items
+
+    def _success(self, start: Callable[[object], int | None]):
+        ok = []
+
+        def _cb(_ctx, success, _ud):
+            ok.append(bool(success))
+            self._pa.pa_threaded_mainloop_signal(self._ml, 0)
+
+        c_cb = _SuccessCb(_cb)
+        self._run(lambda: start(c_cb))
+        if not (ok and ok[0]):
+            raise PulseError(self._error())
+
+    def _channels_of(self, fn: str, cb_type, key) -> int | None:
+        found = []
+
+        def _cb(_ctx, info, eol, _ud):
+            if not eol and info:
+                found.append(info.contents.sample_spec.channels)
+            self._pa.pa_threaded_mainloop_signal(self._ml, 0)
+
+        c_cb = cb_type(_cb)
+        self._run(lambda: getattr(self._pa, fn)(self._ctx, key, c_cb, None))
+        return found[0] if found else None
+
+    @staticmethod
+    def _cvolume(channels: int, percent: int) -> _CVolume:
+        cv = _CVolume()
+        cv.channels = max(1, min(channels, _PA_CHANNELS_MAX))
+        for i in range(cv.channels):
+            cv.values[i] = int(_PA_VOLUME_NORM * percent / 100)
+        return cv
+
+    # ── API ────────────────────────────────────────────────────────────────────
+    def list_sinks(self) -> list[Sink]:
+        return self._list("pa_context_get_sink_info_list", _SinkInfoCb, lambda i: Sink(
+            i.index, _s(i.name), _s(i.description), _idx(i.owner_module)))
+
+    def list_sources(self) -> list[Source]:
+        return self._list("pa_context_get_source_info_list", _SourceInfoCb, lambda i: Source(
+            i.index, _s(i.name), _s(i.description), _idx(i.owner_module),
+            "" if i.monitor_of_sink == _PA_INVALID_INDEX else _s(i.monitor_of_sink_name)))
+
+    def list_modules(self) -> list[Module]:
+        return self._list("pa_context_get_module_info_list", _ModuleInfoCb, lambda i: Module(
+            i.index, _s(i.name), _s(i.argument)))
+
+    def list_sink_inputs(self) -> list[SinkInput]:
+        def conv(i: _SinkInputInfo) -> SinkInput:
+            self._channels[i.index] = i.sample_spec.channels
+            pid = self._pa.pa_proplist_gets(i.proplist, b"application.process.id")
+            return SinkInput(i.index, i.sink, _idx(i.owner_module),
+                             int(pid) if pid and pid.isdigit() else None,
+                             i.buffer_usec + i.sink_usec)
+        return self._list("pa_context_get_sink_input_info_list", _SinkInputInfoCb, conv)
+
+    def get_default_sink(self) -> str:
+        name = []
+
+        def _cb(_ctx, info, _ud):
+            if info:
+                name.append(_s(info.contents.default_sink_name))
+            self._pa.pa_threaded_mainloop_signal(self._ml, 0)
+
+        c_cb = _ServerInfoCb(_cb)
+        self._run(lambda: self._pa.pa_context_get_server_info(self._ctx, c_cb, None))
+        return name[0] if name else ""
+
+    def load_module(self, name: str, args: list[str]) -> int:
+        result = []
+
+        def _cb(_ctx, idx, _ud):
+            result.append(idx)
+            self._pa.pa_threaded_mainloop_signal(self._ml, 0)
+
+        c_cb = _IndexCb(_cb)
+        self._run(lambda: self._pa.pa_context_load_module(
+            self._ctx, name.encode(), " ".join(args).encode(), c_cb, None))
+        if not result or result[0] == _PA_INVALID_INDEX:
+            raise PulseError(f"load-module {name}: {self._error()}")
+        return result[0]
+
+    def unload_module(self, index: int):
+        self._success(lambda cb: self._pa.pa_context_unload_module(self._ctx, index, cb, None))
+
+    def set_sink_input_volume(self, index: int, percent: int):
+        channels = self._channels.get(index)
+        if channels is None:
+            channels = self._channels_of("pa_context_get_sink_input_info",
+                                         _SinkInputInfoCb, index) or 2
+            self._channels[index] = channels
+        cv = self._cvolume(channels, percent)
+        self._success(lambda cb: self._pa.pa_context_set_sink_input_volume(
+            self._ctx, index, ctypes.byref(cv), cb, None))
+
+    def set_sink_input_volumes(self, changes: dict[int, int]):
+        """{Index: Prozent} – alle Änderungen in einem Rutsch über die Verbindung."""
+        if any(i not in self._channels for i in changes):
+            self.list_sink_inputs()          # füllt den Kanal-Cache mit einem Aufruf
+        ok = []
+
+        def _cb(_ctx, success, _ud):
+            ok.append(bool(success))
+            self._pa.pa_threaded_mainloop_signal(self._ml, 0)
+
+        c_cb = _SuccessCb(_cb)
+        volumes = {i: self._cvolume(self._channels.get(i, 2), p) for i, p in changes.items()}
+        self._run(*(
+            lambda i=i, cv=cv: self._pa.pa_context_set_sink_input_volume(
+                self._ctx, i, ctypes.byref(cv), c_cb, None)
+            for i, cv in volumes.items()))
+        if len(ok) < len(volumes) or not all(ok):
+            raise PulseError(self._error())
+
+    def set_source_volume(self, name: str, percent: int):
+        channels = self._channels_of("pa_context_get_source_info_by_name",
+                                     _SourceInfoCb, name.encode())
+        if channels is None:
+            raise PulseError(f"Quelle nicht gefunden: {name}")
+        cv = self._cvolume(channels, percent)
+        self._success(lambda cb: self._pa.pa_context_set_source_volume_by_name(
+            self._ctx, name.encode(), ctypes.byref(cv), cb, None))
+
+    def set_default_sink(self, name: str):
+        self._success(lambda cb: self._pa.pa_context_set_default_sink(
+            self._ctx, name.encode(), cb, None))
+
+    def subscribe(self, cb: EventCallback):
+        """cb wird im Mainloop-Thread aufgerufen – dort nicht blockieren!"""
+        self._sub_cb = cb
+        self._subscribe_op()
+
+    def _subscribe_op(self):
+        self._success(lambda c: self._pa.pa_context_subscribe(self._ctx, _SUB_MASK, c, None))
+
+
+def connect_backend(prefer: str = "auto"):
+    """Native Verbindung wenn möglich, sonst pactl.  prefer: auto | native | pactl"""
+    if prefer != "pactl":
+        try:
+            return NativeBackend()
+        except (OSError, AttributeError, PulseError):
+            if prefer == "native":
+                raise
+    return PactlBackend()
+
+
+# ── Zustandsmodell ─────────────────────────────────────────────────────────────
+class PulseState:
+    """Im Speicher gehaltener Server-Zustand, aktualisiert per Subscribe-Events."""
+
+    FACILITIES = ("sink", "source", "module", "sink-input", "server")
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else connect_backend()
+        self._sinks: dict[int, Sink]            = {}
+        self._sources: dict[int, Source]        = {}
+        self._modules: dict[int, Module]        = {}
+        self._sink_inputs: dict[int, SinkInput] = {}
+        self._default_sink = ""
+        self._lock      = threading.Lock()
+        self._listeners: list[Callable[[str], None]] = []
+        self._events: queue.Queue = queue.Queue()
+        self._running   = False
+        self._thread: threading.Thread | None = None
+        self.ready = threading.Event()   # gesetzt, sobald alles einmal eingelesen ist
+
+    # ── Abfragen (nur Speicher) ────────────────────────────────────────────────
+    def sinks(self) -> list[Sink]:
+        return list(self._sinks.values())
+
+    def sources(self) -> list[Source]:
+        return list(self._sources.values())
+
+    def modules(self) -> list[Module]:
+        return list(self._modules.values())
+
+    def sink_inputs(self) -> list[SinkInput]:
+        return list(self._sink_inputs.values())
+
+    def has_sink(self, name: str) -> bool:
+        return any(s.name == name for s in self._sinks.values())
+
+    @property
+    def default_sink(self) -> str:
+        return self._default_sink
+
+    def sink_input_for_pid(self, pid: int) -> SinkInput | None:
+        for si in self._sink_inputs.values():
+            if si.pid == pid:
+                return si
+        return None
+
+    def add_listener(self, cb: Callable[[str], None]):
+        """cb(facility) – wird aus dem Hintergrund-Thread aufgerufen.
+        Nach dem ersten vollständigen Einlesen kommt einmalig facility="ready"."""
+        self._listeners.append(cb)
+
+    # ── Lebenszyklus ───────────────────────────────────────────────────────────
+    def start(self, wait: bool = True):
+        """Einmal komplett einlesen, danach dem Event-Strom folgen.
+
+        wait=False: das erste Einlesen läuft bereits im Hintergrund-Thread –
+        bis `ready` gesetzt ist, liefern die Abfragen leere Listen."""
+        if self._thread is not None:
+            return
+        if wait:
+            self._load()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, args=(not wait,),
+                                        name="maiNboard-pulse", daemon=True)
+        self._thread.start()
+        try:
+            # Nur in die Queue – der Callback läuft ggf. im libpulse-Mainloop
+            self.backend.subscribe(lambda kind, fac, idx: self._events.put((kind, fac, idx)))
+        except PulseError:
+            pass
+
+    def stop(self):
+        self._running = False
+        self._events.put(None)
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        self.backend.close()
+
+    def refresh(self, *facilities: str):
+        """Liest die angegebenen Objektarten sofort neu (z. B. nach eigenen Änderungen)."""
+        b = self.backend
+        for f in facilities:
+            try:
+                if f == "sink":
+                    data = {s.index: s for s in b.list_sinks()}
+                    with self._lock:
+                        self._sinks = data
+                elif f == "source":
+                    data = {s.index: s for s in b.list_sources()}
+                    with self._lock:
+                        self._sources = data
+                elif f == "module":
+                    data = {m.index: m for m in b.list_modules()}
+                    with self._lock:
+                        self._modules = data
+                elif f == "sink-input":
+                    data = {si.index: si for si in b.list_sink_inputs()}
+                    with self._lock:
+                        self._sink_inputs = data
+                elif f == "server":
+                    self._default_sink = b.get_default_sink()
+            except (OSError, PulseError):
+                continue
+        for f in facilities:
+            self._notify(f)
+
+    # ── intern ─────────────────────────────────────────────────────────────────
+    def _load(self):
+        self.refresh(*self.FACILITIES)
+        self.ready.set()
+        self._notify("ready")
+
+    def _notify(self, facility: str):
+        for cb in list(self._listeners):
+            try:
+                cb(facility)
+            except Exception:
+                pass
+
+    def _remove(self, facility: str, index: int):
+        table = {"sink": "_sinks", "source": "_sources",
+                 "module": "_modules", "sink-input": "_sink_inputs"}.get(facility)
+        if table is None:
+            return
+        with self._lock:
+            data = dict(getattr(self, table))
+            data.pop(index, None)
+            setattr(self, table, data)
+        self._notify(facility)
+
+    def _reconnect(self):
+        backoff = 0.5
+        while self._running:
+            try:
+                if hasattr(self.backend, "reconnect"):
+                    self.backend.reconnect()
+                self.refresh(*self.FACILITIES)
+                return
+            except (OSError, PulseError):
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 10.0)
+
+    def _run(self, load: bool = False):
+        """Sammelt Events; mehrere kurz hintereinander → ein Refresh pro Objektart."""
+        if load:
+            self._load()     # Events, die währenddessen kommen, warten in der Queue
+        while self._running:
+            ev = self._events.get()
+            dirty: set[str] = set()
+            while ev is not None:
+                kind, facility, index = ev
+                if kind == "disconnect":
+                    # Server neu gestartet o. Ä. → neu verbinden, alles neu lesen
+                    self._reconnect()
+                    dirty.clear()
+                elif facility in self.FACILITIES:
+                    if kind == "remove" and index is not None:
+                        self._remove(facility, index)
+                    else:
+                        dirty.add(facility)
+                        if facility in ("sink", "source"):
+                            dirty.add("server")   # Default kann sich mitändern
+                try:
+                    ev = self._events.get(timeout=0.02)
+                except queue.Empty:
+                    break
+            if ev is None:
+                return
+            if dirty:
+                self.refresh(*sorted(dirty))
+
+
+class ControlWorker:
+    """Live-Stellbefehle (Mic-Gain, Stream-Lautstärke, Default-Sink) abseits der GUI.
+
+    Pro Ziel zählt nur der letzte Wert: ein Slider-Drag über 300 Stufen
+    ergibt höchstens einen Befehl pro `min_interval`, nicht 300 Aufrufe.
+    """
+
+    def __init__(self, backend, min_interval: float = 0.03):
+        self.backend = backend
+        self.min_interval = min_interval
+        self._pending: dict[tuple, tuple[Callable, tuple]] = {}
+        self._cond = threading.Condition()
+        self._busy = False
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="maiNboard-controls", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Offene Befehle noch abarbeiten, dann beenden."""
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, key: tuple, fn: Callable, *args):
+        """Befehl für `key` vormerken; ein noch nicht gesendeter wird ersetzt."""
+        with self._cond:
+            self._pending[key] = (fn, args)
+            self._cond.notify_all()
+
+    def set_source_volume(self, name: str, percent: int):
+        self.submit(("source-volume", name), self.backend.set_source_volume, name, percent)
+
+    def set_default_sink(self, name: str):
+        self.submit(("default-sink",), self.backend.set_default_sink, name)
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Wartet, bis alles gesendet ist (z. B. vor dem Beenden)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while (self._pending or self._busy) and self._running:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cond.wait(left)
+            return not self._pending
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                batch, self._pending = self._pending, {}
+                self._busy = True
+            t0 = time.monotonic()
+            for fn, args in batch.values():
+                try:
+                    fn(*args)
+                except (OSError, PulseError):
+                    pass
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+            # Rate begrenzen: was in der Pause eintrifft, wird weiter zusammengefasst
+            rest = self.min_interval - (time.monotonic() - t0)
+            if rest > 0:
+                time.sleep(rest)
@@ -15,13 +15,18 @@ Audio-Routing-Architektur:
 """
 
 import sys
-import os
-import json
 import shutil
-import subprocess
-import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
 
+_T_START = time.perf_counter()   # Bezugspunkt für --startup-report
+
+if __name__ == "__main__" and "--daemon" in sys.argv[1:]:
+    # Headless: kein Qt laden – Engine, Sink und Hotkeys laufen im Daemon
+    from daemon import main as _daemon_main
+    sys.exit(_daemon_main([a for a in sys.argv[1:] if a != "--daemon"]))
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QGridLayout,
     QPushButton, QVBoxLayout, QHBoxLayout, QLabel,
@@ -29,115 +34,16 @@ from PyQt6.QtWidgets import (
     QMessageBox, QInputDialog, QCheckBox, QFrame, QComboBox,
     QDialog,
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QSize
 from PyQt6.QtGui import QFont, QAction, QKeySequence, QIcon
 
-SCRIPT_DIR  = Path(__file__).parent
-SOUNDS_DIR  = SCRIPT_DIR / "sounds"
-CONFIG_FILE = SCRIPT_DIR / "config.json"
-SINK_NAME       = "maiNboard_sink"
-MIC_SOURCE_NAME = "maiNboard_mic"
-ROWS, COLS  = 4, 6
-
-
-# ── Config ─────────────────────────────────────────────────────────────────────
-class Config:
-    _defaults = {
-        "buttons": {}, "volume": 80, "local_monitor": True,
-        "mic_source": "", "mic_gain": 100, "overdrive": 1,
-        "output_sink": "", "hotkeys": {},
-    }
-
-    def __init__(self):
-        self.data = dict(self._defaults)
-        self.load()
-
-    def load(self):
-        if CONFIG_FILE.exists():
-            try:
-                self.data = {**self._defaults, **json.loads(CONFIG_FILE.read_text())}
-            except Exception:
-                pass
-
-    def save(self):
-        CONFIG_FILE.write_text(json.dumps(self.data, indent=2))
-
-    def get_button(self, idx: int) -> dict:
-        return self.data["buttons"].get(str(idx), {"path": "", "label": f"Sound {idx + 1}"})
-
-    def set_button(self, idx: int, path: str, label: str):
-        self.data["buttons"][str(idx)] = {"path": path, "label": label}
-        self.save()
-
-    def clear_button(self, idx: int):
-        self.data["buttons"].pop(str(idx), None)
-        self.save()
-
-    def get_hotkey(self, action_id: str) -> str:
-        return self.data.get("hotkeys", {}).get(action_id, "")
-
-    def set_hotkey(self, action_id: str, key_str: str):
-        if "hotkeys" not in self.data:
-            self.data["hotkeys"] = {}
-        if key_str:
-            self.data["hotkeys"][action_id] = key_str
-        else:
-            self.data["hotkeys"].pop(action_id, None)
-        self.save()
-
-    @property
-    def volume(self) -> int:
-        return self.data.get("volume", 80)
-
-    @volume.setter
-    def volume(self, v: int):
-        self.data["volume"] = v
-        self.save()
-
-    @property
-    def local_monitor(self) -> bool:
-        return self.data.get("local_monitor", True)
-
-    @local_monitor.setter
-    def local_monitor(self, v: bool):
-        self.data["local_monitor"] = v
-        self.save()
+from audio_engine import Voice
+from pulse import PulseError
+from latency import LatencyStats, StartupTimer, STAGES
+from core import Config, SoundboardCore, SCRIPT_DIR, SOUNDS_DIR, SINK_NAME
+from ipc import ControlServer, result_of
 
-    @property
-    def mic_source(self) -> str:
-        return self.data.get("mic_source", "")
-
-    @mic_source.setter
-    def mic_source(self, v: str):
-        self.data["mic_source"] = v
-        self.save()
-
-    @property
-    def mic_gain(self) -> int:
-        return self.data.get("mic_gain", 100)
-
-    @mic_gain.setter
-    def mic_gain(self, v: int):
-        self.data["mic_gain"] = v
-        self.save()
-
-    @property
-    def overdrive(self) -> int:
-        return self.data.get("overdrive", 1)
-
-    @overdrive.setter
-    def overdrive(self, v: int):
-        self.data["overdrive"] = v
-        self.save()
-
-    @property
-    def output_sink(self) -> str:
-        return self.data.get("output_sink", "")
-
-    @output_sink.setter
-    def output_sink(self, v: str):
-        self.data["output_sink"] = v
-        self.save()
+ROWS, COLS  = 4, 6
 
 
 # ── Hotkey Dialog ───────────────────────────────────────────────────────────────
@@ -265,323 +171,85 @@ class HotkeyDialog(QDialog):
         return False, ""
 
 
-# ── Hotkey Manager ──────────────────────────────────────────────────────────────
-class HotkeyManager(QThread):
-    """Globaler Keyboard-Listener.
-    Primär: evdev (Wayland-nativ, liest direkt vom Kernel).
-    Fallback: pynput (X11 / XWayland).
-    """
-
-    hotkey_triggered = pyqtSignal(str)   # action_id
-
-    # evdev-Keyname → internes Format
-    _KEY_MAP = {
-        "KEY_KP0": "kp_0", "KEY_KP1": "kp_1", "KEY_KP2": "kp_2",
-        "KEY_KP3": "kp_3", "KEY_KP4": "kp_4", "KEY_KP5": "kp_5",
-        "KEY_KP6": "kp_6", "KEY_KP7": "kp_7", "KEY_KP8": "kp_8",
-        "KEY_KP9": "kp_9", "KEY_KPENTER": "kp_enter",
-        "KEY_KPPLUS": "kp_plus", "KEY_KPMINUS": "kp_minus",
-        "KEY_KPASTERISK": "kp_multiply", "KEY_KPSLASH": "kp_divide",
-        "KEY_F1": "f1",  "KEY_F2": "f2",  "KEY_F3": "f3",  "KEY_F4": "f4",
-        "KEY_F5": "f5",  "KEY_F6": "f6",  "KEY_F7": "f7",  "KEY_F8": "f8",
-        "KEY_F9": "f9",  "KEY_F10": "f10","KEY_F11": "f11","KEY_F12": "f12",
-        "KEY_SPACE": "space", "KEY_ENTER": "enter", "KEY_TAB": "tab",
-        "KEY_DELETE": "delete", "KEY_LEFT": "left", "KEY_RIGHT": "right",
-        "KEY_UP": "up",  "KEY_DOWN": "down",
-        **{f"KEY_{c}": c.lower() for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"},
-        **{f"KEY_{n}": n for n in "0123456789"},
-    }
-    _MOD_MAP = {
-        "KEY_LEFTCTRL":  "ctrl",  "KEY_RIGHTCTRL":  "ctrl",
-        "KEY_LEFTALT":   "alt",   "KEY_RIGHTALT":   "alt",
-        "KEY_LEFTSHIFT": "shift", "KEY_RIGHTSHIFT": "shift",
-    }
-
-    def __init__(self):
-        super().__init__()
-        self._hotkeys: dict[str, str] = {}
-        self._lock      = threading.Lock()
-        self._modifiers: set[str] = set()
-        self._running   = False
-        self._listener  = None   # pynput-Fallback
-
-    def update_hotkeys(self, hotkeys: dict):
-        with self._lock:
-            self._hotkeys = dict(hotkeys)
-
-    def run(self):
-        self._running = True
-        if not self._run_evdev():
-            self._run_pynput()
-
-    # ── evdev (Wayland-nativ) ───────────────────────────────────────────────────
-    def _run_evdev(self) -> bool:
-        """Gibt True zurück wenn evdev verfügbar war und der Loop gelaufen ist."""
-        try:
-            import evdev
-            from evdev import ecodes
-        except ImportError:
-            return False
-
-        devices: dict = {}
-        for path in evdev.list_devices():
-            try:
-                dev = evdev.InputDevice(path)
-                if ecodes.EV_KEY in dev.capabilities():
-                    devices[dev.fd] = dev
-            except Exception:
-                pass
-
-        if not devices:
-            return False
-
-        import select as _select
-        try:
-            while self._running:
-                try:
-                    r, _, _ = _select.select(list(devices.keys()), [], [], 0.2)
-                except ValueError:
-                    break
-                for fd in r:
-                    dev = devices.get(fd)
-                    if dev is None:
-                        continue
-                    try:
-                        for event in dev.read():
-                            if event.type != ecodes.EV_KEY:
-                                continue
-                            raw = ecodes.KEY.get(event.code, "")
-                            key_name = raw[0] if isinstance(raw, list) else raw
-                            if not key_name:
-                                continue
-                            mod = self._MOD_MAP.get(key_name)
-                            if event.value == 1:      # key down
-                                if mod:
-                                    self._modifiers.add(mod)
-                                else:
-                                    key_str = self._KEY_MAP.get(key_name, "")
-                                    if key_str:
-                                        mods = sorted(self._modifiers)
-                                        full = ("+".join(mods + [key_str])
-                                                if mods else key_str)
-                                        with self._lock:
-                                            for action_id, hk in self._hotkeys.items():
-                                                if hk == full:
-                                                    self.hotkey_triggered.emit(action_id)
-                            elif event.value == 0:    # key up
-                                if mod:
-                                    self._modifiers.discard(mod)
-                    except OSError:
-                        devices.pop(fd, None)
-                        if not devices:
-                            break
-        finally:
-            for dev in devices.values():
-                try:
-                    dev.close()
-                except Exception:
-                    pass
-        return True
-
-    # ── pynput (X11 / XWayland-Fallback) ───────────────────────────────────────
-    def _run_pynput(self):
-        try:
-            from pynput import keyboard as kb
-        except ImportError:
-            return
+# ── Latenz-Debug-Panel ─────────────────────────────────────────────────────────
+class LatencyDialog(QDialog):
+    """Zeigt die Latenz-Histogramme pro Stufe (Taste → erste Samples)."""
 
-        _MOD_MAP: dict = {}
-        for attr, name in [
-            ("ctrl",    "ctrl"), ("ctrl_l",  "ctrl"), ("ctrl_r",  "ctrl"),
-            ("alt",     "alt"),  ("alt_l",   "alt"),  ("alt_r",   "alt"),
-            ("alt_gr",  "alt"),
-            ("shift",   "shift"),("shift_l", "shift"),("shift_r", "shift"),
-        ]:
-            if hasattr(kb.Key, attr):
-                _MOD_MAP[getattr(kb.Key, attr)] = name
-
-        _KEY_MAP: dict = {}
-        for attr, name in [
-            ("f1","f1"),("f2","f2"),("f3","f3"),("f4","f4"),
-            ("f5","f5"),("f6","f6"),("f7","f7"),("f8","f8"),
-            ("f9","f9"),("f10","f10"),("f11","f11"),("f12","f12"),
-            ("space","space"),("enter","enter"),("tab","tab"),
-            ("delete","delete"),
-            ("left","left"),("right","right"),("up","up"),("down","down"),
-        ]:
-            if hasattr(kb.Key, attr):
-                _KEY_MAP[getattr(kb.Key, attr)] = name
-
-        def on_press(key):
-            mod = _MOD_MAP.get(key)
-            if mod:
-                self._modifiers.add(mod)
-                return
-            key_str = _KEY_MAP.get(key, "")
-            if not key_str:
-                try:
-                    char = key.char
-                    if char and char.lower().isalnum():
-                        key_str = char.lower()
-                except AttributeError:
-                    pass
-            if not key_str:
-                return
-            mods = sorted(self._modifiers)
-            full = "+".join(mods + [key_str]) if mods else key_str
-            with self._lock:
-                for action_id, hotkey in self._hotkeys.items():
-                    if hotkey == full:
-                        self.hotkey_triggered.emit(action_id)
-
-        def on_release(key):
-            mod = _MOD_MAP.get(key)
-            if mod:
-                self._modifiers.discard(mod)
-
-        try:
-            with kb.Listener(on_press=on_press, on_release=on_release) as listener:
-                self._listener = listener
-                listener.join()
-        except Exception:
-            pass
-
-    def stop_listener(self):
-        self._running = False
-        if self._listener:
-            try:
-                self._listener.stop()
-            except Exception:
-                pass
-        self.quit()
-        self.wait(2000)
-
-
-# ── Audio player thread ─────────────────────────────────────────────────────────
-class AudioPlayer(QThread):
-    """
-    Spielt einen Sound gleichzeitig in den Virtual Sink UND lokal ab.
+    def __init__(self, stats: LatencyStats, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self.setWindowTitle("Latenz-Statistik")
+        self.resize(620, 520)
+        self.setStyleSheet("""
+            QDialog { background: #1e1e38; color: #d0d0f8; }
+            QLabel { color: #d0d0f8; }
+            QComboBox, QPushButton {
+                background: #252540; color: #d0d0f8;
+                border: 1px solid #404070; border-radius: 5px; padding: 4px 12px;
+            }
+            QPushButton:hover { background: #303060; }
+        """)
 
-    Routing-Strategie:
-      Für jeden benannten Sink:  ffmpeg → paplay --device <sink>
-        (identisch zum funktionierenden Mic-Loopback-Routing)
-      Für Standard-Ausgabe (kein Sink):  mpv direkt
-    """
-    sig_started = pyqtSignal(int)
-    sig_stopped = pyqtSignal(int)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(14, 14, 14, 12)
 
-    def __init__(self, btn_idx: int, path: str,
-                 sink: str | None, local_sink: str | None, volume: int, overdrive: int = 1):
-        super().__init__()
-        self.btn_idx    = btn_idx
-        self.path       = path
-        self.sink       = sink
-        self.local_sink = local_sink
-        self.volume     = volume
-        self.overdrive  = overdrive
-        self._procs: list[subprocess.Popen] = []
-        self._paplay_procs: list[subprocess.Popen] = []
-
-    def _af_filter(self) -> str:
-        """ffmpeg -af: nur Overdrive-Clipping. Lautstärke wird live via pactl gesetzt."""
-        return f"volume={float(self.overdrive)}"
-
-    def _pa_volume(self) -> int:
-        """Lautstärke als PulseAudio-Wert (0–65536, 65536 = 100 %)."""
-        return int(65536 * self.volume / 100)
-
-    def _spawn_to_sink(self, sink_name: str) -> list[subprocess.Popen]:
-        """ffmpeg | paplay –– zuverlässigstes PulseAudio-Routing."""
-        ffmpeg = subprocess.Popen(
-            ["ffmpeg", "-i", self.path,
-             "-af", self._af_filter(),
-             "-f", "s16le", "-ar", "48000", "-ac", "2",
-             "-loglevel", "quiet", "pipe:1"],
-            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
-        )
-        paplay = subprocess.Popen(
-            ["paplay", "--device", sink_name, "--raw",
-             "--format=s16le", "--rate=48000", "--channels=2",
-             f"--volume={self._pa_volume()}"],
-            stdin=ffmpeg.stdout,
-            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-        )
-        ffmpeg.stdout.close()
-        self._paplay_procs.append(paplay)
-        return [ffmpeg, paplay]
-
-    def _spawn_to_default(self) -> list[subprocess.Popen]:
-        """ffmpeg | paplay → Standard-Ausgabe (auch mit Overdrive-Support)."""
-        default_sink = subprocess.run(
-            ["pactl", "get-default-sink"], capture_output=True, text=True
-        ).stdout.strip()
-        if default_sink:
-            return self._spawn_to_sink(default_sink)
-        # Fallback ohne Sink-Angabe
-        p = subprocess.Popen(
-            ["ffmpeg", "-i", self.path, "-af", self._af_filter(),
-             "-f", "s16le", "-ar", "48000", "-ac", "2", "-loglevel", "quiet", "pipe:1"],
-            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
-        )
-        p2 = subprocess.Popen(
-            ["paplay", "--raw", "--format=s16le", "--rate=48000", "--channels=2",
-             f"--volume={self._pa_volume()}"],
-            stdin=p.stdout, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-        )
-        p.stdout.close()
-        self._paplay_procs.append(p2)
-        return [p, p2]
-
-    def _sink_input_idx(self, pid: int) -> str | None:
-        """Gibt den pactl Sink-Input-Index für eine paplay-PID zurück."""
-        r = subprocess.run(["pactl", "list", "sink-inputs"],
-                           capture_output=True, text=True)
-        idx = None
-        for line in r.stdout.splitlines():
-            s = line.strip()
-            if s.startswith("Sink Input #"):
-                idx = s.split("#")[1]
-            elif "application.process.id" in s and f'= "{pid}"' in s:
-                return idx
-        return None
-
-    def set_volume(self, volume: int):
-        """Ändert die Lautstärke aller laufenden paplay-Prozesse live via pactl."""
-        for p in self._paplay_procs:
-            if p.poll() is None:
-                idx = self._sink_input_idx(p.pid)
-                if idx:
-                    subprocess.Popen(
-                        ["pactl", "set-sink-input-volume", idx, f"{volume}%"],
-                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                    )
-
-    def run(self):
-        self.sig_started.emit(self.btn_idx)
-        self._procs = []
+        self.lbl_summary = QLabel()
+        self.lbl_summary.setFont(QFont("monospace", 9))
+        self.lbl_summary.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(self.lbl_summary)
 
-        try:
-            if self.sink:
-                self._procs.extend(self._spawn_to_sink(self.sink))
-            if self.local_sink:
-                self._procs.extend(self._spawn_to_sink(self.local_sink))
-            if not self.sink and not self.local_sink:
-                self._procs.extend(self._spawn_to_default())
-        except Exception:
-            pass
+        self.cmb_stage = QComboBox()
+        self.cmb_stage.addItems(STAGES)
+        self.cmb_stage.setCurrentText("total")
+        self.cmb_stage.currentIndexChanged.connect(self._refresh)
+        layout.addWidget(self.cmb_stage)
 
-        for p in self._procs:
-            try:
-                p.wait()
-            except Exception:
-                pass
+        self.lbl_hist = QLabel()
+        self.lbl_hist.setFont(QFont("monospace", 9))
+        self.lbl_hist.setAlignment(Qt.AlignmentFlag.AlignTop)
+        layout.addWidget(self.lbl_hist, 1)
 
-        self.sig_stopped.emit(self.btn_idx)
+        btn_row = QHBoxLayout()
+        btn_reset  = QPushButton("Zurücksetzen")
+        btn_reset.clicked.connect(self._reset)
+        btn_export = QPushButton("JSON exportieren …")
+        btn_export.clicked.connect(self._export)
+        btn_close  = QPushButton("Schließen")
+        btn_close.clicked.connect(self.accept)
+        btn_row.addWidget(btn_reset)
+        btn_row.addWidget(btn_export)
+        btn_row.addStretch()
+        btn_row.addWidget(btn_close)
+        layout.addLayout(btn_row)
 
-    def stop(self):
-        for p in self._procs:
-            if p.poll() is None:
-                p.terminate()
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._refresh)
+        self._timer.start(1000)
+        self._refresh()
+
+    def _refresh(self):
+        lines = [f"{'Stufe':<18}{'n':>6}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  ms"]
+        for stage, st in self.stats.summary().items():
+            lines.append(f"{stage:<18}{st['count']:>6}{st['p50_ms']:>9.2f}"
+                         f"{st['p90_ms']:>9.2f}{st['p99_ms']:>9.2f}{st['max_ms']:>9.2f}")
+        self.lbl_summary.setText("\n".join(lines))
+
+        hist = self.stats.histogram(self.cmb_stage.currentText())
+        peak = max((c for _, c in hist), default=0)
+        rows = [f"≤ {b:>8.2f} ms  {'█' * max(1, round(40 * c / peak)) if c else '':<40} {c}"
+                for b, c in hist]
+        self.lbl_hist.setText("\n".join(rows) or "Noch keine Trigger gemessen.")
+
+    def _reset(self):
+        self.stats.reset()
+        self._refresh()
+
+    def _export(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Latenz-Statistik exportieren",
+            str(Path.home() / "maiNboard-latency.json"), "JSON (*.json)")
+        if path:
+            Path(path).write_text(self.stats.to_json())
 
 
 # ── Sound button ───────────────────────────────────────────────────────────────
@@ -609,6 +277,14 @@ class SoundButton(QPushButton):
         }
         QPushButton:hover { background: #20203a; border-color: #5050a0; color: #8080c0; }
     """
+    _CSS_MISSING = """
+        QPushButton {
+            background: #2a1a22; color: #ff8899;
+            border: 1px dashed #aa4455; border-radius: 7px;
+            font-size: 11px; padding: 6px;
+        }
+        QPushButton:hover { background: #3a2030; }
+    """
     _CSS_PLAYING = """
         QPushButton {
             background: #1a5c32; color: #aaffcc;
@@ -617,6 +293,13 @@ class SoundButton(QPushButton):
         }
     """
 
+    _RETRIGGER_LABELS = {
+        "overlap": "Überlagern",
+        "restart": "Neu starten",
+        "toggle":  "Stoppen (Toggle)",
+        "ignore":  "Ignorieren solange er spielt",
+    }
+
     def __init__(self, idx: int, config: Config):
         super().__init__()
         self.idx        = idx
@@ -638,14 +321,17 @@ class SoundButton(QPushButton):
                 label += f"\n[{hk.upper()}]"
         else:
             label = f"＋  Slot {self.idx + 1}"
-        self.setText(label)
+        missing = has and not Path(d["path"]).exists()
+        self.setText(("⚠ " + label) if missing else label)
         self.setStyleSheet(
             self._CSS_PLAYING if (has and self.is_playing) else
+            self._CSS_MISSING if missing else
             self._CSS_IDLE    if has else
             self._CSS_EMPTY
         )
         tip = d.get("path", "")
-        self.setToolTip(Path(tip).name if tip else "Rechtsklick → Sound laden")
+        self.setToolTip(f"Datei fehlt: {tip}" if missing else
+                        Path(tip).name if tip else "Rechtsklick → Sound laden")
 
     def set_playing(self, state: bool):
         self.is_playing = state
@@ -670,6 +356,35 @@ class SoundButton(QPushButton):
         a_load   = menu.addAction("📂  Sound laden …")
         a_rename = menu.addAction("✏️  Umbenennen")
         a_hotkey = menu.addAction(hk_label)
+
+        # Retrigger-Modus & Polyphonie (pro Slot)
+        m_retrig = menu.addMenu("🔁  Erneut auslösen")
+        mode     = self.config.slot_retrigger(self.idx)
+        a_modes  = {}
+        for key, text in self._RETRIGGER_LABELS.items():
+            a = m_retrig.addAction(text)
+            a.setCheckable(True)
+            a.setChecked(key == mode)
+            a_modes[a] = key
+        m_poly = menu.addMenu("🎚  Max. gleichzeitig")
+        poly   = self.config.slot_polyphony(self.idx)
+        a_polys = {}
+        for n in (1, 2, 4, 8, 0):
+            a = m_poly.addAction(str(n) if n else "unbegrenzt")
+            a.setCheckable(True)
+            a.setChecked(n == poly)
+            a_polys[a] = n
+        a_trim = menu.addAction("✂  Stille überspringen")
+        a_trim.setCheckable(True)
+        a_trim.setChecked(self.config.slot_trim(self.idx))
+        a_norm = menu.addAction("📏  Lautheit angleichen")
+        a_norm.setCheckable(True)
+        a_norm.setChecked(self.config.slot_normalize(self.idx))
+        m_retrig.setEnabled(has)
+        m_poly.setEnabled(has)
+        a_trim.setEnabled(has)
+        a_norm.setEnabled(has)
+
         menu.addSeparator()
         a_clear  = menu.addAction("🗑️  Leeren")
         a_rename.setEnabled(has)
@@ -679,6 +394,17 @@ class SoundButton(QPushButton):
         elif act == a_rename: self.request_rename.emit(self.idx)
         elif act == a_hotkey: self.request_hotkey.emit(str(self.idx))
         elif act == a_clear:  self.request_clear.emit(self.idx)
+        elif act in a_modes:  self.config.set_button_option(self.idx, "retrigger", a_modes[act])
+        elif act in a_polys:  self.config.set_button_option(self.idx, "polyphony", a_polys[act])
+        elif act == a_trim:
+            # Gleich dem globalen Standard → Override entfernen
+            on = a_trim.isChecked()
+            self.config.set_button_option(self.idx, "trim",
+                                          None if on == self.config.trim_silence else on)
+        elif act == a_norm:
+            on = a_norm.isChecked()
+            self.config.set_button_option(self.idx, "normalize",
+                                          None if on == self.config.normalize else on)
 
 
 # ── Main window ────────────────────────────────────────────────────────────────
@@ -687,24 +413,58 @@ class MainWindow(QMainWindow):
     SINK_CSS_ON  = "color: #44ff88; font-size: 12px; font-weight: bold;"
     SINK_CSS_OFF = "color: #ff4444; font-size: 12px;"
 
-    def __init__(self):
+    sig_pulse_changed = pyqtSignal(str)   # facility aus PulseState (Thread → GUI)
+    sig_voices        = pyqtSignal(object, object)   # (gestartet, beendet) aus dem Mixer
+    sig_hotkey        = pyqtSignal(str, float)       # (action_id, Tastendruck) vom Listener
+    sig_remote        = pyqtSignal(object)           # Socket-Anfrage, die Widgets ändert
+    sig_library       = pyqtSignal(object)           # Slot-Dateien geändert/umgezogen (Bibliothek)
+
+    def __init__(self, startup: StartupTimer | None = None):
         super().__init__()
         self.config          = Config()
-        self.players: dict[int, list[AudioPlayer]] = {}
+        self._slot_voices: dict[int, int] = {}   # Slot → laufende Voices
         self.buttons:  list[SoundButton]      = []
-        self._sink_mod_ids: list[str]         = []
-
-        # Global hotkey manager
-        self._hotkey_mgr = HotkeyManager()
-        self._hotkey_mgr.hotkey_triggered.connect(self._on_hotkey_triggered)
-        self._hotkey_mgr.start()
+        self._startup = startup
+        self._loading = True                     # Geräte/Sink-Status noch nicht da
+        self._device_lists: tuple[list, list] = ([], [])
+        self._mic_missing = False
+
+        # Engine, PulseAudio, Virtual Sink & Hotkeys leben im Qt-freien Kern.
+        # Geräte werden im Hintergrund eingelesen – das Fenster wartet nicht darauf.
+        self.core     = SoundboardCore(self.config, on_hotkey=self.sig_hotkey.emit,
+                                       wait_pulse=False)
+        self.engine   = self.core.engine
+        self.pulse    = self.core.pulse
+        self.pa       = self.core.pa
+        self.controls = self.core.controls
+        self.latency  = self.core.latency
+        self._hotkey_mgr = self.core.hotkeys
+
+        self.pulse.add_listener(self.sig_pulse_changed.emit)
+        self.sig_pulse_changed.connect(self._on_pulse_changed,
+                                       Qt.ConnectionType.QueuedConnection)
+        self.engine.add_listener(self.sig_voices.emit)
+        self.sig_voices.connect(self._on_voices, Qt.ConnectionType.QueuedConnection)
+        self.sig_hotkey.connect(self._on_hotkey_triggered, Qt.ConnectionType.QueuedConnection)
+        self.sig_remote.connect(self._apply_remote, Qt.ConnectionType.QueuedConnection)
+        self.core.add_slot_listener(self.sig_library.emit)
+        self.sig_library.connect(self._on_library, Qt.ConnectionType.QueuedConnection)
+        self.core.start()
+
+        # Steuer-Socket: Skripte und die CLI erreichen auch das Fenster
+        self._server: ControlServer | None = ControlServer(self._on_remote)
+        try:
+            self._server.start()
+        except (RuntimeError, OSError):
+            self._server = None           # läuft schon ein Daemon → der hat den Socket
 
         self.setWindowTitle("maiNboard")
         self.setMinimumSize(860, 580)
         self._build_ui()
         self._apply_theme()
-        self._populate_sources()
-        self._check_sink()
+        self._set_loading()
+        if self.pulse.ready.is_set():   # "ready" kam, bevor der Listener hing
+            self._on_pulse_ready()
         self._refresh_hotkeys()
 
     # ── UI ─────────────────────────────────────────────────────────────────────
@@ -729,6 +489,8 @@ class MainWindow(QMainWindow):
         self.btn_sink = QPushButton("Virtual Mic aktivieren")
         self.btn_sink.setFixedHeight(30)
         self.btn_sink.clicked.connect(self._toggle_sink)
+        self.btn_sink.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.btn_sink.customContextMenuRequested.connect(self._sink_context_menu)
         hdr.addWidget(self.btn_sink)
         vbox.addLayout(hdr)
 
@@ -847,9 +609,12 @@ class MainWindow(QMainWindow):
         self.sld_od.setToolTip(
             "1 = clean · >1 = Hard-Clip Distortion\n"
             "Ab ~5 hört es sich nach Meme-Verzerrung an.\n"
-            "20 = maximale Übersteurung."
+            "20 = maximale Übersteurung.\n"
+            "Wirkt sofort, auch auf laufende Sounds.  |  Rechtsklick → Clip-Modus"
         )
         self.sld_od.valueChanged.connect(self._on_overdrive)
+        self.sld_od.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.sld_od.customContextMenuRequested.connect(self._overdrive_context_menu)
         ftr.addWidget(self.sld_od)
 
         self.lbl_od = QLabel(self._od_label(self.config.overdrive))
@@ -923,68 +688,54 @@ class MainWindow(QMainWindow):
     # ── Mikrofon-Quellen ───────────────────────────────────────────────────────
     def _get_real_sources(self) -> list[tuple[str, str]]:
         """Gibt (name, description) aller echten Mikrofon-Quellen zurück."""
-        r = subprocess.run(["pactl", "list", "sources"],
-                           capture_output=True, text=True)
-        sources, name, desc = [], "", ""
-        for line in r.stdout.splitlines():
-            line = line.strip()
-            if line.startswith("Name:"):
-                name = line.split(":", 1)[1].strip()
-                desc = ""
-            elif line.startswith("Description:"):
-                desc = line.split(":", 1)[1].strip()
-                # Nur echte Mikrofone, keine Monitor-Quellen
-                if name and not name.endswith(".monitor") and name not in (SINK_NAME, MIC_SOURCE_NAME):
-                    sources.append((name, desc))
-        return sources
+        return self.core.real_sources()
 
     def _get_real_sinks(self) -> list[tuple[str, str]]:
         """Gibt (name, description) aller echten Audio-Ausgaben zurück."""
-        r = subprocess.run(["pactl", "list", "sinks"],
-                           capture_output=True, text=True)
-        sinks, name, desc = [], "", ""
-        for line in r.stdout.splitlines():
-            line = line.strip()
-            if line.startswith("Name:"):
-                name = line.split(":", 1)[1].strip()
-                desc = ""
-            elif line.startswith("Description:"):
-                desc = line.split(":", 1)[1].strip()
-                if name and name != SINK_NAME:
-                    sinks.append((name, desc))
-        return sinks
+        return self.core.real_sinks()
 
     def _populate_sources(self):
-        """Befüllt Mikrofon- und Lautsprecher-ComboBox."""
-        # Mikrofon
-        self.cmb_mic.blockSignals(True)
-        self.cmb_mic.clear()
+        """Befüllt Mikrofon- und Lautsprecher-ComboBox.
+        Läuft auch bei jedem Hotplug: Hier wird nur die Liste erneuert – die
+        gespeicherte Auswahl bleibt stehen (notfalls als «nicht verfügbar»).
+        Config und Loopback ändern sich allein durch eine Auswahl des Nutzers."""
         sources = self._get_real_sources()
-        saved_mic = self.config.mic_source
-        sel_mic = 0
-        for i, (name, desc) in enumerate(sources):
-            self.cmb_mic.addItem(desc, userData=name)
-            if name == saved_mic:
-                sel_mic = i
-        self.cmb_mic.setCurrentIndex(sel_mic)
-        self.cmb_mic.blockSignals(False)
-        if sources:
-            self._on_mic_changed(sel_mic)
+        sinks   = self._get_real_sinks()
+        self._device_lists = (sources, sinks)
+
+        # Mikrofon
+        if not self.config.mic_source and sources:
+            self.config.mic_source = sources[0][0]    # erster Start: Vorgabe übernehmen
+        mic_was_missing = self._mic_missing
+        self._mic_missing = not self._fill_devices(self.cmb_mic, sources,
+                                                   self.config.mic_source)
+        if mic_was_missing and not self._mic_missing and self._sink_is_active():
+            self._create_sink()    # Mikrofon wieder da → Loopback neu anlegen
 
         # Lautsprecher
-        self.cmb_output.blockSignals(True)
-        self.cmb_output.clear()
-        sinks = self._get_real_sinks()
-        saved_out = self.config.output_sink
-        sel_out = 0
-        for i, (name, desc) in enumerate(sinks):
-            self.cmb_output.addItem(desc, userData=name)
-            if name == saved_out:
-                sel_out = i
-        self.cmb_output.setCurrentIndex(sel_out)
-        self.cmb_output.blockSignals(False)
-        if sinks:
-            self._on_output_changed(sel_out)
+        if not self.config.output_sink and sinks:
+            self.config.output_sink = sinks[0][0]
+        self._fill_devices(self.cmb_output, sinks, self.config.output_sink)
+        self._sync_outputs()
+
+    @staticmethod
+    def _fill_devices(cmb: QComboBox, devices: list[tuple[str, str]], saved: str) -> bool:
+        """Füllt eine Geräte-ComboBox ohne Signale und wählt `saved` aus.
+        Fehlt das Gerät gerade, bleibt es als Platzhalter gewählt → False."""
+        cmb.blockSignals(True)
+        cmb.clear()
+        sel = 0
+        for i, (name, desc) in enumerate(devices):
+            cmb.addItem(desc, userData=name)
+            if name == saved:
+                sel = i
+        present = not saved or any(name == saved for name, _ in devices)
+        if not present:
+            cmb.addItem(f"⚠  {saved}  (nicht verfügbar)", userData=saved)
+            sel = cmb.count() - 1
+        cmb.setCurrentIndex(sel)
+        cmb.blockSignals(False)
+        return present
 
     def _selected_source(self) -> str:
         return self.cmb_mic.currentData() or ""
@@ -993,10 +744,21 @@ class MainWindow(QMainWindow):
         return self.cmb_output.currentData() or ""
 
     def _on_mic_changed(self, _idx: int):
-        self.config.mic_source = self._selected_source()
+        src = self._selected_source()
+        changed = src != self.config.mic_source
+        self.config.mic_source = src
+        if changed:    # Platzhalter eines fehlenden Geräts verschwindet mit der Wahl
+            self._mic_missing = not self._fill_devices(self.cmb_mic,
+                                                       self._device_lists[0], src)
+        if changed and not self._loading and self._sink_is_active():
+            self._create_sink()    # lädt nur den Loopback neu, Sink & Remap bleiben
 
     def _on_output_changed(self, _idx: int):
-        self.config.output_sink = self._selected_output()
+        out = self._selected_output()
+        if out != self.config.output_sink:
+            self.config.output_sink = out
+            self._fill_devices(self.cmb_output, self._device_lists[1], out)
+        self._sync_outputs()
 
     def _on_mic_gain_changed(self, v: int):
         self.config.mic_gain = v
@@ -1004,111 +766,70 @@ class MainWindow(QMainWindow):
         self._apply_mic_gain()
 
     def _apply_mic_gain(self):
-        src = self._selected_source()
-        if not src:
-            return
-        subprocess.run(
-            ["pactl", "set-source-volume", src, f"{self.config.mic_gain}%"],
-            capture_output=True
-        )
+        self.core.apply_mic_gain()
 
     # ── Virtual Sink ───────────────────────────────────────────────────────────
     def _check_sink(self):
-        r = subprocess.run(["pactl", "list", "sinks", "short"],
-                           capture_output=True, text=True)
-        self._update_sink_ui(SINK_NAME in r.stdout)
+        self._update_sink_ui(self._sink_is_active())
+
+    def _set_loading(self):
+        """Platzhalter, bis PulseState zum ersten Mal komplett eingelesen ist."""
+        for cmb in (self.cmb_mic, self.cmb_output):
+            cmb.blockSignals(True)
+            cmb.clear()
+            cmb.addItem("Lade Geräte …")
+            cmb.blockSignals(False)
+            cmb.setEnabled(False)
+        self.btn_sink.setEnabled(False)
+
+    def _on_pulse_ready(self):
+        if not self._loading:
+            return
+        self._loading = False
+        self.cmb_output.setEnabled(True)
+        self.btn_sink.setEnabled(True)
+        self.cmb_mic.setEnabled(True)
+        self._populate_sources()
+        self._check_sink()
+        self._startup_mark("ready")
+
+    def _on_pulse_changed(self, facility: str):
+        """Server-Änderung (auch von außen, z. B. Headset eingesteckt)."""
+        if facility == "ready":
+            self._on_pulse_ready()
+        if self._loading:
+            return
+        if facility == "sink":
+            self._check_sink()
+        if facility in ("sink", "source"):
+            if (self._get_real_sources(), self._get_real_sinks()) != self._device_lists:
+                self._populate_sources()
 
     def _toggle_sink(self):
-        r = subprocess.run(["pactl", "list", "sinks", "short"],
-                           capture_output=True, text=True)
-        if SINK_NAME in r.stdout:
+        if self._sink_is_active():
             self._teardown_sink()
         else:
             self._create_sink()
 
     def _create_sink(self):
-        # 1. Null-Sink als virtuelles Mikrofon erstellen
-        r = subprocess.run(
-            ["pactl", "load-module", "module-null-sink",
-             f"sink_name={SINK_NAME}",
-             "sink_properties=device.description=maiNboard\\ Virtual\\ Mic"],
-            capture_output=True, text=True
-        )
-        if r.returncode != 0:
+        try:
+            warnings = self.core.create_sink()
+        except PulseError as e:
             QMessageBox.critical(self, "Fehler",
-                f"Konnte Virtual Sink nicht erstellen:\n{r.stderr.strip()}")
+                f"Konnte Virtual Sink nicht erstellen:\n{e}")
             return
-        self._sink_mod_ids.append(r.stdout.strip())
-
-        # 2. Loopback: echtes Mikrofon → Virtual Sink
-        #    (damit deine Stimme über den Virtual Mic zu Discord/TS3 gelangt)
-        mic_src = self._selected_source()
-        if mic_src:
-            r2 = subprocess.run(
-                ["pactl", "load-module", "module-loopback",
-                 f"source={mic_src}",
-                 f"sink={SINK_NAME}",
-                 "latency_msec=1"],
-                capture_output=True, text=True
-            )
-            if r2.returncode == 0:
-                self._sink_mod_ids.append(r2.stdout.strip())
-            else:
-                self.statusBar().showMessage(
-                    f"⚠  Mikrofon-Loopback fehlgeschlagen: {r2.stderr.strip()}"
-                )
+
+        self._update_sink_ui(True)
+        if warnings:
+            self.statusBar().showMessage("⚠  " + "  ·  ".join(warnings))
         else:
             self.statusBar().showMessage(
-                "⚠  Kein Mikrofon gewählt – nur Soundboard-Sounds werden übertragen."
+                "Virtual Mic aktiv!  Setze in Discord/TS3 das Mikrofon auf "
+                "«maiNboard Microphone»"
             )
 
-        # 3. Remap-Source: macht den Monitor als echtes Mikrofon sichtbar
-        #    → Discord zeigt es als auswählbares Gerät an
-        r3 = subprocess.run(
-            ["pactl", "load-module", "module-remap-source",
-             f"master={SINK_NAME}.monitor",
-             f"source_name={MIC_SOURCE_NAME}",
-             "source_properties=device.description=maiNboard\\ Microphone"],
-            capture_output=True, text=True
-        )
-        if r3.returncode == 0:
-            self._sink_mod_ids.append(r3.stdout.strip())
-
-        # 4. Default-Sink auf echten Lautsprecher zurücksetzen
-        #    → verhindert dass Discord-Audio in den Virtual Sink läuft (Echo-Schleife)
-        out = self._selected_output()
-        if out:
-            subprocess.run(["pactl", "set-default-sink", out], capture_output=True)
-
-        # Mic Gain sofort anwenden
-        self._apply_mic_gain()
-
-        self._update_sink_ui(True)
-        self.statusBar().showMessage(
-            "Virtual Mic aktiv!  Setze in Discord/TS3 das Mikrofon auf "
-            "«maiNboard Microphone»"
-        )
-
     def _teardown_sink(self):
-        for mod_id in reversed(self._sink_mod_ids):
-            subprocess.run(["pactl", "unload-module", mod_id], capture_output=True)
-        self._sink_mod_ids.clear()
-
-        # Sicherheitsnetz: restliche Module per Name entfernen
-        r = subprocess.run(["pactl", "list", "modules", "short"],
-                           capture_output=True, text=True)
-        for line in r.stdout.splitlines():
-            parts = line.split(None, 2)
-            if len(parts) >= 3 and SINK_NAME in parts[2]:
-                subprocess.run(["pactl", "unload-module", parts[0]],
-                               capture_output=True)
-
-        # Mic-Lautstärke zurücksetzen damit andere Apps normal klingen
-        src = self._selected_source()
-        if src:
-            subprocess.run(["pactl", "set-source-volume", src, "100%"],
-                           capture_output=True)
-
+        self.core.teardown_sink()
         self._update_sink_ui(False)
         self.statusBar().showMessage("Virtual Mic deaktiviert.")
 
@@ -1117,76 +838,78 @@ class MainWindow(QMainWindow):
             self.lbl_sink.setText("● Virtual Mic: Aktiv")
             self.lbl_sink.setStyleSheet(self.SINK_CSS_ON)
             self.btn_sink.setText("Virtual Mic deaktivieren")
-            self.cmb_mic.setEnabled(False)
         else:
             self.lbl_sink.setText("● Virtual Mic: Inaktiv")
             self.lbl_sink.setStyleSheet(self.SINK_CSS_OFF)
             self.btn_sink.setText("Virtual Mic aktivieren")
-            self.cmb_mic.setEnabled(True)
+
+    def _sink_context_menu(self, pos):
+        """Rechtsklick auf den Virtual-Mic-Button: Latenz des Mikrofon-Loopbacks."""
+        menu = QMenu(self)
+        menu.setStyleSheet("""
+            QMenu { background:#252538; border:1px solid #444466; color:#c8c8ff; }
+            QMenu::item:selected { background:#3a3a6a; }
+        """)
+        ms, _ = self.config.loopback_latency_for(self.config.mic_source)
+        adaptive = self.config.loopback_mode == "adaptive"
+        a_adapt = menu.addAction(f"Loopback-Latenz adaptiv  (jetzt {ms} ms)")
+        a_adapt.setCheckable(True)
+        a_adapt.setChecked(adaptive)
+        if not self.core.loopback.can_measure():
+            a_adapt.setText(f"Loopback-Latenz adaptiv  (nur mit libpulse, fest {ms} ms)")
+            a_adapt.setEnabled(False)
+        menu.addSeparator()
+        a_fixed = {}
+        for v in (1, 2, 4, 6, 10, 20, 30, 50):
+            a = menu.addAction(f"Fest: {v} ms")
+            a.setCheckable(True)
+            a.setChecked(not adaptive and v == self.config.loopback_target_ms)
+            a_fixed[a] = v
+        act = menu.exec(self.btn_sink.mapToGlobal(pos))
+        if act == a_adapt:
+            self.core.set_loopback_mode("adaptive")
+        elif act in a_fixed:
+            self.core.set_loopback_mode("fixed", a_fixed[act])
 
     def _sink_is_active(self) -> bool:
-        r = subprocess.run(["pactl", "list", "sinks", "short"],
-                           capture_output=True, text=True)
-        return SINK_NAME in r.stdout
+        return self.core.sink_active()
 
-    def _default_sink(self) -> str | None:
-        r = subprocess.run(["pactl", "get-default-sink"],
-                           capture_output=True, text=True)
-        s = r.stdout.strip()
-        return s if s and s != SINK_NAME else None
+    def _sync_outputs(self):
+        """Hält im Mixer genau die Streams offen, die ein Trigger gerade brauchen würde."""
+        self.core.sync_outputs()
 
     # ── Playback ───────────────────────────────────────────────────────────────
-    def _play(self, idx: int):
-        d    = self.config.get_button(idx)
-        path = d.get("path", "")
-        if not path or not Path(path).exists():
+    def _play(self, idx: int, origin: float | None = None,
+              dispatched: float | None = None):
+        """origin/dispatched: Zeitstempel für die Latenz-Statistik (Hotkeys)."""
+        path = self.config.get_button(idx).get("path", "")
+        try:
+            voice = self.core.play(idx, origin=origin, dispatched=dispatched)
+        except FileNotFoundError:
             self.statusBar().showMessage(f"⚠  Datei nicht gefunden: {path}")
             return
+        if voice is None:
+            return   # toggle-stop / ignore-while-playing
 
-        sink_active = self._sink_is_active()
-        sink        = SINK_NAME if sink_active else None
-
-        # Lautsprecher: explizit gewähltes Gerät (Steinberg), nicht default sink
-        # (default sink könnte durch PipeWire auf maiNboard_sink gesetzt worden sein)
-        out = self._selected_output()
-        if self.config.local_monitor and out:
-            local_sink = out
-        elif self.config.local_monitor and not sink_active:
-            local_sink = out or None
-        else:
-            local_sink = None
-
-        player = AudioPlayer(idx, path, sink, local_sink, self.config.volume, self.config.overdrive)
-        player.sig_started.connect(self._on_player_started)
-        player.sig_stopped.connect(self._on_player_stopped)
-        player.finished.connect(lambda: self._on_player_finished(idx))
-        player.start()
-
-        self.players.setdefault(idx, []).append(player)
-
-        dest = SINK_NAME if sink else "Standard-Ausgabe"
+        dest = SINK_NAME if SINK_NAME in voice.sinks else "Standard-Ausgabe"
         self.statusBar().showMessage(f"▶  {Path(path).name}  →  {dest}")
 
-    def _on_player_started(self, idx: int):
-        self.buttons[idx].set_playing(True)
-
-    def _on_player_stopped(self, idx: int):
-        pass  # Aufräumen passiert in _on_player_finished (nach Thread-Ende)
-
-    def _on_player_finished(self, idx: int):
-        # Abgeschlossene Player aus der Liste entfernen (isRunning() ist jetzt sicher False)
-        self.players[idx] = [p for p in self.players.get(idx, []) if p.isRunning()]
-        # Button nur ausschalten wenn wirklich alle Instanzen fertig sind
-        if not self.players[idx]:
-            self.buttons[idx].set_playing(False)
+    def _on_voices(self, started: list[Voice], ended: list[Voice]):
+        """Gebündelte Start/Ende-Meldungen des Mixers → Button-Zustand."""
+        counts = self._slot_voices
+        for v in started:
+            counts[v.slot] = counts.get(v.slot, 0) + 1
+        for v in ended:
+            counts[v.slot] = counts.get(v.slot, 0) - 1
+        for slot in {v.slot for v in started} | {v.slot for v in ended}:
+            playing = counts.get(slot, 0) > 0
+            if not playing:
+                counts.pop(slot, None)
+            if 0 <= slot < len(self.buttons):
+                self.buttons[slot].set_playing(playing)
 
     def _stop_all(self):
-        for players in self.players.values():
-            for p in players:
-                if p.isRunning():
-                    p.stop()
-        for btn in self.buttons:
-            btn.set_playing(False)
+        self.engine.stop_all()
         self.statusBar().showMessage("■  Alle Sounds gestoppt.")
 
     # ── Hotkey support ─────────────────────────────────────────────────────────
@@ -1211,9 +934,13 @@ class MainWindow(QMainWindow):
         hk       = self.config.get_hotkey("stop_all")
         hk_label = f"⌨  Hotkey festlegen  [{hk.upper()}]" if hk else "⌨  Hotkey festlegen"
         a_hotkey = menu.addAction(hk_label)
+        menu.addSeparator()
+        a_latency = menu.addAction("⏱  Latenz-Statistik …")
         act = menu.exec(self.btn_stop.mapToGlobal(pos))
         if act == a_hotkey:
             self._set_hotkey("stop_all")
+        elif act == a_latency:
+            LatencyDialog(self.latency, self).exec()
 
     def keyPressEvent(self, event):
         """Hotkeys abfangen wenn das Fenster aktiv ist (Wayland-Fallback)."""
@@ -1241,22 +968,24 @@ class MainWindow(QMainWindow):
             parts.append("kp_" + key_str)
         else:
             parts.append(key_str)
-        full = "+".join(parts)
-
-        hotkeys = self.config.data.get("hotkeys", {})
-        for action_id, hotkey in hotkeys.items():
-            if hotkey == full:
-                self._on_hotkey_triggered(action_id)
-                return
-
-        super().keyPressEvent(event)
-
-    def _on_hotkey_triggered(self, action_id: str):
+        actions = self._hotkey_mgr.actions_for("+".join(parts))
+        if not actions:
+            super().keyPressEvent(event)
+            return
+        # Gehaltene Taste (Autorepeat) löst nicht erneut aus
+        if not event.isAutoRepeat():
+            origin = time.monotonic()
+            for action_id in actions:
+                if self._hotkey_mgr.allow(action_id):
+                    self._on_hotkey_triggered(action_id, origin)
+
+    def _on_hotkey_triggered(self, action_id: str, origin: float = 0.0):
         """Empfängt ausgelöste globale Hotkeys vom HotkeyManager."""
+        dispatched = time.monotonic()
         if action_id == "stop_all":
             self._stop_all()
         elif action_id.isdigit():
-            self._play(int(action_id))
+            self._play(int(action_id), origin=origin or None, dispatched=dispatched)
 
     def _refresh_hotkeys(self):
         """Synchronisiert HotkeyManager und Stop-Button-Text mit der Config."""
@@ -1275,6 +1004,7 @@ class MainWindow(QMainWindow):
         )
         if path:
             self.config.set_button(idx, path, Path(path).stem)
+            self.core.prepare_slots()
             self.buttons[idx].refresh()
 
     def _rename_sound(self, idx: int):
@@ -1288,20 +1018,29 @@ class MainWindow(QMainWindow):
 
     def _clear_sound(self, idx: int):
         self.config.clear_button(idx)
+        self.core.prepare_slots()
         self.buttons[idx].set_playing(False)
         self.buttons[idx].refresh()
 
+    def _on_library(self, relinked: dict[int, str]):
+        """Bibliothek meldet: Slot-Dateien geändert, gelöscht oder umgezogen."""
+        for btn in self.buttons:
+            btn.refresh()
+        if relinked:
+            idx, path = next(iter(relinked.items()))
+            self.statusBar().showMessage(f"↪  Slot {idx + 1} folgt der Datei: {Path(path).name}")
+        elif missing := self.core.missing_slots():
+            self.statusBar().showMessage(
+                f"⚠  Datei fehlt: Slot {', '.join(str(i + 1) for i in missing)}")
+
     # ── Controls ───────────────────────────────────────────────────────────────
     def _on_volume(self, v: int):
-        self.config.volume = v
         self.lbl_vol.setText(f"{v} %")
-        for players in self.players.values():
-            for player in players:
-                if player.isRunning():
-                    player.set_volume(v)
+        self.core.set_volume(v)
 
     def _on_local_changed(self, state: int):
         self.config.local_monitor = (state == Qt.CheckState.Checked.value)
+        self._sync_outputs()
 
     def _od_label(self, v: int) -> str:
         if v == 1:   return "clean"
@@ -1313,18 +1052,98 @@ class MainWindow(QMainWindow):
 
     def _on_overdrive(self, v: int):
         self.config.overdrive = v
+        self.engine.set_overdrive(v)
         self.lbl_od.setText(self._od_label(v))
         r = min(255, 160 + v)
         self.lbl_od.setStyleSheet(f"color: rgb({r}, {max(20, 130 - v)}, 20);")
 
+    def _overdrive_context_menu(self, pos):
+        """Rechtsklick auf den Overdrive-Regler: Clip-Modus und Limiter."""
+        menu = QMenu(self)
+        menu.setStyleSheet("""
+            QMenu { background:#252538; border:1px solid #444466; color:#c8c8ff; }
+            QMenu::item:selected { background:#3a3a6a; }
+        """)
+        a_hard = menu.addAction("Hard-Clip")
+        a_soft = menu.addAction("Soft-Clip")
+        menu.addSeparator()
+        a_lim  = menu.addAction("Limiter (Summe)")
+        for a, on in ((a_hard, not self.config.soft_clip),
+                      (a_soft, self.config.soft_clip),
+                      (a_lim,  self.config.limiter)):
+            a.setCheckable(True)
+            a.setChecked(on)
+        act = menu.exec(self.sld_od.mapToGlobal(pos))
+        if act in (a_hard, a_soft):
+            self.config.soft_clip = act == a_soft
+            self.engine.set_soft_clip(self.config.soft_clip)
+        elif act == a_lim:
+            self.config.limiter = not self.config.limiter
+            self.engine.set_limiter(self.config.limiter)
+
+    # ── Steuer-Socket ──────────────────────────────────────────────────────────
+    def _on_remote(self, req: dict) -> dict:
+        """Socket-Thread. Was Regler ändert, läuft per Signal im GUI-Thread;
+        Wiedergabe, Abfragen und der Virtual Mic gehen direkt an den Kern."""
+        cmd = req.get("cmd")
+        if cmd == "volume" and "value" in req:
+            v = max(0, min(150, int(req["value"])))
+            self.sig_remote.emit({"cmd": "volume", "value": v})
+            return {"ok": True, "volume": v}
+        if cmd == "sink" and "on" in req:
+            # Der Kern baut im Hintergrund um und antwortet erst danach mit dem
+            # echten Zustand; das Fenster zieht nur Anzeige und Statuszeile nach
+            resp = self.core.handle(req)
+            if isinstance(resp, Future):
+                resp.add_done_callback(
+                    lambda f: self.sig_remote.emit({**result_of(f), "cmd": "sink"}))
+            else:
+                self.sig_remote.emit({**resp, "cmd": "sink"})
+            return resp
+        return self.core.handle(req)
+
+    def _apply_remote(self, req: dict):
+        if req["cmd"] == "volume":
+            self.sld_vol.setValue(req["value"])          # → _on_volume
+        elif req["cmd"] == "sink":
+            active = self._sink_is_active()
+            self._update_sink_ui(active)
+            if not req.get("ok"):
+                self.statusBar().showMessage(f"⚠  Virtual Mic: {req.get('error', '')}")
+            elif req.get("warnings"):
+                self.statusBar().showMessage("⚠  " + "  ·  ".join(req["warnings"]))
+            else:
+                self.statusBar().showMessage(
+                    "Virtual Mic aktiv." if active else "Virtual Mic deaktiviert.")
+
+    # ── Startzeit ──────────────────────────────────────────────────────────────
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._startup is not None:
+            self._startup_mark("first_paint")
+
+    def _startup_mark(self, phase: str):
+        s = self._startup
+        if s is None or not s.mark(phase):
+            return
+        if {"first_paint", "ready"} <= s.marks.keys():
+            print(s.report(), file=sys.stderr)
+            self._startup = None
+
     def closeEvent(self, event):
+        if self._server is not None:
+            self._server.stop()
         self._stop_all()
-        self._hotkey_mgr.stop_listener()
+        self.core.shutdown()
         super().closeEvent(event)
 
 
 # ── Entry point ────────────────────────────────────────────────────────────────
 def main():
+    # --startup-report: Zeiten für import / construct / first_paint / ready ausgeben
+    startup = StartupTimer(_T_START) if "--startup-report" in sys.argv[1:] else None
+    if startup is not None:
+        startup.mark("import")
     SOUNDS_DIR.mkdir(exist_ok=True)
     app = QApplication(sys.argv)
     app.setApplicationName("maiNboard")
@@ -1332,7 +1151,9 @@ def main():
     icon_path = str(SCRIPT_DIR / "maiNboard.svg")
     app.setWindowIcon(QIcon(icon_path))
 
-    win = MainWindow()
+    win = MainWindow(startup)
+    if startup is not None:
+        startup.mark("construct")
     win.setWindowIcon(QIcon(icon_path))
     win.show()
     sys.exit(app.exec())